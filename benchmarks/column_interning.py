@@ -0,0 +1,86 @@
+"""
+Memory held by the column names of an org's monitor configs, and the cost of looking columns up.
+
+The inventory is one generated document per dataset, round-tripped through JSON like a WhyLabs
+response, so that every occurrence of a column name starts as a string of its own. Once parsed,
+the names in `ColumnMatrix.include`/`exclude`, `AnomalyFilter.includeColumns` and the
+`EntitySchema.columns` keys are interned: the memory they hold is compared with what one string
+per occurrence takes. Checking every schema column against every analyzer's `include` is timed
+on the lists and on `include_set()`. Run with `python -m benchmarks.column_interning`.
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from benchmarks.trusted_construction import best_of
+from whylabs_toolkit.monitor.models import ColumnMatrix, Document
+from whylabs_toolkit.testing.documents import column_occurrences, generate_document
+
+
+def parse_inventory(bodies: List[bytes], parse: Callable[[Any], Document]) -> Tuple[List[Document], int]:
+    """The parsed documents and the bytes they hold once the payloads are gone, traced with tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        payloads = [json.loads(body) for body in bodies]
+        documents = [parse(payload) for payload in payloads]
+        del payloads
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return documents, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--datasets", type=int, default=20)
+    parser.add_argument("--analyzers", type=int, default=100, help="analyzers and monitors of each dataset")
+    parser.add_argument("--columns", type=int, default=500, help="columns targeted by each analyzer")
+    parser.add_argument("--schema-columns", type=int, default=2000, help="columns of each entity schema")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    bodies = [
+        json.dumps(generate_document(args.analyzers, args.columns, args.schema_columns)).encode()
+        for _ in range(args.datasets)
+    ]
+    print(f"{args.datasets} datasets of {args.analyzers} analyzers, {sum(map(len, bodies)) / 2**20:.1f} MiB of JSON")
+
+    for name, parse in (("parse_obj", Document.parse_obj), ("parse_trusted", Document.parse_trusted)):
+        documents, retained = parse_inventory(bodies, parse)
+        names = list(column_occurrences(documents))
+        distinct = {id(column): column for column in names}
+        held = sum(sys.getsizeof(column) for column in distinct.values())
+        separate = sum(sys.getsizeof(column) for column in names)
+        print(
+            f"{name:>14}: {retained / 2**20:7.1f} MiB retained; {len(names)} column names in {len(distinct)} "
+            f"strings, {held / 2**20:6.2f} MiB instead of {separate / 2**20:6.2f} MiB as separate strings"
+        )
+        del documents, names, distinct
+
+    document = Document.parse_trusted(json.loads(bodies[0]))
+    columns = list(document.entitySchema.columns) if document.entitySchema else []
+    matrices = [a.targetMatrix for a in document.analyzers or [] if isinstance(a.targetMatrix, ColumnMatrix)]
+
+    def in_lists() -> int:
+        return sum(column in (matrix.include or []) for matrix in matrices for column in columns)
+
+    def in_sets() -> int:
+        return sum(
+            column in included for included in (matrix.include_set() for matrix in matrices) for column in columns
+        )
+
+    assert in_lists() == in_sets()
+    before, after = best_of(args.rounds, in_lists), best_of(args.rounds, in_sets)
+    print(
+        f"{len(columns)} columns against {len(matrices)} include lists: lists {before:9.3f} ms, "
+        f"include_set() {after:9.3f} ms, {before / after:5.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    main()
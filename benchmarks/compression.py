@@ -0,0 +1,65 @@
+"""
+Bytes on the wire and latency of large monitor config round trips, with and without gzip.
+
+Every round saves a generated Document with `put_monitor_config_v3` and reads it back with
+`get_monitor_config_v3`, against the local stand-in server. On the loopback interface
+compression only costs CPU; use `--bandwidth` (megabits/s) and `--latency` (milliseconds)
+to see what it saves on the link to WhyLabs. Run with `python -m benchmarks.compression`.
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from whylabs_toolkit.helpers.client import close_clients
+from whylabs_toolkit.helpers.utils import get_monitor_api
+from whylabs_toolkit.testing.documents import generate_stddev_document
+from whylabs_toolkit.testing.stand_in import StandInServer, StandInState
+
+
+def round_trips(server: StandInServer, document: Dict[str, Any], rounds: int) -> Tuple[List[float], List[float]]:
+    """Milliseconds taken by each save and each read."""
+    api = get_monitor_api(config=server.config())
+    saves, reads = [], []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        api.put_monitor_config_v3(org_id="org-0", dataset_id="model-0", body=document)
+        saves.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        api.get_monitor_config_v3(org_id="org-0", dataset_id="model-0")
+        reads.append((time.perf_counter() - start) * 1000)
+    return saves, reads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analyzers", type=int, default=1000, help="analyzers, and monitors, in the document")
+    parser.add_argument("--columns", type=int, default=50, help="columns in every analyzer's include list")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--bandwidth", type=float, default=0.0, help="link speed in megabits/s, 0 for unlimited")
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in milliseconds")
+    args = parser.parse_args()
+
+    document = generate_stddev_document(args.analyzers, args.columns)
+    state = StandInState(latency=args.latency / 1000, bandwidth=args.bandwidth * 125_000 or None)
+    print(f"{args.analyzers} analyzers and monitors, {args.columns} columns each, {args.rounds} rounds")
+    with StandInServer(state) as server:
+        server.state.add_dataset(org_id="org-0", dataset_id="model-0")
+        for gzip in ("false", "true"):
+            os.environ["WHYLABS_GZIP"] = gzip
+            close_clients()
+            state.served.clear()
+            saves, reads = round_trips(server, document, args.rounds)
+            sent = statistics.mean(served.request_bytes for served in state.served if served.method == "PUT")
+            received = statistics.mean(served.response_bytes for served in state.served if served.method == "GET")
+            name = "gzip" if gzip == "true" else "identity"
+            print(
+                f"{name:>9}: save {sent / 1024:9.1f} KiB, median {statistics.median(saves):8.2f} ms | "
+                f"read {received / 1024:9.1f} KiB, median {statistics.median(reads):8.2f} ms"
+            )
+        close_clients()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Throughput of concurrent API reads over the urllib3 transport and over HTTP/2.
+
+Every worker thread reads the entity schemas of distinct datasets from the local stand-in
+server, with the response cache off, so each read is a request. urllib3 needs one HTTP/1.1
+connection per request in flight and keeps `WHYLABS_CONNECTION_POOL_MAXSIZE` of them; the
+HTTP/2 transport multiplexes them over `--connections` connections. The server runs in a
+process of its own, so that its CPU time isn't taken from the client's. `--latency` and
+`--handshake` (milliseconds) model a remote WhyLabs: the time to answer a request, and the
+time the TCP and TLS handshakes of a new connection take. Run with `python -m benchmarks.http2`,
+which needs `pip install "whylabs-toolkit[http2]"`.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Tuple
+
+from benchmarks.load_test import percentile
+from whylabs_toolkit.helpers.client import close_clients
+from whylabs_toolkit.helpers.config import UserConfig
+from whylabs_toolkit.helpers.utils import get_models_api
+from whylabs_toolkit.testing.stand_in import StandInServer, StandInState
+
+
+def serve(state: StandInState, http2: bool, datasets: int, urls: Any, done: Any, connections: Any) -> None:
+    """Runs a stand-in server until `done` is set, then reports the connections it accepted."""
+    for i in range(datasets):
+        state.add_dataset(org_id="org-0", dataset_id=f"model-{i}")
+    with StandInServer(state, http2=http2) as server:
+        urls.put(server.url)
+        done.wait()
+    connections.put(state.connections)
+
+
+def read_schemas(config: UserConfig, datasets: int, requests: int, concurrency: int) -> Tuple[float, List[float]]:
+    """Seconds taken by all the reads, and the milliseconds taken by each one."""
+    api = get_models_api(config=config)
+
+    def read(i: int) -> float:
+        start = time.perf_counter()
+        api.get_entity_schema(org_id="org-0", dataset_id=f"model-{i % datasets}")
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        durations = list(executor.map(read, range(requests)))
+    return time.perf_counter() - start, durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64, help="worker threads sending requests")
+    parser.add_argument("--connections", type=int, default=4, help="HTTP/2 connections")
+    parser.add_argument("--datasets", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=50.0, help="server latency in milliseconds")
+    parser.add_argument("--handshake", type=float, default=150.0, help="connection setup in milliseconds")
+    args = parser.parse_args()
+
+    # urllib3 warns about every connection it can't keep in a full pool
+    logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+    os.environ["WHYLABS_CACHE_TTL_SECONDS"] = "0"
+    os.environ["WHYLABS_HTTP2_MAX_CONNECTIONS"] = str(args.connections)
+    print(
+        f"{args.requests} reads by {args.concurrency} threads, "
+        f"{args.latency:.0f} ms latency, {args.handshake:.0f} ms handshakes"
+    )
+    for transport in ("urllib3", "http2"):
+        os.environ["WHYLABS_TRANSPORT"] = transport
+        urls, done, connections = multiprocessing.Queue(), multiprocessing.Event(), multiprocessing.Queue()
+        state = StandInState(latency=args.latency / 1000, handshake=args.handshake / 1000)
+        server_args = (state, transport == "http2", args.datasets, urls, done, connections)
+        server = multiprocessing.Process(target=serve, args=server_args, daemon=True)
+        server.start()
+        config = UserConfig(api_key="stand-in-key", org_id="org-0", dataset_id="model-0", whylabs_host=urls.get())
+        close_clients()
+        cpu = time.process_time()
+        elapsed, durations = read_schemas(config, args.datasets, args.requests, args.concurrency)
+        cpu = time.process_time() - cpu
+        close_clients()
+        done.set()
+        accepted = connections.get()
+        server.join()
+        print(
+            f"{transport:>8}: {args.requests / elapsed:8.1f} req/s, {accepted:4d} connections, "
+            f"median {statistics.median(durations):7.2f} ms, p99 {percentile(durations, 99):7.2f} ms, "
+            f"client CPU {cpu / args.requests * 1000:5.2f} ms/request"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Import time of the toolkit's entry points, measured with `python -X importtime` in fresh interpreters.
+
+Run with `python -m benchmarks.import_time`. With `--check`, exits with an error when
+the median of a module goes over its budget, so it can guard against import-time regressions.
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Cumulative import time budgets in milliseconds
+BUDGETS_MS: Dict[str, float] = {
+    "whylabs_toolkit.monitor": 50,
+    "whylabs_toolkit.monitor.models": 50,
+    "whylabs_toolkit.monitor.manager": 50,
+    "whylabs_toolkit.container.config_types": 50,
+}
+
+_IMPORT_TIME = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def measure(module: str) -> float:
+    """Cumulative import time of `module` in milliseconds, in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match and match.group(3) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"{module} not found in the -X importtime output")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="fail when a module goes over its budget")
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS_MS))
+    args = parser.parse_args()
+
+    over_budget: List[str] = []
+    for module in args.modules:
+        median = statistics.median(measure(module) for _ in range(args.runs))
+        budget = BUDGETS_MS.get(module)
+        status = "" if budget is None else f" (budget {budget:.0f} ms)"
+        print(f"{module:>45}: {median:8.1f} ms{status}")
+        if budget is not None and median > budget:
+            over_budget.append(module)
+
+    if args.check and over_budget:
+        sys.exit(f"Over the import time budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Load test of concurrent monitor pipelines against the local stand-in server.
+
+Every pipeline creates a MonitorSetup, applies it and saves it with MonitorManager, the
+way a deployment script does. Run with `python -m benchmarks.load_test`; use `--latency`
+and `--jitter` (milliseconds) to get closer to a remote WhyLabs and `--error-rate` to see
+how failures surface. Request latency is measured on the server, pipeline latency on the caller;
+both share one interpreter, so CPU-bound pipelines also show up in the request latency.
+"""
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from whylabs_toolkit.helpers.client import close_clients
+from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.monitor.manager import MonitorManager, MonitorSetup
+from whylabs_toolkit.monitor.models import SimpleColumnMetric, StddevConfig, TrailingWindowBaseline
+from whylabs_toolkit.testing.stand_in import StandInServer, StandInState
+
+
+@dataclass
+class PipelineResult:
+    duration: float
+    error: Optional[str] = None
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile, `q` between 0 and 100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))]
+
+
+def run_pipeline(monitor_id: str, config: Config) -> PipelineResult:
+    start = time.perf_counter()
+    try:
+        setup = MonitorSetup(monitor_id=monitor_id, config=config)
+        setup.config = StddevConfig(metric=SimpleColumnMetric.median, baseline=TrailingWindowBaseline(size=14))
+        setup.apply()
+        MonitorManager(setup=setup, config=config).save()
+    except Exception as e:
+        return PipelineResult(
+            duration=time.perf_counter() - start, error=f"{type(e).__name__}: {str(e).splitlines()[0]}"
+        )
+    return PipelineResult(duration=time.perf_counter() - start)
+
+
+def run(
+    server: StandInServer, pipelines: int, concurrency: int, datasets: int, org_id: str = "org-0"
+) -> List[PipelineResult]:
+    configs = [server.config(org_id=org_id, dataset_id=f"load-model-{i}") for i in range(datasets)]
+    for config in configs:
+        server.state.add_dataset(org_id=org_id, dataset_id=config.get_default_dataset_id())
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(run_pipeline, f"load-monitor-{i:06d}", configs[i % datasets]) for i in range(pipelines)
+        ]
+        return [future.result() for future in futures]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pipelines", type=int, default=200, help="pipelines to run in total")
+    parser.add_argument("--concurrency", type=int, default=16, help="pipelines running at the same time")
+    parser.add_argument("--datasets", type=int, default=8, help="datasets the pipelines are spread over")
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in milliseconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency in milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failed with a 503")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    logging.getLogger("whylabs_toolkit").setLevel(logging.WARNING)
+    # One pooled connection per pipeline, as a deployment sized for this concurrency would use
+    os.environ.setdefault("WHYLABS_CONNECTION_POOL_MAXSIZE", str(args.concurrency))
+
+    state = StandInState(
+        latency=args.latency / 1000, jitter=args.jitter / 1000, error_rate=args.error_rate, seed=args.seed
+    )
+    with StandInServer(state) as server:
+        close_clients()
+        start = time.perf_counter()
+        results = run(server, pipelines=args.pipelines, concurrency=args.concurrency, datasets=args.datasets)
+        elapsed = time.perf_counter() - start
+        close_clients()
+
+    requests = [served.duration * 1000 for served in state.served]
+    durations = [result.duration * 1000 for result in results]
+    errors = [result.error for result in results if result.error]
+    print(f"{args.pipelines} pipelines, {args.concurrency} concurrent, {elapsed:.2f} s")
+    per_pipeline = len(requests) / max(len(results), 1)
+    print(f"   requests: {len(requests)} ({len(requests) / elapsed:.1f} req/s, {per_pipeline:.1f} per pipeline)")
+    print(f"    latency: p50 {percentile(requests, 50):7.2f} ms, p99 {percentile(requests, 99):7.2f} ms")
+    print(f"  pipelines: p50 {percentile(durations, 50):7.2f} ms, p99 {percentile(durations, 99):7.2f} ms")
+    print(f"     failed: {len(errors)}")
+    for error in sorted(set(errors))[:5]:
+        print(f"             {error}")
+
+
+if __name__ == "__main__":
+    main()
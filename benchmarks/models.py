@@ -0,0 +1,269 @@
+"""
+Time and memory taken by the monitor config models at realistic scale.
+
+Every case is a generated payload from `whylabs_toolkit.testing.documents`: documents of 10 to 1000 analyzers
+and monitors, a `ColumnMatrix.include` list at the 1000 items limit, entity schemas of 10k to
+100k columns and every AlgorithmConfig variant. For each of them `parse_obj`, `.json()`,
+`.dict()`, `.schema()` and JSON Schema validation are measured, with `parse_trusted` and
+`json_bytes` next to them, along with `MonitorSetup.apply()` against the local stand-in server.
+
+Times are the median and best of `--rounds` runs; memory is the peak allocated by one more run,
+traced with tracemalloc. Results are written to `benchmarks/results/<commit>.json`; pass an
+earlier file with `--compare` to print the ratios, and `--check` to exit with an error when an
+operation got slower by more than `--threshold`. Run with `python -m benchmarks.models`.
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Type
+
+import pydantic
+
+from whylabs_toolkit.helpers.client import close_clients
+from whylabs_toolkit.monitor.manager import MonitorSetup
+from whylabs_toolkit.monitor.manager.schema import document_schema
+from whylabs_toolkit.monitor.manager.validation import get_document_validator
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.monitor.models.commons import NoExtrasBaseModel
+from whylabs_toolkit.testing.documents import (
+    ALGORITHM_CONFIGS,
+    CONFIG_MODELS,
+    MAX_COLUMNS,
+    column_names,
+    generate_analyzer,
+    generate_document,
+    generate_entity_schema,
+)
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+RESULTS_DIR = Path(__file__).parent / "results"
+MIN_ROUND_SECONDS = 0.02
+
+# Builds what an operation needs, untimed, and returns the call to time
+Operation = Callable[[], Callable[[], Any]]
+
+
+@dataclass
+class Result:
+    case: str
+    operation: str
+    median_ms: float
+    best_ms: float
+    peak_kib: float
+
+
+def _call(function: Callable[[], Any]) -> Operation:
+    return lambda: function
+
+
+def _uncached_schema(model: Type[pydantic.BaseModel]) -> Operation:
+    # pydantic keeps the schema of a model once generated
+    def prepare() -> Callable[[], Any]:
+        model.__schema_cache__.clear()
+        return model.schema
+
+    return prepare
+
+
+def model_operations(model: Type[NoExtrasBaseModel], data: Dict[str, Any]) -> Dict[str, Operation]:
+    """The operations measured on every model: parsing its payload and serializing it."""
+    parsed = model.parse_obj(data)
+    return {
+        "parse_obj": _call(lambda: model.parse_obj(data)),
+        "parse_trusted": _call(lambda: model.parse_trusted(data)),
+        "json": _call(lambda: parsed.json(exclude_none=True)),
+        "json_bytes": _call(parsed.json_bytes),
+        "dict": _call(lambda: parsed.dict(exclude_none=True)),
+    }
+
+
+def cases(
+    document_sizes: List[int], schema_columns: List[int], columns: int
+) -> Iterator[Tuple[str, Dict[str, Operation]]]:
+    for size in document_sizes:
+        data = generate_document(size, columns)
+        operations = model_operations(Document, data)
+        body = json.loads(Document.parse_obj(data).json_bytes())
+        operations["validate"] = _call(partial(get_document_validator().validate, instance=body))
+        yield f"document-{size}", operations
+
+    yield f"column-matrix-{MAX_COLUMNS}", model_operations(ColumnMatrix, {"include": column_names(MAX_COLUMNS)})
+    yield f"analyzer-include-{MAX_COLUMNS}", model_operations(Analyzer, generate_analyzer(0, MAX_COLUMNS))
+
+    for count in schema_columns:
+        yield f"entity-schema-{count}", model_operations(EntitySchema, generate_entity_schema(count))
+
+    for name, payload in ALGORITHM_CONFIGS.items():
+        yield f"config-{name}", model_operations(CONFIG_MODELS[name], payload)
+
+    schemas = {
+        f"{model.__name__}.schema": _uncached_schema(model) for model in (Document, Analyzer, Monitor, EntitySchema)
+    }
+    schemas["document_schema"] = _call(document_schema)
+    yield "schema", schemas
+
+
+def apply_operations(server: StandInServer, columns: int) -> Dict[str, Operation]:
+    """MonitorSetup.apply() of a drift monitor targeting `columns` columns, against the stand-in server."""
+    config = server.config()
+
+    def prepare() -> Callable[[], Any]:
+        setup = MonitorSetup(monitor_id="bench-monitor", config=config)
+        setup.config = DriftConfig(
+            metric=ComplexMetrics.histogram, baseline=TrailingWindowBaseline(size=14)  # type: ignore
+        )
+        setup.set_target_columns(column_names(columns))
+        return setup.apply
+
+    return {"apply": prepare}
+
+
+def measure(case: str, name: str, operation: Operation, rounds: int) -> Result:
+    # Fast operations are repeated within a round, so that a round lasts at least MIN_ROUND_SECONDS
+    call = operation()
+    start = time.perf_counter()
+    call()
+    repeat = max(1, min(1000, int(MIN_ROUND_SECONDS / max(time.perf_counter() - start, 1e-9))))
+    durations = []
+    for _ in range(rounds):
+        elapsed = 0.0
+        for _ in range(repeat):
+            call = operation()
+            start = time.perf_counter()
+            call()
+            elapsed += time.perf_counter() - start
+        durations.append(elapsed * 1000 / repeat)
+    call = operation()
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return Result(case, name, statistics.median(durations), min(durations), peak / 1024)
+
+
+def commit() -> str:
+    try:
+        described = subprocess.run(
+            ["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True
+        )
+        return described.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def calibrate(rounds: int) -> float:
+    """Best milliseconds taken by a fixed workload, to tell a slower commit from a slower machine."""
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        sorted(json.loads(json.dumps({str(i): [i, float(i)] for i in range(20000)})).items(), reverse=True)
+        durations.append((time.perf_counter() - start) * 1000)
+    return min(durations)
+
+
+def compare(results: List[Result], calibration_ms: float, baseline_path: Path, threshold: float) -> List[str]:
+    """
+    Prints the ratio of every best time to the one in `baseline_path`. Returns the operations slower than `threshold`.
+
+    Ratios are corrected by the ratio of the calibration times of both runs.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {(result["case"], result["operation"]): result for result in baseline["results"]}
+    machine = calibration_ms / baseline["calibration_ms"]
+    print(f"\ncompared with {baseline['commit']} ({baseline_path}), machine speed ratio {machine:.2f}:")
+    regressions = []
+    for result in results:
+        earlier = before.get((result.case, result.operation))
+        if earlier is None:
+            continue
+        # The best time is the least disturbed by whatever else runs on the machine
+        ratio = result.best_ms / earlier["best_ms"] / machine if earlier["best_ms"] else 1.0
+        flag = ""
+        if ratio > threshold:
+            flag = "  <- slower"
+            regressions.append(f"{result.case} {result.operation}")
+        print(
+            f"{result.case:>32} {result.operation:>22}: {earlier['best_ms']:10.3f} -> {result.best_ms:10.3f} ms "
+            f"({ratio:5.2f}x), {earlier['peak_kib']:10.1f} -> {result.peak_kib:10.1f} KiB{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", default="10,100,1000", help="analyzers of the measured documents")
+    parser.add_argument("--columns", type=int, default=20, help="columns targeted by each analyzer of a document")
+    parser.add_argument("--schema-columns", default="10000,100000", help="columns of the measured entity schemas")
+    parser.add_argument("--apply-columns", type=int, default=MAX_COLUMNS, help="columns targeted by MonitorSetup")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None, help="defaults to benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", type=Path, default=None, help="results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown reported as a regression")
+    parser.add_argument("--check", action="store_true", help="fail when an operation regressed")
+    args = parser.parse_args()
+
+    logging.getLogger("whylabs_toolkit").setLevel(logging.WARNING)
+    document_sizes = [int(size) for size in args.documents.split(",") if size]
+    schema_columns = [int(count) for count in args.schema_columns.split(",") if count]
+
+    results: List[Result] = []
+    calibration_ms = calibrate(args.rounds)
+
+    def run(case: str, operations: Dict[str, Operation]) -> None:
+        for name, operation in operations.items():
+            result = measure(case, name, operation, args.rounds)
+            results.append(result)
+            print(
+                f"{case:>32} {name:>22}: median {result.median_ms:10.3f} ms, best {result.best_ms:10.3f} ms, "
+                f"peak {result.peak_kib:10.1f} KiB"
+            )
+
+    for case, operations in cases(document_sizes, schema_columns, args.columns):
+        run(case, operations)
+    with StandInServer() as server:
+        server.state.add_dataset(org_id="org-0", dataset_id="model-0")
+        server.state.schemas[("org-0", "model-0")] = generate_entity_schema(args.apply_columns)
+        run(f"monitor-setup-{args.apply_columns}", apply_operations(server, args.apply_columns))
+    close_clients()
+    calibration_ms = min(calibration_ms, calibrate(args.rounds))
+
+    revision = commit()
+    output: Path = args.output or RESULTS_DIR / f"{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(
+            {
+                "commit": revision,
+                "created": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "pydantic": pydantic.VERSION,
+                "machine": platform.machine(),
+                "calibration_ms": calibration_ms,
+                "results": [asdict(result) for result in results],
+            },
+            f,
+            indent=2,
+        )
+    print(f"\nresults written to {output}")
+
+    if args.compare is not None:
+        regressions = compare(results, calibration_ms, args.compare, args.threshold)
+        if regressions and args.check:
+            sys.exit(f"{len(regressions)} operations regressed: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
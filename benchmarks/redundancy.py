@@ -0,0 +1,37 @@
+"""
+Time taken to find the duplicate and overlapping analyzers of an org, by number of analyzers.
+
+The org is made of datasets of `--analyzers` generated analyzers each, parsed beforehand; the
+report is timed on 5k to 40k analyzers by default, and should take about the same time per
+analyzer at every size. Run with `python -m benchmarks.redundancy`.
+"""
+import argparse
+
+from benchmarks.trusted_construction import best_of
+from whylabs_toolkit.helpers.redundancy import find_redundant_analyzers
+from whylabs_toolkit.monitor.models import Document
+from whylabs_toolkit.testing.documents import generate_document
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="5000,10000,20000,40000", help="analyzers of the measured orgs")
+    parser.add_argument("--analyzers", type=int, default=1000, help="analyzers of each dataset")
+    parser.add_argument("--columns", type=int, default=40, help="columns targeted by each analyzer")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    # The same parsed document stands for every dataset, its analyzers are hashed again for each
+    document = Document.parse_trusted(generate_document(args.analyzers, args.columns))
+    for size in (int(size) for size in args.sizes.split(",") if size):
+        documents = [document] * max(1, size // args.analyzers)
+        report = find_redundant_analyzers(documents)
+        elapsed = best_of(args.rounds, lambda: find_redundant_analyzers(documents))
+        print(
+            f"{report.analyzers:>8} analyzers: {elapsed:10.1f} ms, {elapsed * 1000 / report.analyzers:6.1f} us per "
+            f"analyzer, {report.redundant_analyzers} duplicated, {len(report.overlaps)} overlapping groups"
+        )
+
+
+if __name__ == "__main__":
+    main()
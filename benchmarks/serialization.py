@@ -0,0 +1,57 @@
+"""
+CPU time taken to turn models into request bodies, with pydantic and with `json_bytes`.
+
+The pydantic path is what the toolkit did before writing a model: `json.loads(model.json(exclude_none=True))`,
+then `json.dumps` of the result by whylabs_client. `json_bytes` encodes the model to compact bytes in one
+pass, which are sent as they are when wrapped in `JsonBody`. Run with `python -m benchmarks.serialization`.
+"""
+import argparse
+import json
+from typing import Any, Callable, Dict
+
+from benchmarks.trusted_construction import best_of
+from whylabs_toolkit.monitor.models import Analyzer, Document, Monitor
+from whylabs_toolkit.testing.documents import generate_stddev_document
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analyzers", type=int, default=1000)
+    parser.add_argument("--columns", type=int, default=20, help="columns targeted by each analyzer")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    data = generate_stddev_document(args.analyzers, args.columns)
+    data["granularity"] = "daily"
+    data["id"] = "9c1fbbe6-2b43-4e6c-9d63-0ff0eac3e0b4"
+    data["analyzers"][0]["config"]["baseline"] = {
+        "type": "TimeRange",
+        "range": {"start": "2023-01-01T00:00:00Z", "end": "2023-02-01T00:00:00Z"},
+    }
+    document = Document.parse_obj(data)
+    analyzer, monitor = document.analyzers[0], document.monitors[0]  # type: ignore
+
+    cases: Dict[str, Dict[str, Callable[[], Any]]] = {
+        f"Document of {args.analyzers} analyzers": {
+            "pydantic": lambda: json.dumps(json.loads(document.json(exclude_none=True))),
+            "json_bytes": lambda: document.json_bytes(),
+        },
+        "one Analyzer": {
+            "pydantic": lambda: json.dumps(json.loads(analyzer.json(exclude_none=True))),
+            "json_bytes": lambda: analyzer.json_bytes(),
+        },
+        "one Monitor": {
+            "pydantic": lambda: json.dumps(json.loads(monitor.json(exclude_none=True))),
+            "json_bytes": lambda: monitor.json_bytes(),
+        },
+    }
+    for name, paths in cases.items():
+        before = best_of(args.rounds, paths["pydantic"])
+        after = best_of(args.rounds, paths["json_bytes"])
+        print(f"{name:>30}: pydantic {before:9.3f} ms, json_bytes {after:9.3f} ms, {before / after:5.1f}x faster")
+    size = len(document.json(exclude_none=True).encode())
+    print(f"{'body size':>30}: pydantic {size} bytes, json_bytes {len(document.json_bytes())} bytes")
+
+
+if __name__ == "__main__":
+    main()
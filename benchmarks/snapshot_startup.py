@@ -0,0 +1,94 @@
+"""
+Startup time of MonitorSetup with a cold client against a warm local snapshot.
+
+Runs against the in-process stand-in server, so the cold numbers leave out real
+network latency and TLS handshakes; the request counts show what a cold start costs
+against WhyLabs. Run with `python -m benchmarks.snapshot_startup`.
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+from whylabs_toolkit.helpers.client import close_clients, use_snapshot
+from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.inventory import sync_snapshot
+from whylabs_toolkit.helpers.snapshot import SnapshotStore
+from whylabs_toolkit.monitor.manager import MonitorSetup
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+def _seed(server: StandInServer, analyzers: int) -> None:
+    server.state.add_dataset(org_id="org-0", dataset_id="model-0")
+    document = server.state.documents[("org-0", "model-0")]
+    for i in range(analyzers):
+        monitor_id = f"bench-monitor-{i}"
+        document["monitors"].append(
+            {
+                "id": monitor_id,
+                "analyzerIds": [f"{monitor_id}-analyzer"],
+                "schedule": {"type": "immediate"},
+                "mode": {"type": "DIGEST"},
+                "actions": [],
+            }
+        )
+        document["analyzers"].append(
+            {
+                "id": f"{monitor_id}-analyzer",
+                "config": {
+                    "metric": "median",
+                    "type": "stddev",
+                    "factor": 2.0,
+                    "baseline": {"type": "TrailingWindow", "size": 14},
+                },
+                "schedule": {"type": "fixed", "cadence": "daily"},
+                "targetMatrix": {"include": ["*"], "segments": [], "type": "column"},
+            }
+        )
+
+
+def _startup(config: Config) -> None:
+    setup = MonitorSetup(monitor_id="bench-monitor-0", config=config)
+    setup.apply()
+
+
+def _measure(runs: int, prepare: Callable[[], None], config: Config) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        close_clients()
+        prepare()
+        start = time.perf_counter()
+        _startup(config)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--analyzers", type=int, default=200, help="analyzers in the dataset's monitor config")
+    args = parser.parse_args()
+
+    with StandInServer() as server, tempfile.TemporaryDirectory() as snapshot_dir:
+        _seed(server, args.analyzers)
+        config = server.config()
+        sync_snapshot(SnapshotStore(snapshot_dir), org_id="org-0", config=config)
+
+        def cold() -> None:
+            server.state.requests.clear()
+
+        def warm() -> None:
+            server.state.requests.clear()
+            use_snapshot(SnapshotStore(snapshot_dir), config=config)
+
+        for name, prepare in [("cold", cold), ("warm snapshot", warm)]:
+            timings = _measure(args.runs, prepare, config)
+            print(
+                f"{name:>14}: median {statistics.median(timings):7.2f} ms, "
+                f"min {min(timings):7.2f} ms, {len(server.state.requests)} requests per startup"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import json
+
+from benchmarks.models import Result, calibrate, compare
+
+
+def test_compare_flags_slower_operations(tmp_path) -> None:  # type: ignore
+    earlier = tmp_path / "earlier.json"
+    results = [Result("document-10", "parse_obj", 2.0, 2.0, 1.0), Result("document-10", "json", 1.0, 1.0, 1.0)]
+    earlier.write_text(
+        json.dumps(
+            {
+                "commit": "abc",
+                "calibration_ms": 10.0,
+                "results": [
+                    {
+                        "case": "document-10",
+                        "operation": "parse_obj",
+                        "median_ms": 1.0,
+                        "best_ms": 1.0,
+                        "peak_kib": 1.0,
+                    },
+                    {"case": "document-10", "operation": "json", "median_ms": 1.0, "best_ms": 1.0, "peak_kib": 1.0},
+                ],
+            }
+        )
+    )
+
+    assert compare(results, 10.0, earlier, threshold=1.25) == ["document-10 parse_obj"]
+    # Twice as slow on a machine twice as slow isn't a regression
+    assert compare(results, 20.0, earlier, threshold=1.25) == []
+    assert calibrate(1) > 0
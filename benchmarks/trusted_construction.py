@@ -0,0 +1,54 @@
+"""
+Time taken to build models from monitor configs WhyLabs returned, validating them or not.
+
+`parse_obj` validates every field and tries the members of every union in turn until one
+validates; `parse_trusted` resolves unions by their `type` field and skips the checks,
+for payloads WhyLabs validated when they were saved. Run with `python -m benchmarks.trusted_construction`.
+"""
+import argparse
+import time
+from typing import Any, Callable
+
+from whylabs_toolkit.monitor.models import Analyzer, Document, EntitySchema, Monitor
+from whylabs_toolkit.testing.documents import generate_entity_schema, generate_stddev_document
+
+
+def best_of(rounds: int, build: Callable[[], Any]) -> float:
+    """Milliseconds taken by the fastest of `rounds` calls of `build`."""
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        build()
+        durations.append((time.perf_counter() - start) * 1000)
+    return min(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analyzers", type=int, default=1000)
+    parser.add_argument("--columns", type=int, default=20, help="columns targeted by each analyzer")
+    parser.add_argument("--schema-columns", type=int, default=10000, help="columns of the entity schema")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    document = generate_stddev_document(args.analyzers, args.columns)
+    document["granularity"] = "daily"
+    document["entitySchema"] = generate_entity_schema(args.columns * 4)
+    schema = generate_entity_schema(args.schema_columns)
+    cases = {
+        f"Document of {args.analyzers} analyzers": (Document, document),
+        "one Analyzer": (Analyzer, document["analyzers"][0]),
+        "one Monitor": (Monitor, document["monitors"][0]),
+        f"EntitySchema of {args.schema_columns} columns": (EntitySchema, schema),
+    }
+    for name, (model, data) in cases.items():
+        validated = best_of(args.rounds, lambda: model.parse_obj(data))  # type: ignore
+        trusted = best_of(args.rounds, lambda: model.parse_trusted(data))  # type: ignore
+        print(
+            f"{name:>36}: parse_obj {validated:9.3f} ms, parse_trusted {trusted:9.3f} ms, "
+            f"{validated / trusted:5.1f}x faster"
+        )
+
+
+if __name__ == "__main__":
+    main()
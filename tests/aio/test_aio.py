@@ -0,0 +1,137 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Callable, List
+
+import pytest
+
+from whylabs_toolkit.helpers.instrumentation import ApiCallEvent, CallOutcome, observe_api_calls
+from whylabs_toolkit.monitor.manager import MonitorSetup
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+pytest.importorskip("httpx")
+
+from whylabs_toolkit.aio import AsyncMonitorManager, close_async_clients, delete_monitor  # noqa: E402
+from whylabs_toolkit.aio import get_analyzers, get_model_granularity, get_monitor, get_monitor_config  # noqa: E402
+
+MONITOR_ID = "stand-in-monitor"
+
+
+def test_save_and_read_back(stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]) -> None:
+    config = stand_in.config()
+
+    async def run() -> None:
+        await AsyncMonitorManager(setup=applied_setup(MONITOR_ID, actions=[]), config=config).save()
+
+        monitor = await get_monitor(monitor_id=MONITOR_ID, config=config)
+        analyzers = await get_analyzers(monitor_id=MONITOR_ID, config=config)
+        document = await get_monitor_config(org_id="org-0", dataset_id="model-0", config=config)
+
+        assert monitor["id"] == MONITOR_ID
+        assert [analyzer["id"] for analyzer in analyzers] == [f"{MONITOR_ID}-analyzer"]
+        assert len(document["monitors"]) == 1
+        assert await get_model_granularity(config=config) == Granularity.daily
+        await close_async_clients()
+
+    asyncio.run(run())
+
+
+def test_save_sends_the_diffed_json(stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]) -> None:
+    setup = applied_setup(MONITOR_ID, actions=[])
+
+    async def run() -> None:
+        await AsyncMonitorManager(setup=setup, config=stand_in.config()).save()
+        await close_async_clients()
+
+    asyncio.run(run())
+
+    puts = {served.path.rsplit("/", 2)[1]: served for served in stand_in.state.served if served.method == "PUT"}
+    compact = json.dumps(stand_in.state.documents[("org-0", "model-0")]["analyzers"][0], separators=(",", ":"))
+    assert sorted(puts) == ["analyzer", "monitor"]
+    assert 0 < puts["analyzer"].request_bytes <= len(compact)
+
+
+def test_delete_monitor(stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]) -> None:
+    config = stand_in.config()
+
+    async def run() -> None:
+        await AsyncMonitorManager(setup=applied_setup(MONITOR_ID, actions=[]), config=config).save()
+        await delete_monitor(monitor_id=MONITOR_ID, config=config)
+
+        assert await get_monitor(monitor_id=MONITOR_ID, config=config) is None
+        assert stand_in.state.documents[("org-0", "model-0")]["analyzers"] == []
+        await close_async_clients()
+
+    asyncio.run(run())
+
+
+def test_many_saves_run_concurrently(stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]) -> None:
+    config = stand_in.config()
+    setups = [applied_setup(f"{MONITOR_ID}-{i}", actions=[]) for i in range(10)]
+    threads = threading.active_count()
+
+    async def run() -> int:
+        await asyncio.gather(*[AsyncMonitorManager(setup=setup, config=config).save() for setup in setups])
+        # Only the stand-in server's threads for the pooled connections, no thread per call
+        running = threading.active_count() - stand_in.state.connections
+        await close_async_clients()
+        return running
+
+    assert asyncio.run(run()) <= threads
+    assert len(stand_in.state.documents[("org-0", "model-0")]["monitors"]) == 10
+
+
+def test_requests_share_a_bounded_pool(stand_in: StandInServer, monkeypatch: Any) -> None:
+    monkeypatch.setenv("WHYLABS_CONNECTION_POOL_MAXSIZE", "2")
+    stand_in.state.latency = 0.05
+    for i in range(1, 8):
+        stand_in.state.add_dataset(org_id="org-0", dataset_id=f"model-{i}")
+    config = stand_in.config()
+
+    async def run() -> float:
+        start = time.monotonic()
+        await asyncio.gather(*[get_model_granularity(dataset_id=f"model-{i}", config=config) for i in range(8)])
+        elapsed = time.monotonic() - start
+        await close_async_clients()
+        return elapsed
+
+    elapsed = asyncio.run(run())
+
+    # 8 requests, 2 at a time
+    assert elapsed >= 4 * 0.05
+    assert stand_in.state.connections <= 2
+
+
+def test_transient_failures_are_retried(stand_in: StandInServer) -> None:
+    stand_in.state.inject_failure(r"/models/model-0$", status=503, times=2)
+    config = stand_in.config()
+
+    async def run() -> Any:
+        granularity = await get_model_granularity(config=config)
+        await close_async_clients()
+        return granularity
+
+    assert asyncio.run(run()) == Granularity.daily
+    assert [served.status for served in stand_in.state.served] == [503, 503, 200]
+
+
+def test_concurrent_reads_are_coalesced(stand_in: StandInServer) -> None:
+    stand_in.state.latency = 0.1
+    config = stand_in.config()
+    events: List[ApiCallEvent] = []
+
+    async def run() -> List[Any]:
+        with observe_api_calls(events.append):
+            reads = [get_monitor_config(org_id="org-0", dataset_id="model-0", config=config) for _ in range(10)]
+            documents = await asyncio.gather(*reads)
+        await close_async_clients()
+        return documents
+
+    documents = asyncio.run(run())
+
+    assert [path for _, path in stand_in.state.requests] == ["/v0/organizations/org-0/models/model-0/monitor-config/v3"]
+    assert all(document == documents[0] for document in documents)
+    assert len({id(document) for document in documents}) == 10
+    assert sorted(event.outcome for event in events) == [CallOutcome.coalesced] * 9 + [CallOutcome.ok]
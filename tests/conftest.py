@@ -1,10 +1,13 @@
 import os
+from typing import Callable, Iterator, List, Optional, Union
 
 import pytest
 
 from whylabs_toolkit.monitor.manager import MonitorSetup
 from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.helpers.client import close_clients
 from whylabs_toolkit.helpers.config import UserConfig
+from whylabs_toolkit.testing.stand_in import StandInServer
 
 
 @pytest.fixture
@@ -33,4 +36,48 @@ def user_config() -> UserConfig:
         dataset_id=os.environ["DEV_DATASET_ID"],
         whylabs_host="https://songbird.development.whylabsdev.com"
     )
-    return config
\ No newline at end of file
+    return config
+
+@pytest.fixture
+def stand_in(monkeypatch: pytest.MonkeyPatch) -> Iterator[StandInServer]:
+    # Retries of injected failures don't need to wait as long as against WhyLabs
+    monkeypatch.setenv("WHYLABS_RETRY_BACKOFF_SECONDS", "0.01")
+    with StandInServer() as server:
+        server.state.add_dataset(org_id="org-0", dataset_id="model-0")
+        yield server
+    # A later server may get the same port, and with it this server's pooled client and cached responses
+    close_clients()
+
+@pytest.fixture
+def applied_setup(stand_in: StandInServer) -> Callable[..., MonitorSetup]:
+    """Makes applied setups of a pct DiffConfig on the stand-in server, notifying one email action by default."""
+    def make(
+        monitor_id: str,
+        dataset_id: str = "model-0",
+        actions: Optional[List[Union[GlobalAction, EmailRecipient, SlackWebhook, PagerDuty]]] = None,
+        schedule: Optional[FixedCadenceSchedule] = None,
+        columns: Optional[List[str]] = None,
+    ) -> MonitorSetup:
+        setup = MonitorSetup(monitor_id=monitor_id, dataset_id=dataset_id, config=stand_in.config())
+        setup.config = DiffConfig(
+            mode=DiffMode.pct,
+            threshold=12.0,
+            metric=SimpleColumnMetric.median,
+            baseline=TrailingWindowBaseline(size=14)
+        )
+        if schedule:
+            setup.schedule = schedule
+        if columns:
+            setup.set_target_columns(columns)
+            setup.exclude_target_columns(columns[-1:])
+        if actions is None:
+            actions = [EmailRecipient(id="stand_in_email", destination="someemail@email.com")]
+        setup.actions = actions
+        setup.apply()
+        return setup
+    return make
+
+@pytest.fixture
+def response_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The response cache is opt-in, turn it on for the clients created by the test
+    monkeypatch.setenv("WHYLABS_CACHE_TTL_SECONDS", "60")
@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+from whylabs_toolkit.helpers.cache import CachedResponse, TTLCache, is_cacheable, write_scope
+from whylabs_toolkit.helpers.client import get_shared_client
+from whylabs_toolkit.helpers.monitor_helpers import get_model_granularity, get_monitor_config
+from whylabs_toolkit.helpers.utils import get_monitor_api
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+CONFIG_PATH = "/v0/organizations/org-0/models/model-0/monitor-config/v3"
+
+
+def _response(data: bytes = b"{}") -> CachedResponse:
+    return CachedResponse(status=200, reason="OK", data=data, headers={"Content-Type": "application/json"})
+
+
+def test_only_read_only_lookups_are_cacheable() -> None:
+    assert is_cacheable("GET", CONFIG_PATH)
+    assert is_cacheable("GET", "/v0/organizations/org-0/models/model-0")
+    assert is_cacheable("GET", "/v0/organizations/org-0/models/model-0/schema")
+    assert is_cacheable("GET", "/v0/notification-settings/org-0/actions")
+    assert not is_cacheable("PUT", CONFIG_PATH)
+    assert not is_cacheable("GET", "/v0/organizations/org-0/models/model-0/monitor-config/monitor/some-id")
+
+
+def test_write_scope() -> None:
+    assert write_scope(f"/v0/organizations/org-0/models/model-0/monitor-config/monitor/id") == (
+        "/v0/organizations/org-0/models/model-0"
+    )
+    assert write_scope("/v0/notification-settings/org-0/actions/EMAIL/id") == "/v0/notification-settings/org-0"
+
+
+def test_entries_expire_after_ttl() -> None:
+    cache = TTLCache(ttl=0.01)
+    cache.set(CONFIG_PATH, _response())
+
+    assert cache.get(CONFIG_PATH) is not None
+    time.sleep(0.02)
+    assert cache.get(CONFIG_PATH) is None
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = TTLCache(maxsize=2)
+    cache.set("a", _response())
+    cache.set("b", _response())
+    cache.get("a")
+    cache.set("c", _response())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats().evictions == 1
+    assert cache.stats().size == 2
+
+
+def test_invalidation_is_scoped_to_the_dataset() -> None:
+    cache = TTLCache()
+    cache.set(f"{CONFIG_PATH}?", _response())
+    cache.set("/v0/organizations/org-0/models/model-01/schema?", _response())
+
+    cache.invalidate("/v0/organizations/org-0/models/model-0")
+
+    assert cache.get(f"{CONFIG_PATH}?") is None
+    assert cache.get("/v0/organizations/org-0/models/model-01/schema?") is not None
+
+
+def test_hits_return_fresh_objects() -> None:
+    cache = TTLCache()
+    cache.set("a", _response())
+
+    first = cache.get("a")
+    first.data = "decoded"  # type: ignore
+
+    assert cache.get("a").data == b"{}"  # type: ignore
+
+
+@pytest.mark.usefixtures("response_cache")
+def test_repeated_lookups_are_served_from_cache(stand_in: StandInServer) -> None:
+    config = stand_in.config()
+
+    get_model_granularity(config=config)
+    get_model_granularity(config=config)
+    first = get_monitor_config(org_id="org-0", dataset_id="model-0", config=config)
+    first["monitors"].append("mutated")
+    second = get_monitor_config(org_id="org-0", dataset_id="model-0", config=config)
+
+    assert stand_in.state.requests.count(("GET", "/v0/organizations/org-0/models/model-0")) == 1
+    assert stand_in.state.requests.count(("GET", CONFIG_PATH)) == 1
+    assert second["monitors"] == []
+    assert get_shared_client(config=config).cache.stats().hits == 2
+
+
+def test_writes_invalidate_cached_reads(stand_in: StandInServer) -> None:
+    config = stand_in.config()
+    api = get_monitor_api(config=config)
+    document = get_monitor_config(org_id="org-0", dataset_id="model-0", config=config)
+
+    document["allowPartialTargetBatches"] = True
+    api.put_monitor_config_v3(org_id="org-0", dataset_id="model-0", body=document)
+
+    assert get_monitor_config(org_id="org-0", dataset_id="model-0", config=config)["allowPartialTargetBatches"]
+    assert stand_in.state.requests.count(("GET", CONFIG_PATH)) == 2
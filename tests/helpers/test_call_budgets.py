@@ -0,0 +1,48 @@
+from whylabs_toolkit.helpers.inventory import iter_org_inventory
+from whylabs_toolkit.helpers.monitor_helpers import delete_monitor, get_analyzers, get_model_granularity, get_monitor
+from whylabs_toolkit.helpers.schema import UpdateEntityDataTypes
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.budget import call_budget
+from whylabs_toolkit.testing.documents import ANALYZER_BODY, MONITOR_BODY
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+MONITOR_ID = MONITOR_BODY["id"]
+
+
+def _seed(stand_in: StandInServer) -> None:
+    stand_in.state.documents[("org-0", "model-0")].update(monitors=[MONITOR_BODY], analyzers=[ANALYZER_BODY])
+
+
+def test_monitor_lookups(stand_in: StandInServer) -> None:
+    _seed(stand_in)
+    config = stand_in.config()
+
+    with call_budget(3, name="monitor, analyzers and granularity lookups", max_writes=0):
+        get_monitor(monitor_id=MONITOR_ID, org_id="org-0", dataset_id="model-0", config=config)
+        get_analyzers(monitor_id=MONITOR_ID, org_id="org-0", dataset_id="model-0", config=config)
+        get_model_granularity(org_id="org-0", dataset_id="model-0", config=config)
+
+
+def test_delete_monitor(stand_in: StandInServer) -> None:
+    _seed(stand_in)
+
+    with call_budget(3, name="delete_monitor", max_writes=2):
+        delete_monitor(monitor_id=MONITOR_ID, org_id="org-0", dataset_id="model-0", config=stand_in.config())
+
+
+def test_entity_schema_update(stand_in: StandInServer) -> None:
+    stand_in.state.schemas[("org-0", "model-0")]["columns"] = {
+        "a": {"classifier": "input", "dataType": "fractional", "discreteness": "continuous"}
+    }
+
+    with call_budget(2, name="UpdateEntityDataTypes.update", max_writes=1):
+        UpdateEntityDataTypes(columns_schema={"a": ColumnDataType.integral}, config=stand_in.config()).update()
+
+
+def test_org_inventory(stand_in: StandInServer) -> None:
+    for i in range(1, 10):
+        stand_in.state.add_dataset(org_id="org-0", dataset_id=f"model-{i}")
+
+    # One listing, which has the models, then the monitor config and schema of each dataset
+    with call_budget(1 + 2 * 10, name="iter_org_inventory of 10 datasets", max_writes=0):
+        assert len(list(iter_org_inventory(org_id="org-0", max_workers=4, config=stand_in.config()))) == 10
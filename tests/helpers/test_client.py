@@ -0,0 +1,58 @@
+from whylabs_toolkit.helpers.client import ClientRegistry, close_clients, get_shared_client
+from whylabs_toolkit.helpers.config import UserConfig
+from whylabs_toolkit.helpers.utils import get_models_api, get_monitor_api, get_notification_api
+
+
+def _config(api_key: str = "key", host: str = "http://localhost:8080") -> UserConfig:
+    return UserConfig(api_key=api_key, org_id="org-0", dataset_id="model-0", whylabs_host=host)
+
+
+def test_apis_share_one_client_per_host_and_key() -> None:
+    config = _config()
+
+    models_api = get_models_api(config=config)
+    monitor_api = get_monitor_api(config=config)
+    notifications_api = get_notification_api(config=config)
+
+    assert models_api.api_client is monitor_api.api_client
+    assert monitor_api.api_client is notifications_api.api_client
+    assert get_shared_client(config=_config()) is models_api.api_client
+
+
+def test_different_credentials_get_different_clients() -> None:
+    registry = ClientRegistry()
+
+    client = registry.get(config=_config())
+
+    assert registry.get(config=_config(api_key="other-key")) is not client
+    assert registry.get(config=_config(host="http://localhost:8081")) is not client
+    assert len(registry) == 3
+
+
+def test_pool_size_and_keepalive_are_applied(monkeypatch) -> None:
+    monkeypatch.setenv("WHYLABS_CONNECTION_POOL_MAXSIZE", "32")
+    registry = ClientRegistry()
+
+    client = registry.get(config=_config())
+
+    assert client.configuration.connection_pool_maxsize == 32
+    assert client.rest_client.pool_manager.connection_pool_kw["maxsize"] == 32
+    assert client.configuration.socket_options is not None
+
+
+def test_close_drops_pooled_clients() -> None:
+    registry = ClientRegistry()
+    client = registry.get(config=_config())
+
+    registry.close()
+
+    assert len(registry) == 0
+    assert registry.get(config=_config()) is not client
+
+
+def test_close_clients_resets_shared_registry() -> None:
+    client = get_shared_client(config=_config())
+
+    close_clients()
+
+    assert get_shared_client(config=_config()) is not client
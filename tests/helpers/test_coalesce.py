@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+import pytest
+from whylabs_client.exceptions import ApiException
+
+from whylabs_toolkit.helpers.coalesce import AsyncSingleFlight, SingleFlight
+from whylabs_toolkit.helpers.instrumentation import ApiCallEvent, CallOutcome, observe_api_calls
+from whylabs_toolkit.helpers.schema import UpdateEntityDataTypes
+from whylabs_toolkit.helpers.utils import get_models_api, get_monitor_api
+from whylabs_toolkit.monitor.models import ColumnDataType
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+def _concurrently(workers: int, func: Any) -> List[Any]:
+    barrier = threading.Barrier(workers)
+
+    def run() -> Any:
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run) for _ in range(workers)]
+        return [future.result() for future in futures]
+
+
+def test_single_flight_shares_one_call() -> None:
+    single_flight = SingleFlight()
+    calls = []
+
+    def slow_read() -> str:
+        calls.append(1)
+        time.sleep(0.1)
+        return "document"
+
+    results = _concurrently(8, lambda: single_flight.do("key", slow_read))
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert {result for result, _ in results} == {"document"}
+    assert single_flight.stats().shared == 7 and single_flight.in_flight() == 0
+
+
+def test_single_flight_shares_errors() -> None:
+    single_flight = SingleFlight()
+
+    def failing_read() -> str:
+        time.sleep(0.1)
+        raise ValueError("unavailable")
+
+    def read() -> Any:
+        with pytest.raises(ValueError):
+            single_flight.do("key", failing_read)
+
+    _concurrently(4, read)
+
+    assert single_flight.stats().flights == 1
+    assert single_flight.do("key", lambda: "recovered") == ("recovered", False)
+
+
+def test_forgotten_flights_are_not_joined() -> None:
+    single_flight = SingleFlight()
+    started = threading.Event()
+
+    def stale_read() -> str:
+        started.set()
+        time.sleep(0.1)
+        return "before the write"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(single_flight.do, "/models/a?", stale_read)
+        started.wait()
+        single_flight.forget(lambda key: key.startswith("/models/a"))
+
+        assert single_flight.do("/models/a?", lambda: "after the write") == ("after the write", False)
+        assert future.result() == ("before the write", False)
+
+
+def test_concurrent_reads_share_one_request(stand_in: StandInServer, monkeypatch: Any) -> None:
+    monkeypatch.setenv("WHYLABS_CACHE_TTL_SECONDS", "0")
+    stand_in.state.latency = 0.2
+    api = get_monitor_api(config=stand_in.config())
+    api.api_client.single_flight = SingleFlight()  # the client's counters start from zero
+    events: List[ApiCallEvent] = []
+
+    def read() -> Any:
+        with observe_api_calls(events.append):
+            return api.get_monitor_config_v3(org_id="org-0", dataset_id="model-0")
+
+    documents = _concurrently(8, read)
+
+    assert len(stand_in.state.served) == 1
+    assert api.api_client.single_flight.stats().shared == 7
+    assert all(document == documents[0] for document in documents)
+    assert len({id(document) for document in documents}) == 8
+    outcomes = sorted(event.outcome.value for event in events)
+    assert outcomes == [CallOutcome.coalesced.value] * 7 + [CallOutcome.ok.value]
+
+
+def test_shared_errors_reach_every_reader(stand_in: StandInServer, monkeypatch: Any) -> None:
+    monkeypatch.setenv("WHYLABS_MAX_RETRIES", "0")
+    stand_in.state.latency = 0.2
+    api = get_models_api(config=stand_in.config())
+
+    def read() -> int:
+        with pytest.raises(ApiException) as error:
+            api.get_model(org_id="org-0", model_id="missing")
+        return error.value.status  # type: ignore
+
+    assert _concurrently(4, read) == [404] * 4
+    assert len(stand_in.state.served) == 1
+
+
+def test_reads_after_a_write_see_it(stand_in: StandInServer, monkeypatch: Any) -> None:
+    monkeypatch.setenv("WHYLABS_CACHE_TTL_SECONDS", "0")
+    stand_in.state.schemas[("org-0", "model-0")]["columns"] = {
+        "a": {"classifier": "input", "dataType": "fractional", "discreteness": "continuous"}
+    }
+    config = stand_in.config()
+
+    UpdateEntityDataTypes(columns_schema={"a": ColumnDataType.integral}, config=config).update()
+    schema = get_models_api(config=config).get_entity_schema(org_id="org-0", dataset_id="model-0")
+
+    assert schema["columns"]["a"]["data_type"] == "integral"
+
+
+def test_async_single_flight() -> None:
+    single_flight = AsyncSingleFlight()
+    calls = []
+
+    async def slow_read() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "document"
+
+    async def run() -> None:
+        impatient = asyncio.ensure_future(single_flight.do("key", slow_read))
+        others = [single_flight.do("key", slow_read) for _ in range(4)]
+        await asyncio.sleep(0)
+        impatient.cancel()
+        # Cancelling one waiter leaves the shared call running for the others
+        results = await asyncio.gather(*others)
+        assert [result for result, _ in results] == ["document"] * 4
+        assert [shared for _, shared in results] == [True] * 4
+
+    asyncio.run(run())
+
+    assert len(calls) == 1
@@ -0,0 +1,66 @@
+import gzip
+import json
+from typing import Any, Dict, List, Tuple
+
+from whylabs_toolkit.helpers.compression import GzipPoolManager
+from whylabs_toolkit.helpers.utils import get_monitor_api
+from whylabs_toolkit.testing.documents import generate_stddev_document
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+class RecordingPoolManager:
+    def __init__(self) -> None:
+        self.requests: List[Tuple[Any, Dict[str, str]]] = []
+
+    def request(self, method: str, url: str, body: Any = None, headers: Any = None, **kwargs: Any) -> None:
+        self.requests.append((body, headers or {}))
+
+    def clear(self) -> None:
+        self.requests.clear()
+
+
+def test_pool_manager_attributes_are_forwarded() -> None:
+    pool_manager = RecordingPoolManager()
+    GzipPoolManager(pool_manager).request("GET", "/read")
+
+    GzipPoolManager(pool_manager).clear()
+
+    assert pool_manager.requests == []
+
+
+def test_compressed_bodies_round_trip() -> None:
+    pool_manager = RecordingPoolManager()
+    body = json.dumps({"include": ["column"] * 50})
+
+    GzipPoolManager(pool_manager, min_bytes=100).request("PUT", "/large", body=body, headers={"X": "1"})
+    GzipPoolManager(pool_manager, min_bytes=100).request("PUT", "/small", body="{}")
+
+    (large, large_headers), (small, small_headers) = pool_manager.requests
+    assert large_headers == {"X": "1", "Content-Encoding": "gzip"}
+    assert json.loads(gzip.decompress(large)) == json.loads(body)
+    assert (small, small_headers) == ("{}", {})
+
+
+def test_large_documents_are_gzipped_both_ways(stand_in: StandInServer, monkeypatch: Any) -> None:
+    monkeypatch.setenv("WHYLABS_GZIP", "true")
+    monkeypatch.setenv("WHYLABS_CACHE_TTL_SECONDS", "0")
+    document = generate_stddev_document(analyzers=50, columns=20)
+    api = get_monitor_api(config=stand_in.config())
+
+    api.put_monitor_config_v3(org_id="org-0", dataset_id="model-0", body=document)
+    saved = api.get_monitor_config_v3(org_id="org-0", dataset_id="model-0")
+
+    assert len(saved["analyzers"]) == 50
+    assert saved["analyzers"][7]["targetMatrix"]["include"] == document["analyzers"][7]["targetMatrix"]["include"]
+    put, get = stand_in.state.served
+    size = len(json.dumps(document))
+    assert put.request_bytes < size / 5
+    assert get.response_bytes < size / 5
+
+
+def test_gzip_is_opt_in(stand_in: StandInServer) -> None:
+    document = generate_stddev_document(analyzers=5, columns=20)
+
+    get_monitor_api(config=stand_in.config()).put_monitor_config_v3(org_id="org-0", dataset_id="model-0", body=document)
+
+    assert stand_in.state.served[0].request_bytes == len(json.dumps(document))
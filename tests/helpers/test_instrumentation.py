@@ -0,0 +1,280 @@
+import enum
+import sys
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pytest
+from whylabs_client.exceptions import ApiException
+
+from whylabs_toolkit.helpers.instrumentation import (
+    ApiCallEvent,
+    CallOutcome,
+    Histogram,
+    HistogramCollector,
+    Instrumentation,
+    NoopInstrumentation,
+    get_instrumentation,
+    operation,
+    set_instrumentation,
+)
+from whylabs_toolkit.helpers.schema import ColumnsDiscreteness, UpdateColumnsDiscreteness
+from whylabs_toolkit.helpers.utils import get_models_api
+from whylabs_toolkit.monitor.manager import MonitorManager, MonitorSetup
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+MONITOR_CONFIG = "/v0/organizations/{org_id}/models/{dataset_id}/monitor-config/v3"
+MODEL = "/v0/organizations/{org_id}/models/{model_id}"
+
+
+class Recorder(Instrumentation):
+    def __init__(self) -> None:
+        self.events: List[ApiCallEvent] = []
+        self.spans: List[str] = []
+
+    def on_api_call(self, event: ApiCallEvent) -> None:
+        self.events.append(event)
+
+    def span(self, name: str, attributes: Dict[str, Any]) -> Any:
+        self.spans.append(name)
+        return super().span(name, attributes)
+
+
+@pytest.fixture
+def recorder() -> Iterator[Recorder]:
+    recorder = Recorder()
+    set_instrumentation(recorder)
+    yield recorder
+    set_instrumentation(None)
+
+
+def test_noop_by_default() -> None:
+    assert isinstance(get_instrumentation(), NoopInstrumentation)
+
+
+def test_api_calls_are_reported_with_their_operation(
+    stand_in: StandInServer, recorder: Recorder, applied_setup: Callable[..., MonitorSetup]
+) -> None:
+    MonitorManager(setup=applied_setup("instrumented-monitor", actions=[]), config=stand_in.config()).save()
+
+    assert recorder.spans[:2] == ["MonitorSetup.init", "MonitorSetup.apply"]
+    assert "MonitorManager.save" in recorder.spans
+    config_read = recorder.events[0]
+    assert (config_read.method, config_read.endpoint) == ("GET", MONITOR_CONFIG)
+    assert (config_read.org_id, config_read.dataset_id) == ("org-0", "model-0")
+    assert config_read.operation == "MonitorSetup.init"
+    assert config_read.outcome == CallOutcome.ok and config_read.response_bytes > 0
+    writes = [event for event in recorder.events if event.method == "PUT"]
+    assert writes and all(event.request_bytes > 0 and event.operation == "MonitorManager.save" for event in writes)
+
+
+@pytest.mark.usefixtures("response_cache")
+def test_outcomes(stand_in: StandInServer, recorder: Recorder) -> None:
+    api = get_models_api(config=stand_in.config())
+    stand_in.state.inject_failure("/models/model-0/schema$", status=500)
+
+    api.get_model(org_id="org-0", model_id="model-0")
+    api.get_model(org_id="org-0", model_id="model-0")
+    for _ in range(2):
+        with pytest.raises(ApiException):
+            api.get_model(org_id="org-0", model_id="missing")
+    with pytest.raises(ApiException):
+        api.get_entity_schema(org_id="org-0", dataset_id="model-0")
+
+    outcomes = [(event.outcome, event.status) for event in recorder.events]
+    assert outcomes == [
+        (CallOutcome.ok, 200),
+        (CallOutcome.cached, 200),
+        (CallOutcome.client_error, 404),
+        (CallOutcome.client_error, 404),
+        (CallOutcome.server_error, 500),
+    ]
+    assert recorder.events[-1].error.startswith("ServiceException")  # type: ignore
+    assert [event.retries for event in recorder.events] == [0, 0, 0, 0, 3]
+    assert recorder.events[-1].retry_time > 0
+
+
+def test_entity_updates_are_spans(stand_in: StandInServer, recorder: Recorder) -> None:
+    stand_in.state.schemas[("org-0", "model-0")]["columns"] = {
+        "a": {"classifier": "input", "dataType": "fractional", "discreteness": "discrete"}
+    }
+
+    UpdateColumnsDiscreteness(columns=ColumnsDiscreteness(continuous=["a"]), config=stand_in.config()).update()
+
+    assert recorder.spans == ["UpdateColumnsDiscreteness.update"]
+    assert [(event.method, event.operation) for event in recorder.events] == [
+        ("GET", "UpdateColumnsDiscreteness.update"),
+        ("PUT", "UpdateColumnsDiscreteness.update"),
+    ]
+
+
+def test_histogram_collector(stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]) -> None:
+    collector = HistogramCollector()
+    set_instrumentation(collector)
+    try:
+        for i in range(3):
+            MonitorManager(setup=applied_setup(f"histogram-monitor-{i}", actions=[]), config=stand_in.config()).save()
+    finally:
+        set_instrumentation(None)
+
+    stats = collector.endpoints[("GET", MONITOR_CONFIG)]
+    assert stats.latency.count == stats.outcomes[CallOutcome.ok] + stats.outcomes.get(CallOutcome.cached, 0)
+    assert 0 < collector.percentile("GET", MONITOR_CONFIG, 50) <= collector.percentile("GET", MONITOR_CONFIG, 99)
+    assert collector.operations["MonitorSetup.init"].count == 3
+    assert MONITOR_CONFIG in collector.report()
+
+
+def test_histogram_percentiles() -> None:
+    histogram = Histogram(precision=0.01)
+    for i in range(1, 1001):
+        histogram.record(i / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.01)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.01)
+    assert histogram.percentile(100) == 1.0
+    assert Histogram().percentile(99) == 0.0
+
+
+def test_operations_nest() -> None:
+    recorder = Recorder()
+    set_instrumentation(recorder)
+    try:
+        with operation("outer"):
+            with operation("inner"):
+                pass
+    finally:
+        set_instrumentation(None)
+
+    assert recorder.spans == ["outer", "inner"]
+
+
+def test_open_telemetry_adapter(stand_in: StandInServer) -> None:
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from whylabs_toolkit.helpers.instrumentation import OpenTelemetryInstrumentation
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    set_instrumentation(OpenTelemetryInstrumentation(tracer=provider.get_tracer("test")))
+    try:
+        MonitorSetup(monitor_id="otel-monitor", config=stand_in.config())
+    finally:
+        set_instrumentation(None)
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans[f"GET {MONITOR_CONFIG}"].parent.span_id == spans["MonitorSetup.init"].context.span_id
+
+
+class StubSpan:
+    def __init__(self, name: str, parent: Optional["StubSpan"], **kwargs: Any) -> None:
+        self.name = name
+        self.parent = parent
+        self.kind = kwargs.get("kind")
+        self.attributes = kwargs.get("attributes") or {}
+        self.status: Any = None
+        self.ended = False
+
+    def set_status(self, status: Any) -> None:
+        self.status = status
+
+    def end(self, end_time: Optional[int] = None) -> None:
+        self.ended = True
+
+
+class StubTracer:
+    """Records spans, their parent being the span current when they start."""
+
+    def __init__(self) -> None:
+        self.spans: List[StubSpan] = []
+        self._current: List[StubSpan] = []
+
+    def start_span(self, name: str, **kwargs: Any) -> StubSpan:
+        span = StubSpan(name, self._current[-1] if self._current else None, **kwargs)
+        self.spans.append(span)
+        return span
+
+    @contextmanager
+    def start_as_current_span(self, name: str, **kwargs: Any) -> Iterator[StubSpan]:
+        span = self.start_span(name, **kwargs)
+        self._current.append(span)
+        try:
+            yield span
+        finally:
+            self._current.pop()
+            span.end()
+
+
+class StubMeter:
+    """Records what is added to or recorded in its instruments, by instrument name."""
+
+    def __init__(self) -> None:
+        self.points: Dict[str, List[Any]] = defaultdict(list)
+        self.callbacks: List[Callable[[Any], Any]] = []
+
+    def _instrument(self, name: str, **kwargs: Any) -> Any:
+        points = self.points[name]
+
+        class Instrument:
+            def add(self, value: float, attributes: Dict[str, Any]) -> None:
+                points.append((value, attributes))
+
+            record = add
+
+        return Instrument()
+
+    create_counter = create_histogram = _instrument
+
+    def create_observable_gauge(self, name: str, callbacks: List[Callable[[Any], Any]], **kwargs: Any) -> None:
+        self.callbacks.extend(callbacks)
+
+
+@pytest.fixture
+def stub_opentelemetry(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The parts of the opentelemetry-api package OpenTelemetryInstrumentation uses, so it runs without it
+    trace = ModuleType("opentelemetry.trace")
+    trace.SpanKind = enum.Enum("SpanKind", "INTERNAL CLIENT")  # type: ignore
+    trace.StatusCode = enum.Enum("StatusCode", "UNSET OK ERROR")  # type: ignore
+    trace.Status = namedtuple("Status", "status_code description")  # type: ignore
+    trace.get_tracer = lambda name: StubTracer()  # type: ignore
+    metrics = ModuleType("opentelemetry.metrics")
+    metrics.Observation = namedtuple("Observation", "value attributes")  # type: ignore
+    metrics.get_meter = lambda name: StubMeter()  # type: ignore
+    package = ModuleType("opentelemetry")
+    package.trace, package.metrics = trace, metrics  # type: ignore
+    for module in (package, trace, metrics):
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+
+
+@pytest.mark.usefixtures("stub_opentelemetry")
+def test_open_telemetry_adapter_with_stubs(stand_in: StandInServer) -> None:
+    from whylabs_toolkit.helpers.instrumentation import OpenTelemetryInstrumentation
+
+    tracer, meter = StubTracer(), StubMeter()
+    instrumentation = OpenTelemetryInstrumentation(tracer=tracer, meter=meter)
+    set_instrumentation(instrumentation)
+    try:
+        MonitorSetup(monitor_id="otel-monitor", config=stand_in.config())
+        with pytest.raises(ApiException):
+            get_models_api(config=stand_in.config()).get_model(org_id="org-0", model_id="missing")
+    finally:
+        set_instrumentation(None)
+    instrumentation.on_rate_change("stand-in", 5.0)
+
+    spans = {span.name: span for span in tracer.spans}
+    config_read, missing = spans[f"GET {MONITOR_CONFIG}"], spans[f"GET {MODEL}"]
+    assert config_read.parent is spans["MonitorSetup.init"] and config_read.kind.name == "CLIENT"
+    assert config_read.attributes["whylabs.dataset_id"] == "model-0" and config_read.status is None
+    assert missing.status.status_code.name == "ERROR" and missing.attributes["http.response.status_code"] == 404
+    assert all(span.ended for span in tracer.spans)
+    durations = meter.points["whylabs.api.duration"]
+    assert [attributes["http.route"] for _, attributes in durations] == [MONITOR_CONFIG, MODEL]
+    assert meter.points["whylabs.api.response.size"][0][0] > 0
+    assert [tuple(observation) for observation in meter.callbacks[0](None)] == [
+        (5.0, {"whylabs.rate_limiter": "stand-in"})
+    ]
@@ -0,0 +1,58 @@
+from whylabs_toolkit.helpers.inventory import fetch_dataset_inventory, iter_org_inventory, list_dataset_ids
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.documents import ANALYZER_BODY, MONITOR_BODY
+from whylabs_toolkit.testing.stand_in import SCHEMA_METADATA, StandInServer
+
+
+def _add_datasets(stand_in: StandInServer, count: int) -> None:
+    for i in range(1, count):
+        stand_in.state.add_dataset(org_id="org-0", dataset_id=f"model-{i}", time_period="PT1H")
+    stand_in.state.add_dataset(org_id="org-1", dataset_id="other-org-model")
+
+
+def test_list_dataset_ids(stand_in: StandInServer) -> None:
+    _add_datasets(stand_in, 3)
+
+    assert list_dataset_ids(org_id="org-0", config=stand_in.config()) == ["model-0", "model-1", "model-2"]
+
+
+def test_dataset_inventory_is_a_parsed_document(stand_in: StandInServer) -> None:
+    document = stand_in.state.documents[("org-0", "model-0")]
+    document.update(monitors=[MONITOR_BODY], analyzers=[ANALYZER_BODY])
+    stand_in.state.schemas[("org-0", "model-0")] = {
+        "columns": {"age": {"discreteness": "continuous", "dataType": "integral", "classifier": "input", "tags": []}},
+        "metadata": SCHEMA_METADATA,
+    }
+
+    inventory = fetch_dataset_inventory(org_id="org-0", dataset_id="model-0", config=stand_in.config())
+
+    assert inventory.ok
+    assert inventory.model["timePeriod"] == "P1D"  # type: ignore
+    assert isinstance(inventory.document, Document)
+    assert inventory.document.monitors[0].id == MONITOR_BODY["id"]
+    assert inventory.document.entitySchema.columns["age"].dataType == ColumnDataType.integral  # type: ignore
+
+
+def test_missing_monitor_config_yields_an_empty_document(stand_in: StandInServer) -> None:
+    _add_datasets(stand_in, 2)
+    del stand_in.state.documents[("org-0", "model-1")]
+
+    inventory = fetch_dataset_inventory(org_id="org-0", dataset_id="model-1", config=stand_in.config())
+
+    assert inventory.ok
+    assert inventory.document.granularity == Granularity.hourly  # type: ignore
+    assert inventory.document.monitors == []  # type: ignore
+
+
+def test_org_inventory_streams_every_dataset(stand_in: StandInServer) -> None:
+    _add_datasets(stand_in, 20)
+    stand_in.state.inject_failure("/models/model-7/monitor-config/v3$", status=500)
+
+    results = list(iter_org_inventory(org_id="org-0", max_workers=4, config=stand_in.config()))
+
+    assert sorted(result.dataset_id for result in results) == sorted(f"model-{i}" for i in range(20))
+    failed = [result for result in results if not result.ok]
+    assert [result.dataset_id for result in failed] == ["model-7"]
+    assert failed[0].document is None
+    assert all(isinstance(result.document, Document) for result in results if result.ok)
+    assert stand_in.state.requests.count(("GET", "/v0/organizations/org-0/models")) == 1
@@ -0,0 +1,44 @@
+from whylabs_toolkit.helpers.monitor_helpers import MonitorConfigIndex, get_analyzer_ids, get_analyzers
+from whylabs_toolkit.monitor.manager import MonitorSetup
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.documents import ANALYZER_BODY, MONITOR_BODY
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+MONITOR_ID = MONITOR_BODY["id"]
+
+
+def _seed(stand_in: StandInServer) -> None:
+    document = stand_in.state.documents[("org-0", "model-0")]
+    document["monitors"].append(MONITOR_BODY)
+    document["analyzers"].append(ANALYZER_BODY)
+    document["analyzers"].append(dict(ANALYZER_BODY, id="unrelated-analyzer"))
+
+
+def test_index_resolves_entities_by_id() -> None:
+    index = MonitorConfigIndex({"monitors": [MONITOR_BODY], "analyzers": [ANALYZER_BODY]})
+
+    assert index.get_monitor(MONITOR_ID) == MONITOR_BODY
+    assert index.get_analyzer_ids(MONITOR_ID) == [f"{MONITOR_ID}-analyzer"]
+    assert index.get_analyzers(MONITOR_ID) == [ANALYZER_BODY]
+    assert index.get_analyzers("missing-monitor") is None
+    assert MonitorConfigIndex(None).get_monitor(MONITOR_ID) is None
+
+
+def test_get_analyzers_reads_the_config_document_once(stand_in: StandInServer) -> None:
+    _seed(stand_in)
+
+    analyzers = get_analyzers(monitor_id=MONITOR_ID, config=stand_in.config())
+
+    assert [analyzer["id"] for analyzer in analyzers] == [f"{MONITOR_ID}-analyzer"]
+    assert stand_in.state.requests == [("GET", "/v0/organizations/org-0/models/model-0/monitor-config/v3")]
+    assert get_analyzer_ids(monitor_id="missing-monitor", config=stand_in.config()) is None
+
+
+def test_monitor_setup_costs_one_request(stand_in: StandInServer) -> None:
+    _seed(stand_in)
+
+    setup = MonitorSetup(monitor_id=MONITOR_ID, config=stand_in.config())
+
+    assert isinstance(setup.monitor, Monitor)
+    assert isinstance(setup.config, StddevConfig)
+    assert len(stand_in.state.requests) == 1
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any
+
+from whylabs_toolkit.helpers.client import close_clients, get_shared_client
+from whylabs_toolkit.helpers.instrumentation import HistogramCollector, set_instrumentation
+from whylabs_toolkit.helpers.rate_limit import FileBackend, RateLimiter, parse_retry_after
+from whylabs_toolkit.helpers.utils import get_models_api
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+def test_token_bucket_paces_requests() -> None:
+    limiter = RateLimiter(max_rate=20, burst=1)
+
+    start = time.monotonic()
+    for _ in range(5):
+        assert limiter.acquire()
+    elapsed = time.monotonic() - start
+
+    assert 0.15 <= elapsed < 1.0
+    assert limiter.stats().acquired == 5
+
+
+def test_acquire_timeout() -> None:
+    limiter = RateLimiter(max_rate=1, min_rate=0.1, burst=1)
+    assert limiter.acquire(timeout=0)
+
+    assert not limiter.acquire(timeout=0.1)
+
+
+def test_throttling_halves_the_rate_once_per_cooldown() -> None:
+    limiter = RateLimiter(max_rate=16, cooldown=60)
+
+    limiter.on_response(429)
+    limiter.on_response(503)
+
+    assert limiter.rate == 8
+    assert limiter.stats().throttled == 2
+
+    limiter = RateLimiter(max_rate=16, min_rate=3, cooldown=0)
+    for _ in range(5):
+        limiter.on_response(429)
+    assert limiter.rate == 3
+
+
+def test_successes_grow_the_rate_back() -> None:
+    limiter = RateLimiter(max_rate=4, initial_rate=1, additive_increase=1)
+
+    limiter.on_response(200)
+    assert limiter.rate == 2
+    limiter.on_response(404)
+    assert limiter.rate == 2.5
+    limiter.on_response(500)
+    assert limiter.rate == 2.5
+    for _ in range(20):
+        limiter.on_response(200)
+    assert limiter.rate == 4
+
+
+def test_retry_after_blocks_every_user_of_the_bucket() -> None:
+    limiter = RateLimiter(max_rate=100)
+    limiter.on_response(429, retry_after=0.2)
+
+    assert not limiter.acquire(timeout=0.05)
+    start = time.monotonic()
+    assert limiter.acquire()
+    assert time.monotonic() - start >= 0.1
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 8 <= parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10  # type: ignore
+
+
+def test_file_backend_is_shared(tmp_path: Path) -> None:
+    path = tmp_path / "limits" / "rate.json"
+    first = RateLimiter(max_rate=10, cooldown=0, backend=FileBackend(path), key="api")
+    second = RateLimiter(max_rate=10, cooldown=0, backend=FileBackend(path), key="api")
+    other = RateLimiter(max_rate=10, cooldown=0, backend=FileBackend(path), key="other-api")
+
+    first.on_response(429)
+
+    assert second.rate == 5
+    assert other.rate == 10
+
+    path.write_text("not json")
+    assert first.rate == 10
+
+
+def test_file_backend_is_updated_off_the_event_loop(tmp_path: Path) -> None:
+    backend = FileBackend(tmp_path / "limiter.json")
+    limiter = RateLimiter(max_rate=10, backend=backend)
+    update = backend.update
+    threads = []
+
+    def recording_update(func: Any) -> Any:
+        threads.append(threading.current_thread())
+        return update(func)
+
+    backend.update = recording_update  # type: ignore
+
+    async def run() -> None:
+        await limiter.acquire_async()
+        await limiter.on_answer_async(429, {"Retry-After": "1"})
+
+    asyncio.run(run())
+
+    assert len(threads) == 2 and threading.current_thread() not in threads
+    assert limiter.stats().throttled == 1
+
+
+def test_client_adapts_to_throttling(stand_in: StandInServer, monkeypatch: Any) -> None:
+    monkeypatch.setenv("WHYLABS_RATE_LIMIT", "50")
+    monkeypatch.setenv("WHYLABS_CACHE_TTL_SECONDS", "0")
+    close_clients()
+    collector = HistogramCollector()
+    set_instrumentation(collector)
+    try:
+        api = get_models_api(config=stand_in.config())
+        limiter = get_shared_client(config=stand_in.config()).rate_limiter  # type: ignore
+        assert limiter.key == stand_in.url
+
+        stand_in.state.inject_failure("/models/model-0$", status=429, times=1)
+        api.get_model(org_id="org-0", model_id="model-0")
+
+        # The retry after the 429 took its own token and its success grew the halved rate
+        assert 25 < limiter.rate < 26
+        assert collector.rates[stand_in.url] == limiter.rate
+        assert limiter.stats().acquired == 2
+        assert limiter.stats().throttled == 1
+    finally:
+        set_instrumentation(None)
+        close_clients()
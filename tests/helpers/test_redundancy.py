@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Sequence
+
+from whylabs_toolkit.helpers.inventory import DatasetInventory
+from whylabs_toolkit.helpers.redundancy import find_redundant_analyzers
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.documents import generate_analyzer, generate_document
+
+
+def _document(analyzers: List[Dict[str, Any]], dataset_id: str = "model-0") -> Document:
+    # 30 schema columns, feature_0 to feature_29; one in ten of them, from feature_0, is an output
+    payload = generate_document(0, schema_columns=30)
+    payload["datasetId"] = dataset_id
+    payload["analyzers"] = analyzers
+    return Document.parse_obj(payload)
+
+
+def _analyzer(i: int, include: List[str], exclude: Sequence[str] = (), config: str = "drift") -> Dict[str, Any]:
+    analyzer = generate_analyzer(i, 0, config)
+    analyzer["targetMatrix"].update(include=include, exclude=list(exclude), segments=[])
+    return analyzer
+
+
+def _columns(*numbers: int) -> List[str]:
+    return [f"feature_{number}_embedding_component" for number in numbers]
+
+
+def test_duplicates_are_found_by_dataset() -> None:
+    duplicated = [
+        _analyzer(0, _columns(1, 2)),
+        _analyzer(1, _columns(2, 1)),
+        _analyzer(2, _columns(1, 2), config="fixed"),
+    ]
+
+    report = find_redundant_analyzers([_document(duplicated), _document(duplicated[:1], dataset_id="model-1")])
+
+    assert report.datasets == 2
+    assert report.analyzers == 4
+    assert report.redundant_analyzers == 1
+    assert [(d.dataset_id, d.analyzer_ids) for d in report.duplicates] == [
+        ("model-0", ["bench-analyzer-0", "bench-analyzer-1"])
+    ]
+    assert report.overlaps == []
+
+
+def test_overlapping_columns_are_reported() -> None:
+    analyzers = [
+        _analyzer(0, _columns(1, 2, 3)),
+        _analyzer(1, _columns(3, 4)),
+        _analyzer(2, ["*"], exclude=["group:output", *_columns(4)]),
+        _analyzer(3, _columns(1, 2, 3), config="fixed"),
+    ]
+
+    report = find_redundant_analyzers([_document(analyzers)])
+
+    overlaps = {tuple(overlap.analyzer_ids): overlap.columns for overlap in report.overlaps}
+    assert overlaps == {
+        ("bench-analyzer-0", "bench-analyzer-2"): _columns(1, 2),
+        ("bench-analyzer-0", "bench-analyzer-1", "bench-analyzer-2"): _columns(3),
+    }
+
+
+def test_failed_inventories_are_skipped() -> None:
+    failed = DatasetInventory(org_id="org-0", dataset_id="model-1", error=ValueError("unavailable"))
+    fetched = DatasetInventory(org_id="org-0", dataset_id="model-0", document=_document([_analyzer(0, _columns(1))]))
+
+    report = find_redundant_analyzers([failed, fetched])
+
+    assert report.datasets == 1
+    assert report.summary().startswith("1 analyzers in 1 datasets, 0 duplicated")
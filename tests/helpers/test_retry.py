@@ -0,0 +1,167 @@
+import random
+import socket
+import time
+from typing import Any, Dict, List
+
+import pytest
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+from whylabs_client.exceptions import ApiException
+
+from whylabs_toolkit.helpers.client import get_shared_client
+from whylabs_toolkit.helpers.config import UserConfig
+from whylabs_toolkit.helpers.instrumentation import operation
+from whylabs_toolkit.helpers.retry import Retrier, RetryPolicy, deadline
+from whylabs_toolkit.helpers.utils import get_models_api
+from whylabs_toolkit.monitor.manager import MonitorManager, MonitorSetup
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+def _api_error(status: int, headers: Dict[str, str] = {}) -> ApiException:
+    error = ApiException(status=status, reason="Unavailable")
+    error.headers = headers
+    return error
+
+
+class Flaky:
+    def __init__(self, *errors: BaseException) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_policy_is_idempotency_aware() -> None:
+    policy = RetryPolicy()
+    refused = MaxRetryError(None, "/", reason=NewConnectionError(None, "refused"))  # type: ignore
+
+    assert policy.is_retryable("GET", _api_error(503))
+    assert policy.is_retryable("PUT", _api_error(429))
+    assert policy.is_retryable("DELETE", ProtocolError("reset"))
+    assert not policy.is_retryable("POST", _api_error(503))
+    assert not policy.is_retryable("PATCH", ProtocolError("reset"))
+    assert not policy.is_retryable("GET", _api_error(404))
+    assert not policy.is_retryable("GET", ValueError())
+    # A request that never reached the server is safe to send again whatever its method
+    assert policy.is_retryable("POST", refused)
+
+
+def test_backoff_is_jittered_and_capped() -> None:
+    policy = RetryPolicy(backoff=1, max_backoff=4)
+    rng = random.Random(0)
+
+    delays = [policy.delay(retry, rng=rng) for retry in range(1, 6) for _ in range(50)]
+
+    assert all(0 <= wait < 4 for wait in delays)
+    assert len(set(delays)) == len(delays)
+    assert max(policy.delay(1, rng=rng) for _ in range(50)) < 1
+    assert policy.delay(1, retry_after=7, rng=rng) == 7
+
+
+def test_retrier_recovers_and_counts() -> None:
+    retrier = Retrier(RetryPolicy(backoff=0.01), seed=0)
+    send = Flaky(_api_error(503), _api_error(500))
+
+    assert retrier.call("GET", "/models", send) == "ok"
+
+    stats = retrier.stats()
+    assert send.calls == 3
+    assert (stats.retries, stats.recovered, stats.exhausted) == (2, 1, 0)
+    assert stats.time_lost > 0
+
+
+def test_retrier_gives_up() -> None:
+    retrier = Retrier(RetryPolicy(max_retries=2, backoff=0.01))
+    send = Flaky(*[_api_error(503)] * 5)
+
+    with pytest.raises(ApiException):
+        retrier.call("PUT", "/models", send)
+    assert send.calls == 3
+    assert retrier.stats().exhausted == 1
+
+    send = Flaky(_api_error(503))
+    with pytest.raises(ApiException):
+        retrier.call("POST", "/models", send)
+    assert send.calls == 1
+
+
+def test_retry_after_is_honored() -> None:
+    retrier = Retrier(RetryPolicy(backoff=0.001))
+    send = Flaky(_api_error(429, {"Retry-After": "0.2"}))
+
+    start = time.monotonic()
+    retrier.call("GET", "/models", send)
+
+    assert time.monotonic() - start >= 0.2
+
+
+def test_deadlines() -> None:
+    retrier = Retrier(RetryPolicy(backoff=0.01))
+    send = Flaky(_api_error(429, {"Retry-After": "5"}))
+    with deadline(1):
+        with pytest.raises(ApiException):
+            retrier.call("GET", "/models", send)
+    assert send.calls == 1
+
+    retrier = Retrier(RetryPolicy(backoff=0.01, deadline=0.1))
+    send = Flaky(_api_error(429, {"Retry-After": "5"}))
+    with pytest.raises(ApiException):
+        retrier.call("GET", "/models", send)
+    assert send.calls == 1
+
+
+def test_deadline_counts_from_the_first_attempt_of_each_call(stand_in: StandInServer, monkeypatch: Any) -> None:
+    monkeypatch.setenv("WHYLABS_RETRY_DEADLINE_SECONDS", "0.2")
+    stand_in.state.inject_failure("/models/model-0$", status=503, times=1)
+    api = get_models_api(config=stand_in.config())
+
+    # The policy deadline is over long before the call is made
+    with operation("long operation"):
+        time.sleep(0.3)
+        model = api.get_model(org_id="org-0", model_id="model-0")
+
+    assert model["id"] == "model-0"
+    assert [served.status for served in stand_in.state.served] == [503, 200]
+
+
+def test_transient_failures_during_save(stand_in: StandInServer) -> None:
+    config = stand_in.config()
+    stand_in.state.inject_failure("/monitor-config/monitor/", status=503, method="PUT", times=2)
+    stand_in.state.inject_failure("/monitor-config/v3$", status=502, method="GET", times=1)
+
+    setup = MonitorSetup(monitor_id="retried-monitor", config=config)
+    setup.config = StddevConfig(metric=SimpleColumnMetric.median, baseline=TrailingWindowBaseline(size=14))
+    setup.apply()
+    MonitorManager(setup=setup, config=config).save()
+
+    document = stand_in.state.documents[("org-0", "model-0")]
+    assert [monitor["id"] for monitor in document["monitors"]] == ["retried-monitor"]
+    stats = get_shared_client(config=config).retrier.stats()  # type: ignore
+    assert (stats.retries, stats.recovered, stats.exhausted) == (3, 2, 0)
+
+
+def test_creates_are_not_retried(stand_in: StandInServer) -> None:
+    stand_in.state.inject_failure("/models$", status=503, method="POST", times=1)
+
+    with pytest.raises(ApiException):
+        get_models_api(config=stand_in.config()).create_model(org_id="org-0", model_name="Churn", time_period="P1D")
+    assert [(method, path) for method, path in stand_in.state.requests if method == "POST"] == [
+        ("POST", "/v0/organizations/org-0/models")
+    ]
+
+
+def test_connection_failures_are_retried(stand_in: StandInServer, caplog: Any) -> None:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = UserConfig(api_key="key", org_id="org-0", dataset_id="model-0", whylabs_host=f"http://127.0.0.1:{port}")
+
+    with pytest.raises(MaxRetryError):
+        get_models_api(config=config).get_model(org_id="org-0", model_id="model-0")
+
+    retries: List[str] = [record.message for record in caplog.records if "retrying in" in record.message]
+    assert len(retries) == 3 and "NewConnectionError" in retries[0]
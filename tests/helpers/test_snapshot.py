@@ -0,0 +1,118 @@
+import gzip
+import json
+from pathlib import Path
+
+from whylabs_toolkit.helpers.client import use_snapshot
+from whylabs_toolkit.helpers.inventory import sync_snapshot, to_document
+from whylabs_toolkit.helpers.monitor_helpers import get_model_granularity
+from whylabs_toolkit.helpers.snapshot import DatasetSnapshot, SnapshotStore
+from whylabs_toolkit.monitor.manager import MonitorManager, MonitorSetup
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.documents import ANALYZER_BODY, MONITOR_BODY
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+DOCUMENT_METADATA = {"version": 1, "updatedTimestamp": 1700000000000, "author": "system"}
+
+
+def _seed(stand_in: StandInServer) -> None:
+    stand_in.state.add_dataset(org_id="org-0", dataset_id="model-1")
+    stand_in.state.documents[("org-0", "model-0")].update(
+        monitors=[MONITOR_BODY], analyzers=[ANALYZER_BODY], metadata=dict(DOCUMENT_METADATA)
+    )
+
+
+def test_sync_only_writes_changed_datasets(stand_in: StandInServer, tmp_path: Path) -> None:
+    _seed(stand_in)
+    store = SnapshotStore(tmp_path)
+
+    first = sync_snapshot(store, org_id="org-0", config=stand_in.config())
+    second = sync_snapshot(store, org_id="org-0", config=stand_in.config())
+    stand_in.state.documents[("org-0", "model-0")]["metadata"]["version"] = 2
+    del stand_in.state.models[("org-0", "model-1")]
+    third = sync_snapshot(store, org_id="org-0", config=stand_in.config())
+
+    assert sorted(first.updated) == ["model-0", "model-1"]
+    assert sorted(second.unchanged) == ["model-0", "model-1"] and second.updated == []
+    assert third.updated == ["model-0"] and third.removed == ["model-1"]
+    assert store.dataset_ids("org-0") == ["model-0"]
+    # The model metadata comes from the org listing
+    assert ("GET", "/v0/organizations/org-0/models/model-0") not in stand_in.state.requests
+
+
+def test_stale_only_sync_reads_the_written_datasets(stand_in: StandInServer, tmp_path: Path) -> None:
+    _seed(stand_in)
+    stand_in.state.add_dataset(org_id="org-0", dataset_id="model-2")
+    store = SnapshotStore(tmp_path)
+    sync_snapshot(store, org_id="org-0", dataset_ids=["model-0", "model-1"], config=stand_in.config())
+    store.invalidate("/v0/organizations/org-0/models/model-0/monitor-config/monitor/some-monitor")
+    stand_in.state.requests.clear()
+
+    report = sync_snapshot(store, org_id="org-0", stale_only=True, config=stand_in.config())
+
+    assert sorted(report.updated) == ["model-0", "model-2"] and report.skipped == ["model-1"]
+    assert not store.get("org-0", "model-0").stale  # type: ignore
+    read = {path.split("/")[5] for method, path in stand_in.state.requests if path.count("/") > 4}
+    assert read == {"model-0", "model-2"}
+
+
+def test_snapshot_is_compressed_json(stand_in: StandInServer, tmp_path: Path) -> None:
+    _seed(stand_in)
+    sync_snapshot(store=SnapshotStore(tmp_path), org_id="org-0", config=stand_in.config())
+
+    with gzip.open(tmp_path / "org-0" / "model-0.json.gz", "rt") as f:
+        content = json.load(f)
+    snapshot = SnapshotStore(tmp_path).get("org-0", "model-0")
+
+    assert content["format_version"] == 1
+    assert snapshot.monitor_config["monitors"] == [MONITOR_BODY]  # type: ignore
+    assert to_document(snapshot).monitors[0].id == MONITOR_BODY["id"]  # type: ignore
+
+
+def test_unknown_format_is_ignored(tmp_path: Path) -> None:
+    (tmp_path / "org-0").mkdir()
+    with gzip.open(tmp_path / "org-0" / "model-0.json.gz", "wt") as f:
+        json.dump({"format_version": 99, "org_id": "org-0", "dataset_id": "model-0"}, f)
+
+    assert SnapshotStore(tmp_path).get("org-0", "model-0") is None
+
+
+def test_monitor_setup_reads_from_the_snapshot(stand_in: StandInServer, tmp_path: Path) -> None:
+    _seed(stand_in)
+    store = SnapshotStore(tmp_path)
+    sync_snapshot(store, org_id="org-0", config=stand_in.config())
+    use_snapshot(store, config=stand_in.config())
+    stand_in.state.requests.clear()
+
+    setup = MonitorSetup(monitor_id=MONITOR_BODY["id"], config=stand_in.config())
+    setup.apply()
+
+    assert isinstance(setup.monitor, Monitor)
+    assert get_model_granularity(org_id="org-0", dataset_id="model-1", config=stand_in.config()) == Granularity.daily
+    assert stand_in.state.requests == []
+
+
+def test_writes_mark_the_dataset_stale(stand_in: StandInServer, tmp_path: Path) -> None:
+    _seed(stand_in)
+    store = SnapshotStore(tmp_path)
+    sync_snapshot(store, org_id="org-0", config=stand_in.config())
+    use_snapshot(store, config=stand_in.config())
+
+    setup = MonitorSetup(monitor_id="snapshot-monitor", config=stand_in.config())
+    setup.config = StddevConfig(metric=SimpleColumnMetric.median, baseline=TrailingWindowBaseline(size=14))
+    setup.apply()
+    MonitorManager(setup=setup, config=stand_in.config()).save()
+
+    assert SnapshotStore(tmp_path).get("org-0", "model-0").stale  # type: ignore
+    assert not store.get("org-0", "model-1").stale  # type: ignore
+    stand_in.state.requests.clear()
+    assert MonitorSetup(monitor_id="snapshot-monitor", config=stand_in.config()).monitor is not None
+    assert len(stand_in.state.requests) == 1
+
+
+def test_store_roundtrip(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path)
+    store.put(DatasetSnapshot(org_id="org/0", dataset_id="model 0", model={"id": "model 0"}))
+
+    assert SnapshotStore(tmp_path).get("org/0", "model 0").model == {"id": "model 0"}  # type: ignore
+    assert store.org_ids() == ["org/0"]
+    assert store.dataset_ids("org/0") == ["model 0"]
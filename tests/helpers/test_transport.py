@@ -0,0 +1,133 @@
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
+
+import pytest
+from urllib3.exceptions import NewConnectionError
+from whylabs_client import Configuration
+from whylabs_client.exceptions import NotFoundException, ServiceException
+
+from whylabs_toolkit.helpers.client import close_clients, get_shared_client
+from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.json_body import JsonBody
+from whylabs_toolkit.helpers.utils import get_models_api, get_monitor_api
+from whylabs_toolkit.testing.documents import generate_stddev_document
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+from whylabs_toolkit.helpers.transport import Http2RESTClient  # noqa: E402
+
+
+@pytest.fixture
+def http2_stand_in(monkeypatch: pytest.MonkeyPatch) -> Iterator[StandInServer]:
+    monkeypatch.setenv("WHYLABS_TRANSPORT", "http2")
+    monkeypatch.setenv("WHYLABS_RETRY_BACKOFF_SECONDS", "0.01")
+    with StandInServer(http2=True) as server:
+        server.state.add_dataset(org_id="org-0", dataset_id="model-0")
+        yield server
+    close_clients()
+
+
+def test_api_objects_work_over_http2(http2_stand_in: StandInServer) -> None:
+    config = http2_stand_in.config()
+    document = generate_stddev_document(analyzers=20, columns=10)
+
+    get_monitor_api(config=config).put_monitor_config_v3(org_id="org-0", dataset_id="model-0", body=document)
+    saved = get_monitor_api(config=config).get_monitor_config_v3(org_id="org-0", dataset_id="model-0")
+    with pytest.raises(NotFoundException):
+        get_models_api(config=config).get_model(org_id="org-0", model_id="missing")
+
+    assert isinstance(get_shared_client(config).rest_client, Http2RESTClient)
+    assert [analyzer["id"] for analyzer in saved["analyzers"]] == [analyzer["id"] for analyzer in document["analyzers"]]
+
+
+def test_concurrent_requests_share_connections(http2_stand_in: StandInServer, monkeypatch: Any) -> None:
+    monkeypatch.setenv("WHYLABS_CACHE_TTL_SECONDS", "0")
+    state = http2_stand_in.state
+    for i in range(16):
+        state.add_dataset(org_id="org-0", dataset_id=f"model-{i}")
+    state.latency = 0.1
+    api = get_models_api(config=http2_stand_in.config())
+    barrier = threading.Barrier(16)
+
+    def read(i: int) -> Any:
+        barrier.wait()
+        return api.get_entity_schema(org_id="org-0", dataset_id=f"model-{i}")
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        schemas = list(executor.map(read, range(16)))
+
+    assert len(schemas) == 16
+    assert len(state.served) == 16
+    assert state.connections <= Config().get_http2_max_connections()
+
+
+def test_transient_failures_are_retried(http2_stand_in: StandInServer) -> None:
+    http2_stand_in.state.inject_failure(r"/models/model-0$", status=503, times=2)
+
+    model = get_models_api(config=http2_stand_in.config()).get_model(org_id="org-0", model_id="model-0")
+
+    assert model.id == "model-0"
+    assert [served.status for served in http2_stand_in.state.served] == [503, 503, 200]
+
+
+def test_retry_after_is_honored_over_http2(http2_stand_in: StandInServer) -> None:
+    http2_stand_in.state.inject_failure(r"/models/model-0$", status=503, times=2, retry_after=0.3)
+    api = get_models_api(config=http2_stand_in.config())
+
+    with pytest.raises(ServiceException) as error:
+        api.api_client.rest_client.request("GET", f"{http2_stand_in.url}/v0/organizations/org-0/models/model-0")
+    start = time.monotonic()
+    model = api.get_model(org_id="org-0", model_id="model-0")
+
+    # httpx hands the headers over in lower case, they are looked up in any case
+    assert error.value.headers["Retry-After"] == error.value.headers["retry-after"] == "0.3"
+    assert time.monotonic() - start >= 0.3
+    assert model.id == "model-0"
+
+
+def test_gzip_over_http2(http2_stand_in: StandInServer, monkeypatch: Any) -> None:
+    monkeypatch.setenv("WHYLABS_GZIP", "true")
+    document = generate_stddev_document(analyzers=50, columns=20)
+    api = get_monitor_api(config=http2_stand_in.config())
+
+    api.put_monitor_config_v3(org_id="org-0", dataset_id="model-0", body=document)
+    saved = api.get_monitor_config_v3(org_id="org-0", dataset_id="model-0")
+
+    put, get = http2_stand_in.state.served
+    assert put.request_bytes < len(json.dumps(document)) / 5
+    assert get.response_bytes < len(json.dumps(document)) / 5
+    assert len(saved["analyzers"]) == 50
+
+
+def test_json_bodies_over_http2(http2_stand_in: StandInServer) -> None:
+    document = generate_stddev_document(analyzers=3, columns=2)
+    api = get_monitor_api(config=http2_stand_in.config())
+
+    api.put_monitor_config_v3(org_id="org-0", dataset_id="model-0", body=JsonBody(json.dumps(document).encode()))
+
+    assert api.get_monitor_config_v3(org_id="org-0", dataset_id="model-0")["analyzers"] == document["analyzers"]
+
+
+def test_connection_errors_are_urllib3_errors() -> None:
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+    rest_client = Http2RESTClient(Configuration(host=f"http://127.0.0.1:{port}"))
+    try:
+        with pytest.raises(NewConnectionError):
+            rest_client.request("GET", f"http://127.0.0.1:{port}/v0/organizations/org-0/models")
+    finally:
+        rest_client.close()
+
+
+def test_unknown_transports_are_rejected(monkeypatch: Any) -> None:
+    monkeypatch.setenv("WHYLABS_TRANSPORT", "carrier-pigeon")
+
+    with pytest.raises(ValueError):
+        Config().get_transport()
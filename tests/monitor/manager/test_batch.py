@@ -0,0 +1,120 @@
+from typing import Any, Callable
+
+import pytest
+from urllib3.exceptions import MaxRetryError
+
+from whylabs_toolkit.helpers.utils import get_monitor_api
+from whylabs_toolkit.monitor.manager import BatchMonitorManager, MonitorSetup, OutcomeStatus
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.documents import ANALYZER_BODY, MONITOR_BODY
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+def test_batch_reads_each_dataset_once(stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]) -> None:
+    stand_in.state.add_dataset(org_id="org-0", dataset_id="model-1")
+    setups = [applied_setup(f"batch-monitor-{i}", dataset_id=f"model-{i % 2}") for i in range(6)]
+    stand_in.state.requests.clear()
+
+    outcomes = BatchMonitorManager(setups=setups, config=stand_in.config()).save()
+
+    assert [outcome.status for outcome in outcomes] == [OutcomeStatus.created] * 6
+    requests = stand_in.state.requests
+    assert requests.count(("GET", "/v0/notification-settings/org-0/actions")) == 1
+    assert requests.count(("PUT", "/v0/notification-settings/org-0/actions/EMAIL/stand_in_email")) == 1
+    for dataset_id in ["model-0", "model-1"]:
+        path = f"/v0/organizations/org-0/models/{dataset_id}"
+        assert requests.count(("GET", f"{path}/monitor-config/v3")) == 1
+        writes = [request for request in requests if request[0] == "PUT" and request[1].startswith(f"{path}/")]
+        assert writes == [("PUT", f"{path}/monitor-config/v3")]
+        document = stand_in.state.documents[("org-0", dataset_id)]
+        assert len(document["monitors"]) == 3
+        assert len(document["analyzers"]) == 3
+        assert document["monitors"][0]["actions"] == [{"type": "global", "target": "stand_in_email"}]
+
+
+@pytest.mark.usefixtures("response_cache")
+def test_batch_keeps_changes_made_elsewhere(
+    stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]
+) -> None:
+    document = stand_in.state.documents[("org-0", "model-0")]
+    document.update(monitors=[MONITOR_BODY], analyzers=[ANALYZER_BODY])
+    setup = applied_setup("batch-monitor")  # reads the document into the response cache
+    # Deleted elsewhere after the cached read
+    document.update(monitors=[], analyzers=[])
+
+    BatchMonitorManager(setups=[setup], config=stand_in.config()).save()
+
+    assert [monitor["id"] for monitor in document["monitors"]] == ["batch-monitor"]
+    assert [analyzer["id"] for analyzer in document["analyzers"]] == ["batch-monitor-analyzer"]
+
+
+def test_batch_reports_updated_and_invalid_setups(
+    stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]
+) -> None:
+    BatchMonitorManager(setups=[applied_setup("batch-existing")], config=stand_in.config()).save()
+    invalid = applied_setup("batch-invalid")
+    invalid.config.mode = "weird_mode"  # type: ignore
+    invalid.apply()
+
+    existing = applied_setup("batch-existing")
+    existing.schedule = FixedCadenceSchedule(cadence=Cadence.weekly)
+    existing.apply()
+
+    outcomes = BatchMonitorManager(
+        setups=[existing, invalid, applied_setup("batch-new-monitor")],
+        eager=True,
+        config=stand_in.config(),
+    ).save()
+
+    statuses = {outcome.monitor_id: outcome.status for outcome in outcomes}
+    assert statuses == {
+        "batch-existing": OutcomeStatus.updated,
+        "batch-invalid": OutcomeStatus.invalid,
+        "batch-new-monitor": OutcomeStatus.created,
+    }
+    document = stand_in.state.documents[("org-0", "model-0")]
+    assert sorted(monitor["id"] for monitor in document["monitors"]) == ["batch-existing", "batch-new-monitor"]
+    assert document["allowPartialTargetBatches"] is True
+
+
+def test_batch_reports_unchanged_setups(stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]) -> None:
+    setups = [applied_setup(f"batch-monitor-{i}") for i in range(2)]
+    BatchMonitorManager(setups=setups, config=stand_in.config()).save()
+    stand_in.state.requests.clear()
+
+    outcomes = BatchMonitorManager(setups=setups, config=stand_in.config()).save()
+
+    assert [outcome.status for outcome in outcomes] == [OutcomeStatus.unchanged] * 2
+    assert [request for request in stand_in.state.requests if request[0] == "PUT"] == []
+
+
+def test_a_failing_dataset_fails_only_its_own_setups(
+    stand_in: StandInServer, monkeypatch: Any, applied_setup: Callable[..., MonitorSetup]
+) -> None:
+    stand_in.state.add_dataset(org_id="org-0", dataset_id="model-1")
+    saved = applied_setup("batch-saved", dataset_id="model-1")
+    BatchMonitorManager(setups=[saved], config=stand_in.config()).save()
+    setups = [saved, applied_setup("batch-new-monitor", dataset_id="model-1"), applied_setup("batch-monitor")]
+
+    monitor_api = get_monitor_api(config=stand_in.config())
+    put_monitor_config_v3 = monitor_api.put_monitor_config_v3
+
+    def unreachable_model_1(org_id: str, dataset_id: str, **kwargs: Any) -> Any:
+        if dataset_id == "model-1":
+            raise MaxRetryError(None, f"/v0/organizations/{org_id}/models/{dataset_id}")  # type: ignore
+        return put_monitor_config_v3(org_id=org_id, dataset_id=dataset_id, **kwargs)
+
+    monkeypatch.setattr(monitor_api, "put_monitor_config_v3", unreachable_model_1)
+
+    outcomes = BatchMonitorManager(setups=setups, monitor_api=monitor_api, config=stand_in.config()).save()
+
+    statuses = {outcome.monitor_id: outcome.status for outcome in outcomes}
+    assert statuses == {
+        "batch-saved": OutcomeStatus.unchanged,
+        "batch-new-monitor": OutcomeStatus.failed,
+        "batch-monitor": OutcomeStatus.created,
+    }
+    assert "Max retries exceeded" in str(outcomes[1].error)
+    documents = stand_in.state.documents
+    assert [monitor["id"] for monitor in documents[("org-0", "model-1")]["monitors"]] == ["batch-saved"]
+    assert [monitor["id"] for monitor in documents[("org-0", "model-0")]["monitors"]] == ["batch-monitor"]
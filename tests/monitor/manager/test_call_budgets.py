@@ -0,0 +1,45 @@
+from typing import Callable
+
+from whylabs_toolkit.helpers.client import close_clients
+from whylabs_toolkit.monitor.manager import MonitorManager, MonitorSetup
+from whylabs_toolkit.monitor.manager.batch import BatchMonitorManager
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.budget import call_budget
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+COLUMN = {"classifier": "input", "dataType": "fractional", "discreteness": "continuous"}
+
+
+def test_new_monitor(stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]) -> None:
+    stand_in.state.schemas[("org-0", "model-0")]["columns"] = {"a": COLUMN, "b": COLUMN}
+
+    # The monitor config, the schema for both column checks, read once, and the granularity
+    with call_budget(3, name="MonitorSetup.apply for a new monitor", max_writes=0):
+        setup = applied_setup("budget-monitor", columns=["a", "b"])
+    # Notification actions, the granularity for validation, the monitor config, then one analyzer and one monitor
+    with call_budget(6, name="MonitorManager.save of a new monitor", max_writes=3):
+        MonitorManager(setup=setup, config=stand_in.config()).save()
+
+
+def test_existing_monitor(stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]) -> None:
+    MonitorManager(setup=applied_setup("budget-monitor"), config=stand_in.config()).save()
+    close_clients()
+
+    with call_budget(1, name="MonitorSetup for an existing monitor", max_writes=0):
+        setup = MonitorSetup(monitor_id="budget-monitor", config=stand_in.config())
+        setup.apply()
+    # Notification actions, the granularity for validation and the monitor config
+    with call_budget(3, name="MonitorManager.save without changes", max_writes=0):
+        MonitorManager(setup=setup, config=stand_in.config()).save()
+
+
+def test_batch_save_reads_do_not_grow_with_the_monitors(
+    stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]
+) -> None:
+    for count in (5, 20):
+        setups = [applied_setup(f"batch-budget-monitor-{count}-{i}") for i in range(count)]
+        # The notification actions and the monitor config, then the missing notification action and the monitor
+        # config, whatever the number of setups
+        name = f"BatchMonitorManager.save of {count} monitors"
+        with call_budget(2 + 2, name=name, max_writes=2):
+            BatchMonitorManager(setups=setups, config=stand_in.config()).save()
@@ -0,0 +1,154 @@
+import json
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+from whylabs_toolkit.monitor.manager import (
+    BatchMonitorManager,
+    ChangeType,
+    MonitorManager,
+    MonitorSetup,
+    OutcomeStatus,
+    apply_plan,
+    diff_documents,
+    plan_document,
+)
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.documents import ANALYZER_BODY, MONITOR_BODY
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+def _document(**kwargs: Any) -> Dict[str, Any]:
+    document = {"orgId": "org-0", "datasetId": "model-0", "granularity": "daily", "analyzers": [], "monitors": []}
+    document.update(kwargs)
+    return document
+
+
+def _writes(stand_in: StandInServer) -> List[Tuple[str, str]]:
+    return [request for request in stand_in.state.requests if request[0] != "GET"]
+
+
+def test_metadata_is_ignored() -> None:
+    with_metadata = dict(MONITOR_BODY, metadata={"version": 3, "schemaVersion": 1, "updatedTimestamp": 1700000000000})
+    current = _document(monitors=[with_metadata], analyzers=[ANALYZER_BODY], metadata={"version": 7})
+
+    diff = diff_documents(current, _document(monitors=[MONITOR_BODY], analyzers=[ANALYZER_BODY]))
+
+    assert diff.is_empty
+    assert diff.summary() == "No changes"
+
+
+def test_changes_are_reported_per_entity() -> None:
+    changed_analyzer = dict(ANALYZER_BODY, schedule={"type": "fixed", "cadence": "hourly"})
+    new_monitor = dict(MONITOR_BODY, id="another-monitor")
+    current = _document(monitors=[MONITOR_BODY], analyzers=[ANALYZER_BODY, dict(ANALYZER_BODY, id="stale-analyzer")])
+
+    diff = diff_documents(
+        current,
+        _document(monitors=[new_monitor], analyzers=[changed_analyzer], allowPartialTargetBatches=True),
+        prune=True,
+    )
+
+    assert [(change.id, change.change, change.fields) for change in diff.analyzers] == [
+        (ANALYZER_BODY["id"], ChangeType.changed, ["schedule"]),
+        ("stale-analyzer", ChangeType.removed, []),
+    ]
+    assert [(change.id, change.change) for change in diff.monitors] == [
+        ("another-monitor", ChangeType.added),
+        (MONITOR_BODY["id"], ChangeType.removed),
+    ]
+    assert diff.settings == {"allowPartialTargetBatches": True}
+
+
+def test_unchanged_entities_are_kept_without_prune() -> None:
+    current = _document(monitors=[MONITOR_BODY], analyzers=[ANALYZER_BODY])
+
+    assert diff_documents(current, _document()).is_empty
+
+
+def test_apply_plan_pushes_only_the_diff(stand_in: StandInServer) -> None:
+    stand_in.state.documents[("org-0", "model-0")].update(monitors=[MONITOR_BODY], analyzers=[ANALYZER_BODY])
+    desired = Document.parse_obj(_document(monitors=[], analyzers=[ANALYZER_BODY]))
+
+    diff = plan_document(desired, prune=True, config=stand_in.config())
+    assert _writes(stand_in) == []
+    assert apply_plan(diff, config=stand_in.config()) == 1
+
+    assert _writes(stand_in) == [
+        ("DELETE", f"/v0/organizations/org-0/models/model-0/monitor-config/monitor/{MONITOR_BODY['id']}")
+    ]
+    assert apply_plan(plan_document(desired, prune=True, config=stand_in.config()), config=stand_in.config()) == 0
+
+
+def test_apply_plan_sends_the_diffed_json(stand_in: StandInServer) -> None:
+    desired = Document.parse_obj(_document(monitors=[MONITOR_BODY], analyzers=[ANALYZER_BODY]))
+    diff = plan_document(desired, config=stand_in.config())
+    stand_in.state.served.clear()
+
+    apply_plan(diff, config=stand_in.config())
+
+    sent = {(served.method, served.path.rsplit("/", 1)[-1]): served.request_bytes for served in stand_in.state.served}
+    for change, model in [(diff.analyzers[0], Analyzer), (diff.monitors[0], Monitor)]:
+        compact = model.parse_obj(change.body).json_bytes()
+        assert change.payload == compact
+        # whylabs_client would have sent json.dumps(change.body), with spaces after separators
+        assert sent[("PUT", change.id)] == len(compact) < len(json.dumps(change.body))
+
+
+def test_saving_an_unchanged_monitor_makes_no_writes(
+    stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]
+) -> None:
+    MonitorManager(setup=applied_setup("diff-monitor"), config=stand_in.config()).save()
+    assert len(_writes(stand_in)) == 3  # notification action, analyzer and monitor
+    stand_in.state.requests.clear()
+
+    manager = MonitorManager(setup=applied_setup("diff-monitor"), config=stand_in.config())
+    assert manager.plan().is_empty
+    manager.save()
+
+    assert _writes(stand_in) == []
+
+
+def test_saving_a_changed_monitor_writes_only_what_changed(
+    stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]
+) -> None:
+    MonitorManager(setup=applied_setup("diff-monitor"), config=stand_in.config()).save()
+    stand_in.state.requests.clear()
+
+    setup = applied_setup("diff-monitor")
+    setup.schedule = FixedCadenceSchedule(cadence=Cadence.weekly)
+    setup.apply()
+    MonitorManager(setup=setup, config=stand_in.config()).save()
+
+    assert _writes(stand_in) == [
+        ("PUT", "/v0/organizations/org-0/models/model-0/monitor-config/analyzer/diff-monitor-analyzer")
+    ]
+
+
+@pytest.mark.usefixtures("response_cache")
+def test_save_diffs_against_what_the_server_holds_now(
+    stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]
+) -> None:
+    MonitorManager(setup=applied_setup("diff-monitor"), config=stand_in.config()).save()
+    setup = applied_setup("diff-monitor")  # reads the document into the response cache
+    # Changed elsewhere after the cached read
+    analyzer = stand_in.state.documents[("org-0", "model-0")]["analyzers"][0]
+    analyzer["config"]["threshold"] = 9.0
+    stand_in.state.requests.clear()
+
+    MonitorManager(setup=setup, config=stand_in.config()).save()
+
+    assert _writes(stand_in) == [
+        ("PUT", "/v0/organizations/org-0/models/model-0/monitor-config/analyzer/diff-monitor-analyzer")
+    ]
+    assert stand_in.state.documents[("org-0", "model-0")]["analyzers"][0]["config"]["threshold"] == 12.0
+
+
+def test_batch_skips_unchanged_datasets(stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]) -> None:
+    BatchMonitorManager(setups=[applied_setup("diff-monitor")], config=stand_in.config()).save()
+    stand_in.state.requests.clear()
+
+    outcomes = BatchMonitorManager(setups=[applied_setup("diff-monitor")], config=stand_in.config()).save()
+
+    assert [outcome.status for outcome in outcomes] == [OutcomeStatus.unchanged]
+    assert _writes(stand_in) == []
@@ -0,0 +1,37 @@
+import copy
+
+from whylabs_toolkit.monitor.manager.schema import KNOWN_DRIFT, document_schema, schema_drift, shipped_schema
+
+
+def test_models_and_shipped_schema_only_drift_where_known() -> None:
+    drift = schema_drift()
+
+    assert [difference for difference in drift if difference not in KNOWN_DRIFT] == []
+    assert sorted(KNOWN_DRIFT - set(drift)) == []
+
+
+def test_schemas_are_built_once() -> None:
+    assert document_schema() is document_schema()
+    assert shipped_schema() is shipped_schema()
+
+
+def test_unions_of_the_models_are_one_of() -> None:
+    analyzer = document_schema()["definitions"]["Analyzer"]["properties"]
+
+    assert "oneOf" in analyzer["config"]
+    assert "anyOf" not in analyzer["targetMatrix"]
+
+
+def test_new_drift_is_reported() -> None:
+    models = copy.deepcopy(document_schema())
+    models["definitions"]["TrailingWindowBaseline"]["properties"]["weight"] = {"type": "number"}
+    models["definitions"]["Granularity"]["enum"].remove("weekly")
+    models["required"].append("entitySchema")
+
+    drift = set(schema_drift(models=models)) - KNOWN_DRIFT
+
+    assert drift == {
+        "Document.required: entitySchema only in the models",
+        "Granularity.enum: weekly only in schema.json",
+        "TrailingWindowBaseline.properties: weight only in the models",
+    }
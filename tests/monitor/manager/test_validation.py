@@ -0,0 +1,56 @@
+from typing import Callable
+
+import pytest
+from jsonschema import ValidationError
+
+from whylabs_toolkit.monitor.manager import MonitorManager, MonitorSetup, build_documents, validate_setups
+from whylabs_toolkit.monitor.manager.validation import get_document_validator, validate_document
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+WEEKLY = FixedCadenceSchedule(cadence=Cadence.weekly)
+
+
+def test_offline_validation_never_calls_the_api(
+    stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]
+) -> None:
+    setup = applied_setup("offline-monitor", schedule=WEEKLY)
+    requests_before = len(stand_in.state.requests)
+
+    manager = MonitorManager(setup=setup, config=stand_in.config())
+
+    assert manager.validate(offline=True, granularity=Granularity.hourly)
+    assert len(stand_in.state.requests) == requests_before
+    assert isinstance(setup.monitor.actions[0], EmailRecipient)
+
+
+def test_offline_validation_raises_on_invalid_setup(
+    stand_in: StandInServer, applied_setup: Callable[..., MonitorSetup]
+) -> None:
+    setup = applied_setup("offline-monitor", schedule=WEEKLY)
+    setup.config.mode = "weird_mode"  # type: ignore
+    setup.apply()
+
+    with pytest.raises(ValidationError):
+        MonitorManager(setup=setup, config=stand_in.config()).validate(offline=True)
+
+
+def test_many_setups_are_validated_as_one_document(applied_setup: Callable[..., MonitorSetup]) -> None:
+    setups = [applied_setup(f"offline-monitor-{i}", schedule=WEEKLY) for i in range(5)]
+
+    documents = build_documents(setups)
+
+    assert len(documents) == 1
+    assert documents[0].granularity == Granularity.weekly
+    assert len(documents[0].analyzers) == 5
+    assert validate_setups(setups)
+    assert validate_document(documents[0])
+
+
+def test_unapplied_setup_is_rejected(stand_in: StandInServer) -> None:
+    with pytest.raises(ValueError):
+        validate_setups([MonitorSetup(monitor_id="not-applied-monitor", config=stand_in.config())])
+
+
+def test_validator_is_compiled_once() -> None:
+    assert get_document_validator() is get_document_validator()
@@ -0,0 +1,60 @@
+import json
+from typing import Any, Callable, Dict
+
+import pytest
+
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.monitor.models.analyzer.targets import ColumnGroups
+from whylabs_toolkit.monitor.models.utils import column_set
+from whylabs_toolkit.testing.documents import column_names, column_occurrences, generate_document
+
+
+def _payload() -> Dict[str, Any]:
+    # Round-tripped through JSON, every occurrence of a name is a string of its own
+    return json.loads(json.dumps(generate_document(10, columns=50)))
+
+
+@pytest.mark.parametrize("parse", [Document.parse_obj, Document.parse_trusted])
+def test_column_names_are_held_once(parse: Callable[[Any], Document]) -> None:
+    document = parse(_payload())
+
+    names = list(column_occurrences([document]))
+    by_value = {name: name for name in names}
+
+    assert len(names) > len(by_value)
+    assert all(name is by_value[name] for name in names)
+
+
+def test_interning_keeps_groups_and_values() -> None:
+    payload = _payload()
+
+    document = Document.parse_trusted(payload)
+
+    assert document == Document.parse_obj(payload)
+    assert document.analyzers[0].targetMatrix.exclude == [ColumnGroups.group_output]  # type: ignore
+
+
+def test_column_sets() -> None:
+    include = column_names(20)
+    matrix = ColumnMatrix(include=include + ["group:discrete"], exclude=["group:output"])
+    anomaly_filter = AnomalyFilter(includeColumns=include)
+
+    assert matrix.include_set() == frozenset(include) | {ColumnGroups.group_discrete}
+    assert ColumnGroups.group_output in matrix.exclude_set()
+    assert "group:output" in matrix.exclude_set()
+    assert anomaly_filter.include_set() == frozenset(include)
+    assert anomaly_filter.exclude_set() == frozenset()
+    assert column_set(None) == frozenset()
+
+
+def test_column_sets_are_kept_until_the_list_is_assigned() -> None:
+    matrix = ColumnMatrix(include=column_names(5))
+    included = matrix.include_set()
+
+    assert matrix.include_set() is included
+    assert matrix.copy(deep=True).include_set() == included
+
+    matrix.include = ["a_new_column"]
+
+    assert matrix.include_set() == frozenset(["a_new_column"])
+    assert "_column_sets" not in matrix.json()
@@ -0,0 +1,40 @@
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.documents import ALGORITHM_CONFIGS, CONFIG_MODELS, generate_analyzer
+
+
+def test_hash_leaves_out_ids_names_tags_and_metadata() -> None:
+    analyzer = Analyzer.parse_obj(generate_analyzer(0, 20, "drift"))
+    renamed = analyzer.copy(update={"id": "other-id", "displayName": "Other", "tags": ["other"], "metadata": None})
+
+    assert analyzer.structural_hash() == renamed.structural_hash()
+
+
+def test_hash_ignores_the_order_of_lists() -> None:
+    payload = generate_analyzer(0, 20, "list_comparison")
+    reordered = generate_analyzer(0, 20, "list_comparison")
+    reordered["targetMatrix"]["include"].reverse()
+    reordered["config"]["expected"].reverse()
+
+    assert Analyzer.parse_obj(payload).structural_hash() == Analyzer.parse_obj(reordered).structural_hash()
+
+
+def test_hash_tells_configurations_apart() -> None:
+    hashes = {CONFIG_MODELS[name].parse_obj(payload).structural_hash() for name, payload in ALGORITHM_CONFIGS.items()}
+    baselines = [TrailingWindowBaseline(size=14), TrailingWindowBaseline(size=7), ReferenceProfileId(profileId="ref")]
+    matrices = [
+        ColumnMatrix(include=["a", "b"]),
+        ColumnMatrix(include=["a"]),
+        ColumnMatrix(include=["a"], exclude=["b"]),
+    ]
+
+    assert len(hashes) == len(ALGORITHM_CONFIGS)
+    assert len({baseline.structural_hash() for baseline in baselines}) == len(baselines)
+    assert len({matrix.structural_hash() for matrix in matrices}) == len(matrices)
+
+
+def test_hash_is_stable() -> None:
+    # Stored hashes must keep matching across processes and releases
+    assert (
+        TrailingWindowBaseline(size=14).structural_hash()
+        == "df82cba0ee06587be9a8e850a203c4b0893b57c8d3a611e8653b5ba67f6d077d"
+    )
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["jsonschema", "whylogs", "whylabs_client", "whylabs_toolkit.monitor.models.analyzer"]
+
+
+def _loaded_modules(statement: str) -> str:
+    check = f"import sys; {statement}; print(' '.join(sorted(sys.modules)))"
+    return subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True).stdout
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import whylabs_toolkit.monitor",
+        "import whylabs_toolkit.monitor.models",
+        "import whylabs_toolkit.monitor.manager",
+        "import whylabs_toolkit.container.config_types",
+    ],
+)
+def test_package_imports_stay_light(statement: str) -> None:
+    loaded = _loaded_modules(statement).split()
+
+    assert [module for module in HEAVY_MODULES if module in loaded] == []
+
+
+def test_monitor_setup_does_not_import_jsonschema() -> None:
+    loaded = _loaded_modules("from whylabs_toolkit.monitor import MonitorSetup, MonitorManager").split()
+
+    assert "jsonschema" not in loaded
+
+
+def test_lazy_names_resolve() -> None:
+    from whylabs_toolkit import monitor
+    from whylabs_toolkit.monitor import manager, models
+    from whylabs_toolkit.container import config_types
+
+    assert [item.__name__ for item in monitor.ALL] == monitor.__all__
+    assert all(getattr(models, name) is not None for name in models.__all__)
+    assert all(getattr(manager, name) is not None for name in manager.__all__)
+    assert config_types.DatasetSchema.__name__ == "DatasetSchema"
+    with pytest.raises(AttributeError):
+        getattr(models, "NotAModel")
@@ -0,0 +1,62 @@
+import json
+from typing import Any
+
+import pytest
+from whylabs_client.exceptions import NotFoundException
+
+from whylabs_toolkit.helpers.json_body import JsonBody
+from whylabs_toolkit.helpers.utils import get_monitor_api
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.documents import generate_stddev_document
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+def _document() -> Document:
+    data = generate_stddev_document(analyzers=5, columns=3)
+    data["id"] = "9c1fbbe6-2b43-4e6c-9d63-0ff0eac3e0b4"
+    data["granularity"] = "daily"
+    data["analyzers"][0]["displayName"] = "Drift of the ümlaut column"
+    data["analyzers"][0]["targetMatrix"]["include"].append("group:discrete")
+    data["analyzers"][1]["config"]["baseline"] = {
+        "type": "TimeRange",
+        "range": {"start": "2023-01-01T00:00:00Z", "end": "2023-02-01T00:00:00+02:00"},
+    }
+    return Document.parse_obj(data)
+
+
+def test_json_bytes_matches_pydantic() -> None:
+    document = _document()
+
+    assert json.loads(document.json_bytes()) == json.loads(document.json(exclude_none=True))
+    assert document.json_bytes().decode() == document.json(exclude_none=True, separators=(",", ":"), ensure_ascii=False)
+    assert b": " not in document.json_bytes()
+
+
+def test_json_bytes_excludes_top_level_fields() -> None:
+    analyzer: Analyzer = _document().analyzers[0]  # type: ignore
+
+    body = json.loads(analyzer.json_bytes(exclude={"metadata"}))
+
+    assert "metadata" not in body
+    assert body["config"]["baseline"] == {"type": "TrailingWindow", "size": 14}
+
+
+def test_unknown_types_are_rejected() -> None:
+    analyzer: Analyzer = _document().analyzers[0]  # type: ignore
+    object.__setattr__(analyzer, "displayName", object())
+
+    with pytest.raises(TypeError):
+        analyzer.json_bytes()
+
+
+def test_json_bodies_are_sent_as_they_are(stand_in: StandInServer) -> None:
+    api = get_monitor_api(config=stand_in.config())
+    analyzer: Analyzer = _document().analyzers[1]  # type: ignore
+
+    api.put_analyzer(org_id="org-0", dataset_id="model-0", analyzer_id=analyzer.id, body=JsonBody(analyzer.json_bytes()))
+    saved: Any = api.get_analyzer(org_id="org-0", dataset_id="model-0", analyzer_id=analyzer.id)
+
+    assert Analyzer.parse_obj(saved) == analyzer
+    assert stand_in.state.served[0].request_bytes == len(analyzer.json_bytes())
+    with pytest.raises(NotFoundException):
+        api.put_analyzer(org_id="org-1", dataset_id="model-0", analyzer_id=analyzer.id, body=JsonBody(b"{}"))
@@ -0,0 +1,92 @@
+import io
+import json
+from typing import Any, Dict
+
+import pytest
+from pydantic import ValidationError
+
+from whylabs_toolkit.helpers.monitor_helpers import stream_monitor_config
+from whylabs_toolkit.helpers.utils import get_monitor_api
+from whylabs_toolkit.monitor.models import Analyzer, ColumnGroups, Document, Monitor
+from whylabs_toolkit.monitor.models.streaming import parse_monitor_config_stream
+from whylabs_toolkit.monitor.models.trusted import construct_trusted
+from whylabs_toolkit.testing.documents import generate_stddev_document
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+def _document() -> Dict[str, Any]:
+    document = generate_stddev_document(analyzers=20, columns=5)
+    document["granularity"] = "daily"
+    document["entitySchema"] = {
+        "columns": {"a": {"classifier": "input", "dataType": "fractional", "discreteness": "continuous"}}
+    }
+    document["analyzers"][0]["config"] = {
+        "type": "drift",
+        "metric": "histogram",
+        "algorithm": "hellinger",
+        "threshold": 1,
+        "baseline": {"type": "TimeRange", "range": {"start": "2023-01-01T00:00:00Z", "end": "2023-02-01T00:00:00Z"}},
+    }
+    document["analyzers"][1]["targetMatrix"]["include"] = ["group:discrete", "a"]
+    document["monitors"][0]["actions"] = [{"type": "email", "id": "team", "destination": "team@example.com"}]
+    document["monitors"][1]["mode"] = {"type": "EVERY_ANOMALY", "filter": {"includeColumns": ["a"]}}
+    # A number ending the document lands at the end of a chunk
+    document["schemaVersion"] = 1
+    return document
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_stream_yields_what_parse_obj_builds(trusted: bool, chunk_size: int) -> None:
+    document = _document()
+    expected = Document.parse_obj(document)
+
+    items = list(parse_monitor_config_stream(io.BytesIO(json.dumps(document, indent=2).encode()), trusted, chunk_size))
+
+    assert [item for item in items if isinstance(item, Analyzer)] == expected.analyzers
+    assert [item for item in items if isinstance(item, Monitor)] == expected.monitors
+    assert items[1].targetMatrix.include == [ColumnGroups.group_discrete, "a"]  # type: ignore
+
+
+def test_trusted_construction_matches_validation() -> None:
+    document = _document()
+
+    constructed = construct_trusted(Document, document)
+
+    assert constructed == Document.parse_obj(document)
+    assert constructed.json() == Document.parse_obj(document).json()
+
+
+def test_untrusted_items_are_validated() -> None:
+    document = _document()
+    document["analyzers"][3]["id"] = "short"
+    items = parse_monitor_config_stream([json.dumps(document).encode()])
+
+    with pytest.raises(ValidationError):
+        list(items)
+
+
+def test_multibyte_characters_split_between_chunks() -> None:
+    document = _document()
+    document["analyzers"][0]["displayName"] = "Drift of the ümlaut column"
+    raw = json.dumps(document, ensure_ascii=False).encode()
+
+    analyzer = next(parse_monitor_config_stream(io.BytesIO(raw), chunk_size=1))
+
+    assert analyzer.displayName == "Drift of the ümlaut column"  # type: ignore
+
+
+@pytest.mark.parametrize("raw", [b"", b"[]", b'{"analyzers": [{"id": ', b'{"analyzers": []'])
+def test_malformed_documents_raise(raw: bytes) -> None:
+    with pytest.raises(ValueError):
+        list(parse_monitor_config_stream(io.BytesIO(raw)))
+
+
+def test_stream_monitor_config(stand_in: StandInServer) -> None:
+    document = _document()
+    config = stand_in.config()
+    get_monitor_api(config=config).put_monitor_config_v3(org_id="org-0", dataset_id="model-0", body=document)
+
+    items = list(stream_monitor_config(org_id="org-0", dataset_id="model-0", config=config))
+
+    assert [item.id for item in items] == [item["id"] for item in document["analyzers"] + document["monitors"]]
@@ -0,0 +1,85 @@
+from typing import Any, Dict
+
+import pytest
+from pydantic import ValidationError
+
+from whylabs_toolkit.monitor.manager import MonitorManager, MonitorSetup
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.testing.documents import generate_entity_schema, generate_stddev_document
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+BASELINES = [
+    {"type": "TrailingWindow", "size": 7},
+    {"type": "Reference", "profileId": "ref-profile-0"},
+    {"type": "TimeRange", "range": {"start": "2023-01-01T00:00:00Z", "end": "2023-02-01T00:00:00+00:00"}},
+]
+
+
+@pytest.mark.parametrize("baseline", BASELINES)
+def test_analyzer_matches_parse_obj(baseline: Dict[str, Any]) -> None:
+    data = generate_stddev_document(analyzers=1, columns=3)["analyzers"][0]
+    data["config"]["baseline"] = baseline
+    data["targetMatrix"]["include"].append("group:continuous")
+
+    analyzer = Analyzer.parse_trusted(data)
+
+    assert analyzer == Analyzer.parse_obj(data)
+    assert analyzer.json() == Analyzer.parse_obj(data).json()
+    assert analyzer.__fields_set__ == Analyzer.parse_obj(data).__fields_set__
+
+
+@pytest.mark.parametrize(
+    "actions",
+    [
+        [{"type": "global", "target": "slack"}],
+        [{"type": "email", "id": "team", "destination": "team@example.com"}],
+        [{"type": "slack", "id": "channel", "destination": "https://hooks.slack.com/services/x"}],
+        [{"type": "pager_duty", "id": "on-call", "destination": "routing-key"}],
+    ],
+)
+def test_monitor_matches_parse_obj(actions: Any) -> None:
+    data = generate_stddev_document(analyzers=1, columns=3)["monitors"][0]
+    data["actions"] = actions
+    data["mode"] = {"type": "EVERY_ANOMALY", "filter": {"includeColumns": ["a"], "minWeight": 1}}
+
+    monitor = Monitor.parse_trusted(data)
+
+    assert monitor == Monitor.parse_obj(data)
+    assert monitor.json() == Monitor.parse_obj(data).json()
+
+
+def test_document_and_entity_schema_match_parse_obj() -> None:
+    data = generate_stddev_document(analyzers=10, columns=3)
+    data["id"] = "9c1fbbe6-2b43-4e6c-9d63-0ff0eac3e0b4"
+    data["granularity"] = "daily"
+    data["entitySchema"] = generate_entity_schema(100)
+
+    assert Document.parse_trusted(data) == Document.parse_obj(data)
+    assert EntitySchema.parse_trusted(data["entitySchema"]) == EntitySchema.parse_obj(data["entitySchema"])
+
+
+def test_unknown_keys_are_rejected_like_parse_obj() -> None:
+    data = generate_stddev_document(analyzers=1, columns=3)["analyzers"][0]
+    data["config"]["unknownKey"] = 1
+
+    with pytest.raises(ValidationError) as trusted:
+        Analyzer.parse_trusted(data)
+    with pytest.raises(ValidationError) as validated:
+        Analyzer.parse_obj(data)
+
+    assert trusted.value.errors()[0]["msg"] == "extra fields not permitted"
+    assert trusted.value.errors()[0]["msg"] in [error["msg"] for error in validated.value.errors()]
+
+
+def test_monitor_setup_builds_existing_monitors_trusted(stand_in: StandInServer) -> None:
+    setup = MonitorSetup(monitor_id="trusted-monitor", config=stand_in.config())
+    setup.config = StddevConfig(metric=SimpleColumnMetric.median, baseline=TrailingWindowBaseline(size=14))
+    setup.actions = [EmailRecipient(id="trusted-email", destination="team@example.com")]
+    setup.apply()
+    MonitorManager(setup=setup, config=stand_in.config()).save()
+
+    existing = MonitorSetup(monitor_id="trusted-monitor", config=stand_in.config())
+
+    assert existing.analyzer is not None and existing.monitor is not None
+    assert existing.analyzer.config == setup.analyzer.config  # type: ignore
+    assert existing.monitor.actions == setup.monitor.actions  # type: ignore
@@ -0,0 +1,57 @@
+import pytest
+
+from whylabs_toolkit.helpers.utils import get_models_api
+from whylabs_toolkit.testing.budget import CallBudgetExceeded, call_budget
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+@pytest.mark.usefixtures("response_cache")
+@pytest.mark.usefixtures("response_cache")
+def test_budget_counts_cached_calls(stand_in: StandInServer) -> None:
+    api = get_models_api(config=stand_in.config())
+
+    with call_budget(3, name="model lookups") as budget:
+        for _ in range(3):
+            api.get_model(org_id="org-0", model_id="model-0")
+
+    assert budget.count == 3 and len(budget.cached) == 2
+    with pytest.raises(CallBudgetExceeded, match=r"model lookups made 3 calls \(budget 1\)"):
+        with call_budget(1, name="model lookups"):
+            for _ in range(3):
+                api.get_model(org_id="org-0", model_id="model-0")
+
+
+@pytest.mark.usefixtures("response_cache")
+def test_budget_can_count_round_trips_only(stand_in: StandInServer) -> None:
+    api = get_models_api(config=stand_in.config())
+
+    with call_budget(1, name="model lookups", include_cached=False) as budget:
+        for _ in range(3):
+            api.get_model(org_id="org-0", model_id="model-0")
+
+    assert budget.count == 1 and len(budget.cached) == 2
+    assert budget.by_endpoint() == {"GET /v0/organizations/{org_id}/models/{model_id}": 1}
+
+
+def test_over_budget_lists_the_calls(stand_in: StandInServer) -> None:
+    api = get_models_api(config=stand_in.config())
+
+    with pytest.raises(CallBudgetExceeded, match=r"model lookups made 2 calls \(budget 1\)"):
+        with call_budget(1, name="model lookups"):
+            api.get_model(org_id="org-0", model_id="model-0")
+            api.get_model(org_id="org-0", model_id="model-0")
+
+
+def test_write_budget(stand_in: StandInServer) -> None:
+    api = get_models_api(config=stand_in.config())
+
+    with pytest.raises(CallBudgetExceeded, match=r"1 writes \(budget 0\)"):
+        with call_budget(5, max_writes=0):
+            api.update_model(org_id="org-0", model_id="model-0", model_name="renamed", time_period="P1D")
+
+
+def test_errors_in_the_block_are_not_masked(stand_in: StandInServer) -> None:
+    with pytest.raises(KeyError):
+        with call_budget(0):
+            get_models_api(config=stand_in.config()).get_model(org_id="org-0", model_id="model-0")
+            raise KeyError("boom")
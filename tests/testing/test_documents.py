@@ -0,0 +1,35 @@
+import pytest
+
+from whylabs_toolkit.monitor.manager.validation import validate_document
+from whylabs_toolkit.monitor.models import Analyzer, ColumnMatrix, Document, EntitySchema
+from whylabs_toolkit.testing.documents import (
+    ALGORITHM_CONFIGS,
+    CONFIG_MODELS,
+    MAX_COLUMNS,
+    column_names,
+    generate_analyzer,
+    generate_document,
+    generate_entity_schema,
+)
+
+
+def test_documents_are_valid() -> None:
+    data = generate_document(analyzers=len(ALGORITHM_CONFIGS), columns=MAX_COLUMNS)
+    document = Document.parse_obj(data)
+
+    assert validate_document(document)
+    assert Document.parse_trusted(data) == document
+    assert len({type(analyzer.config) for analyzer in document.analyzers}) == len(ALGORITHM_CONFIGS) - 2  # type: ignore
+
+
+@pytest.mark.parametrize("name", list(ALGORITHM_CONFIGS))
+def test_every_algorithm_config_is_valid(name: str) -> None:
+    config = CONFIG_MODELS[name].parse_obj(ALGORITHM_CONFIGS[name])
+
+    assert config.type == name  # type: ignore
+
+
+def test_column_lists_reach_the_limit() -> None:
+    assert len(ColumnMatrix(include=column_names(MAX_COLUMNS)).include) == MAX_COLUMNS  # type: ignore
+    assert len(Analyzer.parse_obj(generate_analyzer(0, MAX_COLUMNS * 2)).targetMatrix.include) == MAX_COLUMNS  # type: ignore
+    assert len(EntitySchema.parse_obj(generate_entity_schema(5000)).columns) == 5000
@@ -0,0 +1,74 @@
+import pytest
+from whylabs_client.exceptions import ApiException
+from whylabs_client.model.create_reference_profile_request import CreateReferenceProfileRequest
+
+from whylabs_toolkit.helpers.dataset_profiles import delete_all_profiles_for_period
+from whylabs_toolkit.helpers.models import add_custom_metric, update_model_metadata
+from whylabs_toolkit.helpers.utils import get_dataset_profile_api, get_models_api, get_notification_api
+from whylabs_toolkit.testing.stand_in import StandInServer
+
+
+def test_models_lifecycle(stand_in: StandInServer) -> None:
+    api = get_models_api(config=stand_in.config())
+
+    created = api.create_model(org_id="org-0", model_name="Churn", time_period="P1D", model_id="model-9")
+    update_model_metadata(dataset_id="model-9", time_period="PT1H", config=stand_in.config())
+    add_custom_metric(label="m", column="c", default_metric="mean", dataset_id="model-9", config=stand_in.config())
+    api.deactivate_model(org_id="org-0", model_id="model-9")
+
+    assert created.id == "model-9"
+    assert stand_in.state.models[("org-0", "model-9")]["timePeriod"] == "PT1H"
+    assert stand_in.state.schemas[("org-0", "model-9")]["metrics"][0]["label"] == "m"
+    assert [model.id for model in api.list_models(org_id="org-0").items] == ["model-0"]
+
+
+def test_notification_actions(stand_in: StandInServer) -> None:
+    api = get_notification_api(config=stand_in.config())
+
+    api.add_notification_action(org_id="org-0", type="EMAIL", action_id="team", body={"email": "a@b.c"})
+    api.disable_notification_action(org_id="org-0", action_id="team")
+    action = api.get_notification_action(org_id="org-0", action_id="team")
+    api.delete_notification_action(org_id="org-0", action_id="team")
+
+    assert action.payload["email"] == "a@b.c" and action.enabled is False
+    assert api.list_notification_actions(org_id="org-0") == []
+
+
+def test_dataset_profiles(stand_in: StandInServer) -> None:
+    api = get_dataset_profile_api(config=stand_in.config())
+
+    response = delete_all_profiles_for_period(start=1700000000000, end=1700086400000, config=stand_in.config())
+    reference = api.create_reference_profile(
+        org_id="org-0",
+        dataset_id="model-0",
+        create_reference_profile_request=CreateReferenceProfileRequest(alias="baseline"),
+    )
+
+    assert response.id
+    requests = api.list_delete_dataset_profiles_requests(org_id="org-0")
+    assert [(request.delete_gte, request.delete_lt) for request in requests] == [(1700000000000, 1700086400000)]
+    assert len(api.list_delete_analyzer_results_requests(org_id="org-0")) == 1
+    profiles = api.list_reference_profiles(org_id="org-0", model_id="model-0")
+    assert [(profile.id, profile.alias) for profile in profiles] == [(reference.id, "baseline")]
+
+
+def test_injected_failures(stand_in: StandInServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("WHYLABS_MAX_RETRIES", "0")
+    api = get_models_api(config=stand_in.config())
+    stand_in.state.inject_failure("/models/model-0$", status=500, method="GET", times=1, retry_after=2)
+
+    with pytest.raises(ApiException) as error:
+        api.get_model(org_id="org-0", model_id="model-0")
+
+    assert error.value.status == 500
+    assert error.value.headers["Retry-After"] == "2"
+    assert api.get_model(org_id="org-0", model_id="model-0").id == "model-0"
+
+
+def test_latency_is_recorded(stand_in: StandInServer) -> None:
+    stand_in.state.latency = 0.02
+
+    get_models_api(config=stand_in.config()).get_model(org_id="org-0", model_id="model-0")
+
+    assert [(served.method, served.status) for served in stand_in.state.served] == [("GET", 200)]
+    assert stand_in.state.served[0].duration >= 0.02
@@ -0,0 +1,28 @@
+from .client import AsyncApiClient, close_async_clients, create_async_client, get_async_client, set_max_concurrency
+from .diff import apply_plan, plan_document
+from .manager import AsyncMonitorManager
+from .monitor_helpers import (
+    delete_monitor,
+    get_analyzer_ids,
+    get_analyzers,
+    get_model_granularity,
+    get_monitor,
+    get_monitor_config,
+)
+
+ALL = [
+    AsyncApiClient,
+    AsyncMonitorManager,
+    apply_plan,
+    close_async_clients,
+    create_async_client,
+    get_async_client,
+    plan_document,
+    set_max_concurrency,
+    delete_monitor,
+    get_analyzer_ids,
+    get_analyzers,
+    get_model_granularity,
+    get_monitor,
+    get_monitor_config,
+]
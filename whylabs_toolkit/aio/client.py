@@ -0,0 +1,239 @@
+"""
+A native asyncio client for the WhyLabs API, built on httpx.
+
+AsyncApiClient sends the requests of `whylabs_toolkit.aio` from coroutines over one pooled
+httpx.AsyncClient, without a thread per call. `get_async_client` keeps one per event loop,
+host and API key, sharing the response cache, rate limiter and retrier of the blocking client
+of the same Config, so calls made either way are paced, retried and invalidated together.
+Needs the `aio` extra: pip install "whylabs-toolkit[aio]".
+"""
+import asyncio
+import json
+import logging
+import weakref
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from whylabs_client import Configuration
+
+from whylabs_toolkit.helpers.cache import (
+    CachedResponse,
+    ResponseCache,
+    cached_read,
+    invalidate_write,
+    is_cacheable,
+    reads_are_fresh,
+    request_key,
+)
+from whylabs_toolkit.helpers.client import get_shared_client
+from whylabs_toolkit.helpers.coalesce import AsyncSingleFlight
+from whylabs_toolkit.helpers.compression import gzip_body
+from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.instrumentation import ApiCall, api_call, record_request, record_response
+from whylabs_toolkit.helpers.json_body import JsonBody
+from whylabs_toolkit.helpers.rate_limit import RateLimiter
+from whylabs_toolkit.helpers.retry import Retrier
+from whylabs_toolkit.helpers.transport import cached_response, create_httpx_client, raise_for_status, transport_errors
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncApiClient:
+    """
+    Sends WhyLabs API requests from the coroutines of one event loop over a shared connection pool.
+
+    At most `max_concurrency` requests are in flight at a time, over up to `max_connections` pooled
+    connections (`max_concurrency` by default), multiplexed with `http2`. Identical GETs made at the
+    same time share one request, and inside `fresh_reads()` skip both that and the `cache`. Any write
+    drops the cached reads of the org or dataset it touches. Like with ToolkitApiClient, requests
+    wait for a token of the `rate_limiter` and are retried by the `retrier`, calls are reported to
+    the instrumentation, and failures raise the same whylabs_client and urllib3 exceptions.
+    """
+
+    def __init__(
+        self,
+        configuration: Configuration,
+        max_concurrency: int = 10,
+        max_connections: Optional[int] = None,
+        http2: bool = False,
+        default_headers: Optional[Mapping[str, str]] = None,
+        gzip_min_bytes: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retrier: Optional[Retrier] = None,
+    ) -> None:
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError('The async API needs httpx: pip install "whylabs-toolkit[aio]"') from e
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive number")
+        self._httpx = httpx
+        self.configuration = configuration
+        self.max_concurrency = max_concurrency
+        self.client = create_httpx_client(
+            httpx, configuration, max_connections=max_connections or max_concurrency, http2=http2
+        )
+        self.headers = {"Accept": "application/json", **(default_headers or {})}
+        for auth in configuration.auth_settings().values():
+            if auth["in"] == "header" and auth["value"]:
+                self.headers[auth["key"]] = auth["value"]
+        self.gzip_min_bytes = gzip_min_bytes
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retrier = retrier
+        self.single_flight = AsyncSingleFlight()
+        # Created on first use, in the event loop the requests run in
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def request(
+        self,
+        method: str,
+        resource_path: str,
+        path_params: Optional[Dict[str, str]] = None,
+        query_params: Optional[List[Tuple[str, Any]]] = None,
+        body: Optional[Any] = None,
+    ) -> Any:
+        """
+        Sends a request to an endpoint such as `/v0/organizations/{org_id}/models/{model_id}` and
+        returns the JSON it answered with, decoded, or None. `body` is sent as JSON, JsonBody as it is.
+        """
+        with api_call(method, resource_path, path_params) as call:
+            params = {key: quote(str(value), safe="") for key, value in (path_params or {}).items()}
+            response = await self._request(method, resource_path.format(**params), query_params or [], body, call)
+            return json.loads(response.data) if response.data else None
+
+    async def _request(
+        self, method: str, path: str, query_params: List[Tuple[str, Any]], body: Optional[Any], call: Optional[ApiCall]
+    ) -> CachedResponse:
+        content: Optional[bytes] = None
+        if body is not None:
+            content = bytes(body) if isinstance(body, JsonBody) else json.dumps(body).encode("utf-8")
+        record_request(call, content)
+        key = request_key(path, query_params)
+        cached = cached_read(self.cache, method, path, key)
+        if cached is not None:
+            record_response(call, cached.status, len(cached.data), cached=True)
+            return cached
+
+        shared = False
+        if method == "GET":
+            if reads_are_fresh():
+                response = await self._send(method, path, query_params, content)
+            else:
+                response, shared = await self.single_flight.do(
+                    key, lambda: self._send(method, path, query_params, content)
+                )
+            if self.cache is not None and is_cacheable(method, path) and not shared:
+                self.cache.set(key, response)
+        else:
+            try:
+                response = await self._send(method, path, query_params, content)
+            finally:
+                # Even a failed write may have been applied on the server side
+                invalidate_write(path, self.cache, self.single_flight)
+
+        record_response(call, response.status, len(response.data), coalesced=shared)
+        return response
+
+    async def _send(
+        self, method: str, path: str, query_params: List[Tuple[str, Any]], content: Optional[bytes]
+    ) -> CachedResponse:
+        async def attempt() -> CachedResponse:
+            return await self._attempt(method, path, query_params, content)
+
+        if self.retrier is not None:
+            return await self.retrier.call_async(method, path, attempt)
+        return await attempt()
+
+    async def _attempt(
+        self, method: str, path: str, query_params: List[Tuple[str, Any]], content: Optional[bytes]
+    ) -> CachedResponse:
+        headers = dict(self.headers)
+        body: Optional[Any] = content
+        if content is not None:
+            headers["Content-Type"] = "application/json"
+            if self.gzip_min_bytes is not None:
+                body, headers = gzip_body(content, headers, self.gzip_min_bytes)  # type: ignore
+        # Encoded like whylabs_client does, e.g. True as "True"
+        url = f"{self.configuration.host}{path}" + (f"?{urlencode(query_params)}" if query_params else "")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            with transport_errors(self._httpx, url):
+                response = cached_response(await self.client.request(method, url, headers=headers, content=body))
+        logger.debug(f"response body: {response.data!r}")
+        if self.rate_limiter is not None:
+            await self.rate_limiter.on_answer_async(response.status, response.getheaders())
+        raise_for_status(response)
+        return response
+
+    async def aclose(self) -> None:
+        """Closes the pooled connections. The client can't be used afterwards."""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], AsyncApiClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_max_concurrency: Optional[int] = None
+
+
+def create_async_client(config: Config = Config(), max_concurrency: Optional[int] = None) -> AsyncApiClient:
+    """
+    A new AsyncApiClient for the host and API key of `config`, with its transport, compression, rate limit,
+    retry policy and response cache, the last three shared with the pooled blocking client of `config`.
+    """
+    shared = get_shared_client(config=config)
+    http2 = config.get_transport() == "http2"
+    return AsyncApiClient(
+        shared.configuration,
+        max_concurrency=max_concurrency or _max_concurrency or config.get_connection_pool_maxsize(),
+        max_connections=config.get_http2_max_connections() if http2 else None,
+        http2=http2,
+        default_headers=shared.default_headers,
+        gzip_min_bytes=config.get_gzip_min_bytes() if config.get_gzip() else None,
+        cache=getattr(shared, "cache", None),
+        rate_limiter=getattr(shared, "rate_limiter", None),
+        retrier=getattr(shared, "retrier", None),
+    )
+
+
+def get_async_client(config: Config = Config()) -> AsyncApiClient:
+    """The AsyncApiClient of the running event loop for the host and API key of `config`, created on first use."""
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    key = (config.get_whylabs_host(), config.get_whylabs_api_key())
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = create_async_client(config=config)
+    return client
+
+
+def set_max_concurrency(max_concurrency: int) -> None:
+    """
+    Allow `max_concurrency` in-flight API calls to each async client created from now on.
+    Defaults to the connection pool size of the Config.
+    """
+    global _max_concurrency
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be a positive number")
+    _max_concurrency = max_concurrency
+
+
+async def close_async_clients() -> None:
+    """
+    Close the async clients of the running event loop and their connections.
+
+    New ones are created on the next call.
+    """
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*[client.aclose() for client in clients.values()])
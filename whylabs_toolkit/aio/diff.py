@@ -0,0 +1,74 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from whylabs_client.exceptions import NotFoundException
+
+from whylabs_toolkit.aio.client import get_async_client
+from whylabs_toolkit.aio.monitor_helpers import ANALYZER_PATH, MONITOR_CONFIG_PATH, MONITOR_PATH
+from whylabs_toolkit.helpers.cache import fresh_reads
+from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.json_body import JsonBody
+from whylabs_toolkit.monitor.manager.diff import ChangeType, DocumentDiff, EntityChange, diff_documents
+from whylabs_toolkit.monitor.models import Document
+
+
+async def get_current_document(org_id: str, dataset_id: str, config: Config = Config()) -> Optional[Dict[str, Any]]:
+    """The document WhyLabs holds for a dataset, read past the response cache since it is diffed and written back."""
+    try:
+        with fresh_reads():
+            document: Dict[str, Any] = await get_async_client(config=config).request(
+                "GET", MONITOR_CONFIG_PATH, {"org_id": org_id, "dataset_id": dataset_id}
+            )
+            return document
+    except NotFoundException:
+        return None
+
+
+async def plan_document(desired: Document, prune: bool = False, config: Config = Config()) -> DocumentDiff:
+    """Compare a desired Document with what WhyLabs currently holds for its dataset. Only reads from WhyLabs."""
+    current = await get_current_document(org_id=desired.orgId, dataset_id=desired.datasetId, config=config)
+    return diff_documents(current, desired, prune=prune)
+
+
+async def apply_plan(diff: DocumentDiff, config: Config = Config()) -> int:
+    """
+    Push a DocumentDiff to WhyLabs and return the number of writes made.
+
+    Analyzers are written concurrently before the monitors that reference them, and monitors
+    are deleted before their analyzers. An empty diff makes no requests at all. Analyzers and
+    monitors are sent as the JSON they were diffed as.
+    """
+    if diff.is_empty:
+        return 0
+    client = get_async_client(config=config)
+    org_id, dataset_id = diff.org_id, diff.dataset_id
+    writes = 0
+
+    def request_body(change: EntityChange) -> Any:
+        return JsonBody(change.payload) if change.payload is not None else change.body
+
+    async def put(path: str, key: str, change: EntityChange) -> None:
+        params = {"org_id": org_id, "dataset_id": dataset_id, key: change.id}
+        await client.request("PUT", path, params, body=request_body(change))
+
+    async def delete(path: str, key: str, change: EntityChange) -> None:
+        await client.request("DELETE", path, {"org_id": org_id, "dataset_id": dataset_id, key: change.id})
+
+    if diff.settings:
+        document = await get_current_document(org_id=org_id, dataset_id=dataset_id, config=config)
+        if document is None:
+            document = {"orgId": org_id, "datasetId": dataset_id, "analyzers": [], "monitors": []}
+        document.update(diff.settings)
+        await client.request("PUT", MONITOR_CONFIG_PATH, {"org_id": org_id, "dataset_id": dataset_id}, body=document)
+        writes += 1
+
+    for path, key, changes, removed in [
+        (ANALYZER_PATH, "analyzer_id", diff.analyzers, False),
+        (MONITOR_PATH, "monitor_id", diff.monitors, False),
+        (MONITOR_PATH, "monitor_id", diff.monitors, True),
+        (ANALYZER_PATH, "analyzer_id", diff.analyzers, True),
+    ]:
+        batch = [change for change in changes if (change.change == ChangeType.removed) == removed]
+        await asyncio.gather(*[(delete if removed else put)(path, key, change) for change in batch])
+        writes += len(batch)
+    return writes
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import logging
+from typing import Any, Optional
+
+from whylabs_toolkit.aio.client import get_async_client
+from whylabs_toolkit.aio.diff import apply_plan, get_current_document
+from whylabs_toolkit.aio.monitor_helpers import NOTIFICATION_ACTION_PATH, NOTIFICATION_ACTIONS_PATH
+from whylabs_toolkit.aio.monitor_helpers import get_model_granularity
+from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.instrumentation import operation
+from whylabs_toolkit.monitor.manager import MonitorManager, MonitorSetup
+from whylabs_toolkit.monitor.manager.diff import DocumentDiff, diff_documents
+from whylabs_toolkit.monitor.manager.validation import build_documents, get_document_validator, validate_setups
+from whylabs_toolkit.monitor.models import *
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMonitorManager:
+    """
+    Awaitable counterpart of MonitorManager, making the same requests over the AsyncApiClient
+    of the running event loop.
+
+    The setup has to be applied before saving, exactly as with MonitorManager.
+    Many managers can be saved concurrently with `asyncio.gather`; the number of
+    in-flight API calls is bounded by the client.
+    """
+
+    def __init__(self, setup: MonitorSetup, eager: Optional[bool] = None, config: Config = Config()) -> None:
+        self._setup = setup
+        self.__eager = eager
+        self.__config = config
+
+    async def _update_notification_actions(self) -> None:
+        if not self._setup.monitor:
+            raise ValueError("You must call apply() on your MonitorSetup object!")
+
+        client = get_async_client(config=self.__config)
+        org_id = self._setup.credentials.org_id
+        existing_actions = [
+            action.get("id") for action in await client.request("GET", NOTIFICATION_ACTIONS_PATH, {"org_id": org_id})
+        ]
+        missing_actions = [
+            action
+            for action in self._setup.monitor.actions
+            if not isinstance(action, GlobalAction) and action.id not in existing_actions
+        ]
+        for action in missing_actions:
+            logger.info(f"Didn't find a {action.type} action under the ID {action.id}, creating one now!")
+        await asyncio.gather(
+            *[
+                client.request(
+                    "PUT",
+                    NOTIFICATION_ACTION_PATH,
+                    {"org_id": org_id, "type": action.type.upper(), "action_id": action.id},
+                    body={MonitorManager.get_notification_request_payload(action=action): action.destination},
+                )
+                for action in missing_actions
+            ]
+        )
+
+        self._setup.monitor.actions = [
+            action if isinstance(action, GlobalAction) else GlobalAction(target=action.id)
+            for action in self._setup.monitor.actions
+        ]
+
+    async def _document(self) -> Document:
+        await self._update_notification_actions()
+
+        return Document(
+            orgId=self._setup.credentials.org_id,
+            datasetId=self._setup.credentials.dataset_id,
+            granularity=await get_model_granularity(
+                org_id=self._setup.credentials.org_id,
+                dataset_id=self._setup.credentials.dataset_id,
+                config=self.__config,
+            ),
+            analyzers=[self._setup.analyzer],
+            monitors=[self._setup.monitor],
+            allowPartialTargetBatches=self.__eager,
+        )
+
+    async def dump(self) -> Any:
+        return (await self._document()).json(indent=2, exclude_none=True)
+
+    async def dump_bytes(self) -> bytes:
+        return (await self._document()).json_bytes()
+
+    async def validate(self, offline: bool = False, granularity: Optional[Granularity] = None) -> bool:
+        """Validates the setup against the monitor config JSON Schema, see `MonitorManager.validate`."""
+        with operation("AsyncMonitorManager.validate"):
+            if offline:
+                return validate_setups([self._setup], granularity=granularity)
+
+            Monitor.validate(self._setup.monitor)
+            Analyzer.validate(self._setup.analyzer)
+
+            document = await self.dump_bytes()
+            get_document_validator().validate(instance=json.loads(document))
+            return True
+
+    async def plan(self) -> DocumentDiff:
+        """Compares the setup with what WhyLabs currently holds, without writing anything."""
+        with operation("AsyncMonitorManager.plan"):
+            if not self._setup.monitor or not self._setup.analyzer:
+                raise ValueError("You must call apply() on your MonitorSetup object!")
+            current = await get_current_document(
+                org_id=self._setup.credentials.org_id,
+                dataset_id=self._setup.credentials.dataset_id,  # type: ignore
+                config=self.__config,
+            )
+            granularity = (current or {}).get("granularity") or await get_model_granularity(
+                org_id=self._setup.credentials.org_id,
+                dataset_id=self._setup.credentials.dataset_id,
+                config=self.__config,
+            )
+            desired = build_documents([self._setup], granularity=granularity, eager=self.__eager)[0]
+            return diff_documents(current, desired)
+
+    async def save(self) -> None:
+        with operation("AsyncMonitorManager.save"):
+            if await self.validate() is True:
+                diff = await self.plan()
+                if diff.is_empty:
+                    logger.info(f"{self._setup.credentials.monitor_id} is up to date, nothing to save.")
+                await apply_plan(diff, config=self.__config)
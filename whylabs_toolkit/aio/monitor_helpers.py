@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import Any, List, Optional
+
+from whylabs_client.exceptions import ApiValueError, ForbiddenException, NotFoundException
+
+from whylabs_toolkit.aio.client import get_async_client
+from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.monitor_helpers import MonitorConfigIndex, granularity_from_time_period
+from whylabs_toolkit.utils.granularity import Granularity
+
+logger = logging.getLogger(__name__)
+
+# The endpoints of whylabs_client used here
+MODEL_PATH = "/v0/organizations/{org_id}/models/{model_id}"
+MONITOR_CONFIG_PATH = "/v0/organizations/{org_id}/models/{dataset_id}/monitor-config/v3"
+MONITOR_PATH = "/v0/organizations/{org_id}/models/{dataset_id}/monitor-config/monitor/{monitor_id}"
+ANALYZER_PATH = "/v0/organizations/{org_id}/models/{dataset_id}/monitor-config/analyzer/{analyzer_id}"
+NOTIFICATION_ACTIONS_PATH = "/v0/notification-settings/{org_id}/actions"
+NOTIFICATION_ACTION_PATH = "/v0/notification-settings/{org_id}/actions/{type}/{action_id}"
+
+
+async def get_monitor_config(org_id: str, dataset_id: str, config: Config = Config()) -> Any:
+    client = get_async_client(config=config)
+    try:
+        return await client.request("GET", MONITOR_CONFIG_PATH, {"org_id": org_id, "dataset_id": dataset_id})
+    except NotFoundException:
+        logger.warning(f"Could not find a monitor config for {dataset_id}")
+        return None
+
+
+async def get_monitor(
+    monitor_id: str, org_id: Optional[str] = None, dataset_id: Optional[str] = None, config: Config = Config()
+) -> Any:
+    org_id = org_id or config.get_default_org_id()
+    dataset_id = dataset_id or config.get_default_dataset_id()
+
+    client = get_async_client(config=config)
+    try:
+        return await client.request(
+            "GET", MONITOR_PATH, {"org_id": org_id, "dataset_id": dataset_id, "monitor_id": monitor_id}
+        )
+    except (ForbiddenException, NotFoundException):
+        logger.warning(
+            f"Could not find a monitor with id {monitor_id} for {dataset_id}." "Did you set a correct WHYLABS_API_KEY?"
+        )
+        return None
+
+
+async def get_analyzer_ids(
+    monitor_id: str, org_id: Optional[str] = None, dataset_id: Optional[str] = None, config: Config = Config()
+) -> Any:
+    org_id = org_id or config.get_default_org_id()
+    dataset_id = dataset_id or config.get_default_dataset_id()
+    try:
+        index = MonitorConfigIndex(await get_monitor_config(org_id=org_id, dataset_id=dataset_id, config=config))
+        return index.get_analyzer_ids(monitor_id)
+    except ForbiddenException:
+        logger.warning(f"Could not find analyzer IDs for {org_id}, {dataset_id}, {monitor_id}")
+        return None
+
+
+async def get_analyzers(
+    monitor_id: str, org_id: Optional[str] = None, dataset_id: Optional[str] = None, config: Config = Config()
+) -> Optional[List[Any]]:
+    org_id = org_id or config.get_default_org_id()
+    dataset_id = dataset_id or config.get_default_dataset_id()
+    try:
+        index = MonitorConfigIndex(await get_monitor_config(org_id=org_id, dataset_id=dataset_id, config=config))
+    except ForbiddenException:
+        logger.warning(f"Could not read the monitor config for {org_id}, {dataset_id}")
+        index = MonitorConfigIndex()
+    return index.get_analyzers(monitor_id)
+
+
+async def get_model_granularity(
+    org_id: Optional[str] = None, dataset_id: Optional[str] = None, config: Config = Config()
+) -> Optional[Granularity]:
+    org_id = org_id or config.get_default_org_id()
+    dataset_id = dataset_id or config.get_default_dataset_id()
+
+    client = get_async_client(config=config)
+    model_meta = await client.request("GET", MODEL_PATH, {"org_id": org_id, "model_id": dataset_id})
+
+    if model_meta:
+        return granularity_from_time_period(str(model_meta["timePeriod"]))
+    return None
+
+
+async def delete_monitor(
+    monitor_id: str, org_id: Optional[str] = None, dataset_id: Optional[str] = None, config: Config = Config()
+) -> None:
+    org_id = org_id or config.get_default_org_id()
+    dataset_id = dataset_id or config.get_default_dataset_id()
+
+    client = get_async_client(config=config)
+    try:
+        analyzer_ids = await get_analyzer_ids(
+            org_id=org_id, dataset_id=dataset_id, monitor_id=monitor_id, config=config
+        )
+        if analyzer_ids is None:
+            return
+        await asyncio.gather(
+            *[
+                client.request(
+                    "DELETE", ANALYZER_PATH, {"org_id": org_id, "dataset_id": dataset_id, "analyzer_id": analyzer_id}
+                )
+                for analyzer_id in analyzer_ids
+            ]
+        )
+        resp_monitor = await client.request(
+            "DELETE", MONITOR_PATH, {"org_id": org_id, "dataset_id": dataset_id, "monitor_id": monitor_id}
+        )
+        logger.debug(f"Deleted monitor with Resp:{resp_monitor}")
+    except ApiValueError as e:
+        logger.error(f"Error deleting monitor {monitor_id}: {e.msg}")
+        raise e
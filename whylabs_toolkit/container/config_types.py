@@ -1,7 +1,9 @@
 from enum import Enum
 from dataclasses import dataclass
-from whylogs.core.schema import DatasetSchema
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from whylogs.core.schema import DatasetSchema
 
 
 class DatasetCadence(Enum):
@@ -23,6 +25,15 @@ class DatasetUploadCadence:
 
 @dataclass
 class DatasetOptions:
-    schema: Optional[DatasetSchema]
+    schema: Optional["DatasetSchema"]
     dataset_cadence: DatasetCadence
     whylabs_upload_cadence: DatasetUploadCadence
+
+
+def __getattr__(name: str) -> Any:
+    # whylogs is slow to import and only needed by callers that build a DatasetSchema themselves
+    if name == "DatasetSchema":
+        from whylogs.core.schema import DatasetSchema
+
+        return DatasetSchema
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
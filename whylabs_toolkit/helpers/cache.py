@@ -0,0 +1,204 @@
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Pattern, Tuple, Union
+from urllib.parse import urlencode
+
+from urllib3._collections import HTTPHeaderDict
+
+from .coalesce import AsyncSingleFlight, SingleFlight
+
+# Read-only endpoints whose responses can be served from the cache
+CACHEABLE_PATHS: List[Pattern[str]] = [
+    re.compile(r"^/v0/organizations/[^/]+/models/[^/]+$"),  # get_model
+    re.compile(r"^/v0/organizations/[^/]+/models/[^/]+/schema$"),  # get_entity_schema
+    re.compile(r"^/v0/organizations/[^/]+/models/[^/]+/monitor-config/v3$"),  # get_monitor_config_v3
+    re.compile(r"^/v0/notification-settings/[^/]+/actions$"),  # list_notification_actions
+]
+
+# A write is scoped to the most specific of these prefixes it falls under
+_WRITE_SCOPES: List[Pattern[str]] = [
+    re.compile(r"^/v0/organizations/[^/]+/models/[^/]+"),
+    re.compile(r"^/v0/organizations/[^/]+"),
+    re.compile(r"^/v0/notification-settings/[^/]+"),
+]
+
+_fresh_reads: ContextVar[bool] = ContextVar("whylabs_toolkit_fresh_reads", default=False)
+
+
+@contextmanager
+def fresh_reads() -> Iterator[None]:
+    """
+    Reads inside the block go to WhyLabs: they skip the response cache and don't join a
+    request already in flight. Their answers still refresh the cache. For the reads a
+    read-modify-write is based on.
+    """
+    token = _fresh_reads.set(True)
+    try:
+        yield
+    finally:
+        _fresh_reads.reset(token)
+
+
+def reads_are_fresh() -> bool:
+    return _fresh_reads.get()
+
+
+def is_cacheable(method: str, path: str) -> bool:
+    return method == "GET" and any(pattern.match(path) for pattern in CACHEABLE_PATHS)
+
+
+def write_scope(path: str) -> str:
+    """Path prefix whose cached reads may be stale after a write to `path`. Empty means everything."""
+    for pattern in _WRITE_SCOPES:
+        match = pattern.match(path)
+        if match:
+            return match.group(0)
+    return ""
+
+
+class CachedResponse:
+    """
+    A stored HTTP response that quacks like whylabs_client.rest.RESTResponse.
+
+    Its headers are looked up without regard to case, as urllib3's are, whatever case
+    they were stored in.
+    """
+
+    def __init__(self, status: int, reason: str, data: bytes, headers: Mapping[str, str]) -> None:
+        self.status = status
+        self.reason = reason
+        self.data = data
+        self.headers = headers if isinstance(headers, HTTPHeaderDict) else HTTPHeaderDict(headers)
+
+    def getheaders(self) -> HTTPHeaderDict:
+        return self.headers
+
+    def getheader(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value: Optional[str] = self.headers.get(name, default)
+        return value
+
+    def copy(self) -> "CachedResponse":
+        # whylabs_client decodes `data` in place, so every hit gets its own object
+        return CachedResponse(status=self.status, reason=self.reason, data=self.data, headers=self.headers)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class ResponseCache(ABC):
+    """Storage for read-only WhyLabs API responses. Subclass it to plug in another backend."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, response: CachedResponse) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate(self, scope: str) -> None:
+        """Drop every entry whose path is `scope` or lies under it."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        pass
+
+
+class TTLCache(ResponseCache):
+    """In-memory cache whose entries expire after `ttl` seconds, evicting the least recently used beyond `maxsize`."""
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 512) -> None:
+        if ttl <= 0 or maxsize <= 0:
+            raise ValueError("ttl and maxsize must be positive")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[1].copy()
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response.copy())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self, scope: str) -> None:
+        with self._lock:
+            stale = [key for key in self._entries if in_scope(key, scope)]
+            for key in stale:
+                del self._entries[key]
+            self._stats.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                size=len(self._entries),
+            )
+
+
+def in_scope(key: str, scope: str) -> bool:
+    path = key.split("?", 1)[0]
+    return not scope or path == scope or path.startswith(scope + "/")
+
+
+def request_key(path: str, query_params: Optional[Iterable[Tuple[str, Any]]] = None) -> str:
+    """The key of a read in the response cache and among the identical reads in flight."""
+    return f"{path}?{urlencode(sorted(query_params or []))}"
+
+
+def cached_read(cache: Optional[ResponseCache], method: str, path: str, key: str) -> Optional[CachedResponse]:
+    """The cached answer to a read, unless reads are fresh or the endpoint isn't cached."""
+    if cache is None or reads_are_fresh() or not is_cacheable(method, path):
+        return None
+    return cache.get(key)
+
+
+def invalidate_write(
+    path: str, cache: Optional[ResponseCache], single_flight: Optional[Union[SingleFlight, AsyncSingleFlight]]
+) -> None:
+    """Drops the cached reads a write to `path` may have made stale, and stops new reads from joining those in flight."""
+    scope = write_scope(path)
+    if cache is not None:
+        cache.invalidate(scope)
+    if single_flight is not None:
+        single_flight.forget(lambda key: in_scope(key, scope))
@@ -1,10 +1,294 @@
+import atexit
+import socket
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from urllib3.connection import HTTPConnection
 from whylabs_client import ApiClient, Configuration
+from whylabs_client.exceptions import ApiException
 
+from .cache import (
+    CachedResponse,
+    ResponseCache,
+    TTLCache,
+    cached_read,
+    invalidate_write,
+    is_cacheable,
+    reads_are_fresh,
+    request_key,
+)
+from .coalesce import SingleFlight
+from .compression import enable_gzip
 from .config import Config
+from .instrumentation import api_call, current_api_call, record_request, record_response
+from .json_body import JsonBody, JsonBodyRESTClient
+from .rate_limit import Backend, FileBackend, MemoryBackend, RateLimiter
+from .retry import Retrier, RetryPolicy, transport_retries
+from .snapshot import SnapshotCache, SnapshotStore
+from .transport import Http2RESTClient
+
+
+def _keepalive_socket_options() -> List[Tuple[int, int, Union[int, bytes]]]:
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Probe idle connections before the load balancers in front of WhyLabs drop them
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15))
+    return options
+
+
+class ToolkitApiClient(ApiClient):
+    """
+    ApiClient that serves repeated read-only lookups from a response cache.
+
+    Cached responses are stored as raw bytes and deserialized again on every hit,
+    so callers never share mutable objects. Any PUT, POST, PATCH or DELETE made
+    through the client drops the cached reads of the org or dataset it touches.
+    Requests that reach the network first wait for a token of the `rate_limiter`,
+    when there is one, and report their status back to it. Transient failures are
+    retried by the `retrier`, each attempt taking its own token. Identical GETs made
+    at the same time by several threads share one request through `single_flight`.
+    Inside `fresh_reads()` GETs skip both. `JsonBody` request bodies are sent as they are.
+    """
+
+    def __init__(
+        self,
+        configuration: Configuration,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retrier: Optional[Retrier] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ) -> None:
+        super().__init__(configuration)
+        self.rest_client = JsonBodyRESTClient(configuration)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retrier = retrier
+        self.single_flight = single_flight
+
+    @classmethod
+    def sanitize_for_serialization(cls, obj: Any) -> Any:
+        if isinstance(obj, JsonBody):
+            return obj
+        return super().sanitize_for_serialization(obj)
+
+    def call_api(
+        self, resource_path: str, method: str, path_params: Optional[Dict[str, Any]] = None, *args: Any, **kwargs: Any
+    ) -> Any:
+        with api_call(method, resource_path, path_params):
+            return super().call_api(resource_path, method, path_params, *args, **kwargs)
+
+    def _path(self, url: str) -> str:
+        host = self.configuration.host
+        return url[len(host) :] if url.startswith(host) else urlsplit(url).path
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        query_params: Optional[List[Tuple[str, Any]]] = None,
+        headers: Optional[Dict[str, Any]] = None,
+        post_params: Optional[List[Tuple[str, Any]]] = None,
+        body: Optional[Any] = None,
+        _preload_content: bool = True,
+        _request_timeout: Optional[Any] = None,
+    ) -> Any:
+        cache = self.cache
+        call = current_api_call()
+        record_request(call, body)
+        path = self._path(url).split("?", 1)[0]
+        key = request_key(path, query_params)
+        cached = cached_read(cache, method, path, key) if _preload_content else None
+        if cached is not None:
+            record_response(call, cached.status, len(cached.data), cached=True)
+            return cached
+
+        def attempt() -> Any:
+            return self._send(method, url, query_params, headers, post_params, body, _preload_content, _request_timeout)
+
+        def send() -> Any:
+            return self.retrier.call(method, path, attempt) if self.retrier is not None else attempt()
+
+        def fetch() -> Tuple[Any, CachedResponse]:
+            response = send()
+            # Taken before whylabs_client decodes `data` in place, for the callers sharing the response
+            return response, CachedResponse(
+                status=response.status, reason=response.reason, data=response.data, headers=response.getheaders()
+            )
+
+        single_flight = self.single_flight
+        snapshot: Optional[CachedResponse] = None
+        shared = False
+        try:
+            if single_flight is not None and method == "GET" and _preload_content and not reads_are_fresh():
+                (response, snapshot), shared = single_flight.do(key, fetch)
+                if shared:
+                    response = snapshot.copy()
+            else:
+                response = send()
+        finally:
+            if method != "GET":
+                # Even a failed write may have been applied on the server side
+                invalidate_write(path, cache, single_flight)
+
+        record_response(call, response.status, len(response.data or b"") if _preload_content else 0, coalesced=shared)
+        if cache is not None and _preload_content and is_cacheable(method, path) and not shared:
+            if snapshot is None:
+                snapshot = CachedResponse(
+                    status=response.status,
+                    reason=response.reason,
+                    data=response.data,
+                    headers=response.getheaders(),
+                )
+            cache.set(key, snapshot)
+        return response
+
+    def _send(self, method: str, url: str, *args: Any) -> Any:
+        rate_limiter = self.rate_limiter
+        if rate_limiter is None:
+            return super().request(method, url, *args)
+        rate_limiter.acquire()
+        try:
+            response = super().request(method, url, *args)
+        except ApiException as e:
+            rate_limiter.on_answer(e.status, e.headers)
+            raise
+        rate_limiter.on_answer(response.status)
+        return response
+
+
+def default_cache_factory(config: Config) -> Optional[ResponseCache]:
+    ttl = config.get_cache_ttl_seconds()
+    cache = TTLCache(ttl=ttl, maxsize=config.get_cache_maxsize()) if ttl > 0 else None
+    snapshot_path = config.get_snapshot_path()
+    if snapshot_path:
+        return SnapshotCache(SnapshotStore(snapshot_path), fallback=cache)
+    return cache
+
+
+def default_rate_limiter(config: Config) -> Optional[RateLimiter]:
+    max_rate = config.get_rate_limit()
+    if max_rate <= 0:
+        return None
+    path = config.get_rate_limit_path()
+    backend: Backend = FileBackend(path) if path else MemoryBackend()
+    return RateLimiter(max_rate=max_rate, min_rate=min(0.5, max_rate), backend=backend, key=config.get_whylabs_host())
+
 
+def default_retrier(config: Config) -> Optional[Retrier]:
+    max_retries = config.get_max_retries()
+    if max_retries <= 0:
+        return None
+    policy = RetryPolicy(
+        max_retries=max_retries,
+        backoff=config.get_retry_backoff_seconds(),
+        deadline=config.get_retry_deadline_seconds(),
+    )
+    return Retrier(policy)
 
-def create_client(config: Config = Config()) -> ApiClient:
+
+def create_client(config: Config = Config(), cache: Optional[ResponseCache] = None) -> ApiClient:
     client_config = Configuration(host=config.get_whylabs_host())
     client_config.api_key = {"ApiKeyAuth": config.get_whylabs_api_key()}
     client_config.discard_unknown_keys = True
-    return ApiClient(client_config)
+    client_config.connection_pool_maxsize = config.get_connection_pool_maxsize()
+    if config.get_tcp_keepalive():
+        client_config.socket_options = _keepalive_socket_options()
+    retrier = default_retrier(config)
+    if retrier is not None:
+        # The Retrier takes over the retries urllib3 would make, so that each one is paced, counted and bounded
+        client_config.retries = transport_retries()
+    client = ToolkitApiClient(
+        client_config,
+        cache=cache,
+        rate_limiter=default_rate_limiter(config),
+        retrier=retrier,
+        single_flight=SingleFlight(),
+    )
+    if config.get_transport() == "http2":
+        client.rest_client.pool_manager.clear()
+        client.rest_client = Http2RESTClient(
+            client_config,
+            max_connections=config.get_http2_max_connections(),
+            gzip_min_bytes=config.get_gzip_min_bytes() if config.get_gzip() else None,
+        )
+        if config.get_gzip():
+            client.set_default_header("Accept-Encoding", "gzip")
+    elif config.get_gzip():
+        enable_gzip(client, min_bytes=config.get_gzip_min_bytes())
+    return client
+
+
+class ClientRegistry:
+    """
+    Process-wide registry of ApiClient objects, one per (host, API key) pair.
+
+    Every client owns its own urllib3 connection pool, so sharing them keeps
+    TLS sessions and keep-alive connections around between helper calls.
+    Transport, pool size, keep-alive, compression, the rate limit, the retry policy and
+    the response cache are taken from the Config that first creates the client. Set
+    `cache_factory` to plug in another ResponseCache.
+    """
+
+    def __init__(self, cache_factory: Callable[[Config], Optional[ResponseCache]] = default_cache_factory) -> None:
+        self._clients: Dict[Tuple[str, str], ApiClient] = {}
+        self._lock = threading.Lock()
+        self.cache_factory = cache_factory
+
+    def get(self, config: Config = Config()) -> ApiClient:
+        key = (config.get_whylabs_host(), config.get_whylabs_api_key())
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = create_client(config=config, cache=self.cache_factory(config))
+                self._clients[key] = client
+            return client
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            close_client(client)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+def close_client(client: ApiClient) -> None:
+    client.close()
+    if isinstance(client.rest_client, Http2RESTClient):
+        client.rest_client.close()
+    else:
+        client.rest_client.pool_manager.clear()
+
+
+_registry = ClientRegistry()
+
+
+def get_client_registry() -> ClientRegistry:
+    return _registry
+
+
+def get_shared_client(config: Config = Config()) -> ApiClient:
+    return _registry.get(config=config)
+
+
+def use_snapshot(store: SnapshotStore, config: Config = Config()) -> None:
+    """Serve model, schema and monitor config reads of the shared client for `config` from a local snapshot."""
+    client = get_shared_client(config=config)
+    current = client.cache  # type: ignore
+    if isinstance(current, SnapshotCache):
+        current = current.fallback
+    client.cache = SnapshotCache(store, fallback=current)  # type: ignore
+
+
+def close_clients() -> None:
+    """Close every pooled client and its connections. New clients are created on the next call."""
+    _registry.close()
+
+
+atexit.register(close_clients)
@@ -0,0 +1,132 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+While a read for a key is in flight, callers asking for the same key wait for it and share
+its result or error instead of sending their own request. SingleFlight does this for threads,
+AsyncSingleFlight for coroutines of the same event loop.
+"""
+import asyncio
+import copy
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    # Calls that did the work, and calls that waited for one of them instead
+    flights: int = 0
+    shared: int = 0
+
+
+class _Flight(Generic[T]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces calls made from several threads, safe to share between them.
+
+    Waiting callers raise their own shallow copy of the error, taken as it was raised,
+    since callers like whylabs_client change the exceptions they catch in place.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = SingleFlightStats()
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Runs `func`, or waits for the running call of the same `key`.
+        Returns the result and whether it came from another caller's call.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self._stats.flights += 1
+            else:
+                self._stats.shared += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise copy.copy(flight.error)
+            return flight.result, True  # type: ignore
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = copy.copy(e)
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def forget(self, predicate: Callable[[Any], bool]) -> None:
+        """Callers arriving from now on won't join the running calls whose key matches `predicate`."""
+        with self._lock:
+            for key in [key for key in self._flights if predicate(key)]:
+                del self._flights[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            return SingleFlightStats(flights=self._stats.flights, shared=self._stats.shared)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces coroutines of the same event loop.
+
+    The work of a key runs in its own task, so cancelling one of the waiting
+    coroutines doesn't cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        self._flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats = SingleFlightStats()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        loop = asyncio.get_running_loop()
+        flights = self._flights.setdefault(loop, {})
+        task = flights.get(key)
+        shared = task is not None
+        if task is None:
+            task = flights[key] = loop.create_task(func())  # type: ignore
+            task.add_done_callback(lambda done: _finish(flights, key, done))
+            self._stats.flights += 1
+        else:
+            self._stats.shared += 1
+        return await asyncio.shield(task), shared
+
+    def forget(self, predicate: Callable[[Any], bool]) -> None:
+        """Coroutines of the running event loop arriving from now on won't join the calls whose key matches."""
+        flights = self._flights.get(asyncio.get_running_loop(), {})
+        for key in [key for key in flights if predicate(key)]:
+            del flights[key]
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(flights=self._stats.flights, shared=self._stats.shared)
+
+
+def _finish(flights: Dict[Hashable, "asyncio.Task"], key: Hashable, task: "asyncio.Task") -> None:
+    if flights.get(key) is task:
+        del flights[key]
+    # Marks the error as retrieved when every waiter was cancelled before it came
+    if not task.cancelled():
+        task.exception()
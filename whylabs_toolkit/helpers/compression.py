@@ -0,0 +1,50 @@
+"""
+Gzip compression of the WhyLabs API request bodies.
+
+whylabs_client serializes JSON bodies itself and hands them to its urllib3 pool manager,
+so compression happens there: GzipPoolManager wraps the pool manager of a client and
+compresses the bodies of at least `min_bytes`. Responses are decompressed by urllib3.
+"""
+import gzip
+from typing import Any, Dict, Optional, Tuple
+
+# On generated monitor configs, level 6 compresses about as well as 9 in half the time, and much better than 5
+GZIP_LEVEL = 6
+
+
+def gzip_body(
+    body: Any, headers: Optional[Dict[str, str]], min_bytes: int, level: int = GZIP_LEVEL
+) -> Tuple[Any, Optional[Dict[str, str]]]:
+    """The body to send and its headers: gzipped when it has at least `min_bytes` and isn't encoded yet."""
+    if body is None or (headers or {}).get("Content-Encoding"):
+        return body, headers
+    data = body.encode("utf-8") if isinstance(body, str) else body
+    if not isinstance(data, bytes) or len(data) < min_bytes:
+        return body, headers
+    return gzip.compress(data, compresslevel=level), dict(headers or {}, **{"Content-Encoding": "gzip"})
+
+
+class GzipPoolManager:
+    """Wraps a urllib3 PoolManager or ProxyManager to gzip request bodies of at least `min_bytes`."""
+
+    def __init__(self, pool_manager: Any, min_bytes: int = 1024, level: int = GZIP_LEVEL) -> None:
+        self.pool_manager = pool_manager
+        self.min_bytes = min_bytes
+        self.level = level
+
+    def request(
+        self, method: str, url: str, body: Optional[Any] = None, headers: Optional[Dict[str, str]] = None, **kwargs: Any
+    ) -> Any:
+        body, headers = gzip_body(body, headers, self.min_bytes, self.level)
+        return self.pool_manager.request(method, url, body=body, headers=headers, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pool_manager, name)
+
+
+def enable_gzip(client: Any, min_bytes: int = 1024, level: int = GZIP_LEVEL) -> None:
+    """Compress the request bodies of at least `min_bytes` sent by an ApiClient, and accept gzip-encoded responses."""
+    rest_client = client.rest_client
+    if not isinstance(rest_client.pool_manager, GzipPoolManager):
+        rest_client.pool_manager = GzipPoolManager(rest_client.pool_manager, min_bytes=min_bytes, level=level)
+    client.set_default_header("Accept-Encoding", "gzip")
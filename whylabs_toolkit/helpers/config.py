@@ -1,6 +1,7 @@
 import os
 import logging
 from enum import Enum
+from typing import Optional
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,6 +13,20 @@ class ConfigVars(Enum):
     WHYLABS_API_KEY = 3
     WHYLABS_HOST = "https://api.whylabsapp.com"
     WHYLABS_PRIVATE_API_ENDPOINT = 5
+    WHYLABS_CONNECTION_POOL_MAXSIZE = "10"
+    WHYLABS_TCP_KEEPALIVE = "true"
+    WHYLABS_CACHE_TTL_SECONDS = "0.0"
+    WHYLABS_CACHE_MAXSIZE = "512"
+    WHYLABS_SNAPSHOT_PATH = 6
+    WHYLABS_RATE_LIMIT = "0"
+    WHYLABS_RATE_LIMIT_PATH = 7
+    WHYLABS_MAX_RETRIES = "3"
+    WHYLABS_RETRY_BACKOFF_SECONDS = "0.5"
+    WHYLABS_RETRY_DEADLINE_SECONDS = "120"
+    WHYLABS_GZIP = "false"
+    WHYLABS_GZIP_MIN_BYTES = "1024"
+    WHYLABS_TRANSPORT = "urllib3"
+    WHYLABS_HTTP2_MAX_CONNECTIONS = "4"
 
 
 class Config:
@@ -31,6 +46,62 @@ class Config:
     def get_default_dataset_id(self) -> str:
         return Validations.require(ConfigVars.DATASET_ID)
 
+    def get_connection_pool_maxsize(self) -> int:
+        return int(Validations.get_or_default(ConfigVars.WHYLABS_CONNECTION_POOL_MAXSIZE))
+
+    def get_tcp_keepalive(self) -> bool:
+        return Validations.get_or_default(ConfigVars.WHYLABS_TCP_KEEPALIVE).lower() in ("1", "true", "yes")
+
+    def get_cache_ttl_seconds(self) -> float:
+        return float(Validations.get_or_default(ConfigVars.WHYLABS_CACHE_TTL_SECONDS))
+
+    def get_cache_maxsize(self) -> int:
+        return int(Validations.get_or_default(ConfigVars.WHYLABS_CACHE_MAXSIZE))
+
+    def get_snapshot_path(self) -> Optional[str]:
+        _snapshot_path = Validations.get_or_default(ConfigVars.WHYLABS_SNAPSHOT_PATH)
+        if _snapshot_path and isinstance(_snapshot_path, str):
+            return _snapshot_path
+        return None
+
+    def get_rate_limit(self) -> float:
+        """Most requests per second sent to WhyLabs, adapting down when throttled. 0 turns the limiter off."""
+        return float(Validations.get_or_default(ConfigVars.WHYLABS_RATE_LIMIT))
+
+    def get_rate_limit_path(self) -> Optional[str]:
+        _rate_limit_path = Validations.get_or_default(ConfigVars.WHYLABS_RATE_LIMIT_PATH)
+        if _rate_limit_path and isinstance(_rate_limit_path, str):
+            return _rate_limit_path
+        return None
+
+    def get_max_retries(self) -> int:
+        return int(Validations.get_or_default(ConfigVars.WHYLABS_MAX_RETRIES))
+
+    def get_retry_backoff_seconds(self) -> float:
+        return float(Validations.get_or_default(ConfigVars.WHYLABS_RETRY_BACKOFF_SECONDS))
+
+    def get_retry_deadline_seconds(self) -> Optional[float]:
+        """Time a call may spend retrying, from its first attempt. 0 means no deadline."""
+        deadline = float(Validations.get_or_default(ConfigVars.WHYLABS_RETRY_DEADLINE_SECONDS))
+        return deadline if deadline > 0 else None
+
+    def get_gzip(self) -> bool:
+        """Whether to gzip large request bodies and accept gzip-encoded responses."""
+        return Validations.get_or_default(ConfigVars.WHYLABS_GZIP).lower() in ("1", "true", "yes")
+
+    def get_gzip_min_bytes(self) -> int:
+        return int(Validations.get_or_default(ConfigVars.WHYLABS_GZIP_MIN_BYTES))
+
+    def get_transport(self) -> str:
+        """How requests are sent: "urllib3", one HTTP/1.1 connection per concurrent request, or "http2"."""
+        transport = Validations.get_or_default(ConfigVars.WHYLABS_TRANSPORT).lower()
+        if transport not in ("urllib3", "http2"):
+            raise ValueError(f"Unknown transport {transport}, expected urllib3 or http2")
+        return transport
+
+    def get_http2_max_connections(self) -> int:
+        return int(Validations.get_or_default(ConfigVars.WHYLABS_HTTP2_MAX_CONNECTIONS))
+
 
 class UserConfig(Config):
     def __init__(self, api_key: str, org_id: str, dataset_id: str, whylabs_host: str = ConfigVars.WHYLABS_HOST.value):
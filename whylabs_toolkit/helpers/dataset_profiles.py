@@ -42,7 +42,7 @@ def delete_all_profiles_for_period(
     org_id: Optional[str] = None,
     dataset_id: Optional[str] = None,
 ) -> DeleteDatasetProfilesResponse:
-    api = get_dataset_profile_api()
+    api = get_dataset_profile_api(config=config)
 
     profile_start_timestamp = process_date_input(date_input=start)
     profile_end_timestamp = process_date_input(date_input=end)
@@ -0,0 +1,489 @@
+"""
+Instrumentation of the WhyLabs API calls made through the toolkit.
+
+Every call made by a client from `whylabs_toolkit.helpers.client` produces an ApiCallEvent,
+and the toolkit's high-level operations (MonitorSetup, MonitorManager.save, schema updates...)
+open a span around the calls they make. Both go to the Instrumentation set with
+`set_instrumentation`, which does nothing by default.
+"""
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CallOutcome(str, Enum):
+    ok = "ok"
+    cached = "cached"
+    coalesced = "coalesced"
+    client_error = "client_error"
+    server_error = "server_error"
+    error = "error"
+
+
+# Outcomes of the calls that got their answer
+_SUCCESSES = (CallOutcome.ok, CallOutcome.cached, CallOutcome.coalesced)
+
+
+@dataclass
+class ApiCallEvent:
+    """
+    A finished WhyLabs API call.
+
+    `endpoint` is the path template of the call, like
+    `/v0/organizations/{org_id}/models/{dataset_id}/monitor-config/v3`, so calls
+    group per endpoint whatever the ids. Durations are in seconds and include
+    (de)serialization, byte counts are the JSON bodies sent and received.
+    `retry_time` is the part of the duration lost to failed attempts and the waits between them.
+    """
+
+    method: str
+    endpoint: str
+    org_id: Optional[str]
+    dataset_id: Optional[str]
+    outcome: CallOutcome
+    duration: float
+    started_at: float
+    status: Optional[int] = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    operation: Optional[str] = None
+    error: Optional[str] = None
+    retries: int = 0
+    retry_time: float = 0.0
+
+
+@dataclass
+class ApiCall:
+    """What the HTTP layer learns about the call in flight."""
+
+    status: Optional[int] = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    cached: bool = False
+    coalesced: bool = False
+    retries: int = 0
+    retry_time: float = 0.0
+
+
+class Instrumentation:
+    """
+    Receives API call events and opens operation spans.
+
+    The base class does nothing; subclasses override `on_api_call`, `span` and `on_rate_change`.
+    `measure_bytes` can be turned off to skip sizing request bodies, which costs
+    one extra JSON encoding per write.
+    """
+
+    enabled = True
+    measure_bytes = True
+
+    def on_api_call(self, event: ApiCallEvent) -> None:
+        pass
+
+    @contextmanager
+    def span(self, name: str, attributes: Dict[str, Any]) -> Iterator[None]:
+        yield
+
+    def on_rate_change(self, key: str, rate: float) -> None:
+        """Called when the rate of the client-side rate limiter `key` changes, in requests per second."""
+
+
+class NoopInstrumentation(Instrumentation):
+    enabled = False
+    measure_bytes = False
+
+
+class Histogram:
+    """
+    Latency histogram with logarithmic buckets.
+
+    Memory only grows with the spread of the values, not their number, and
+    percentiles are within `precision` (relative) of the recorded values.
+    """
+
+    _SMALLEST = 1e-6
+
+    def __init__(self, precision: float = 0.01) -> None:
+        self._log_growth = math.log1p(2 * precision)
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        index = int(math.log(max(value, self._SMALLEST) / self._SMALLEST) / self._log_growth)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Value under which `q` percent of the recorded values fall, 0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        if rank >= self.count:
+            return self.max
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                middle = self._SMALLEST * math.exp((index + 0.5) * self._log_growth)
+                return min(max(middle, self.min), self.max)
+        return self.max
+
+
+@dataclass
+class EndpointStats:
+    latency: Histogram = field(default_factory=Histogram)
+    outcomes: Dict[CallOutcome, int] = field(default_factory=dict)
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    retry_time: float = 0.0
+
+    @property
+    def errors(self) -> int:
+        return sum(count for outcome, count in self.outcomes.items() if outcome not in _SUCCESSES)
+
+
+class HistogramCollector(Instrumentation):
+    """
+    Keeps per-endpoint latency histograms, outcome counts and byte totals in memory,
+    plus a latency histogram per operation span and the current rate of each rate limiter.
+
+    >>> collector = HistogramCollector()
+    >>> set_instrumentation(collector)
+    >>> ...
+    >>> print(collector.report())
+    """
+
+    def __init__(self, precision: float = 0.01) -> None:
+        self.precision = precision
+        self.endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+        self.operations: Dict[str, Histogram] = {}
+        self.rates: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def on_api_call(self, event: ApiCallEvent) -> None:
+        with self._lock:
+            stats = self.endpoints.get((event.method, event.endpoint))
+            if stats is None:
+                stats = self.endpoints[(event.method, event.endpoint)] = EndpointStats(Histogram(self.precision))
+            stats.latency.record(event.duration)
+            stats.outcomes[event.outcome] = stats.outcomes.get(event.outcome, 0) + 1
+            stats.request_bytes += event.request_bytes
+            stats.response_bytes += event.response_bytes
+            stats.retries += event.retries
+            stats.retry_time += event.retry_time
+
+    @contextmanager
+    def span(self, name: str, attributes: Dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.operations.setdefault(name, Histogram(self.precision)).record(duration)
+
+    def on_rate_change(self, key: str, rate: float) -> None:
+        with self._lock:
+            self.rates[key] = rate
+
+    def percentile(self, method: str, endpoint: str, q: float) -> float:
+        stats = self.endpoints.get((method, endpoint))
+        return stats.latency.percentile(q) if stats else 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints.clear()
+            self.operations.clear()
+            self.rates.clear()
+
+    def report(self) -> str:
+        """A plain text table of the endpoint and operation latencies, in milliseconds."""
+        lines = [
+            f"{'endpoint':<90} {'calls':>6} {'errors':>6} {'p50':>8} {'p99':>8} {'sent':>9} {'received':>9} "
+            f"{'retries':>7}"
+        ]
+        with self._lock:
+            for (method, endpoint), stats in sorted(self.endpoints.items(), key=lambda item: item[0][1]):
+                histogram = stats.latency
+                lines.append(
+                    f"{method + ' ' + endpoint:<90} {histogram.count:>6} {stats.errors:>6} "
+                    f"{histogram.percentile(50) * 1000:>8.2f} {histogram.percentile(99) * 1000:>8.2f} "
+                    f"{stats.request_bytes:>9} {stats.response_bytes:>9} {stats.retries:>7}"
+                )
+            for name, histogram in sorted(self.operations.items()):
+                lines.append(
+                    f"{name:<90} {histogram.count:>6} {'':>6} "
+                    f"{histogram.percentile(50) * 1000:>8.2f} {histogram.percentile(99) * 1000:>8.2f}"
+                )
+            for key, rate in sorted(self.rates.items()):
+                lines.append(f"rate limit of {key}: {rate:.2f} requests/s")
+        return "\n".join(lines)
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Reports API calls as OpenTelemetry client spans and metrics, and operations as spans.
+
+    Needs the `opentelemetry` extra, i.e. the `opentelemetry-api` package; spans and metrics go
+    to the tracer and meter providers configured in the application, or to the given `tracer`
+    and `meter`.
+    The metrics are the `whylabs.api.duration` histogram (milliseconds) and the
+    `whylabs.api.request.size` and `whylabs.api.response.size` counters (bytes), the
+    `whylabs.api.retries` counter and the `whylabs.api.retry.time` counter (seconds),
+    with the method, endpoint and outcome as attributes, and the `whylabs.client.rate`
+    gauge with the current rate of the client-side rate limiters (requests/s).
+    """
+
+    def __init__(self, tracer: Optional[Any] = None, meter: Optional[Any] = None) -> None:
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryInstrumentation needs the opentelemetry-api package: "
+                'pip install "whylabs-toolkit[opentelemetry]"'
+            ) from e
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("whylabs_toolkit")
+        meter = meter or metrics.get_meter("whylabs_toolkit")
+        self._duration = meter.create_histogram(
+            "whylabs.api.duration", unit="ms", description="Duration of the WhyLabs API calls"
+        )
+        self._request_size = meter.create_counter(
+            "whylabs.api.request.size", unit="By", description="JSON bytes sent to WhyLabs"
+        )
+        self._response_size = meter.create_counter(
+            "whylabs.api.response.size", unit="By", description="JSON bytes received from WhyLabs"
+        )
+        self._retries = meter.create_counter("whylabs.api.retries", description="Retries of the WhyLabs API calls")
+        self._retry_time = meter.create_counter(
+            "whylabs.api.retry.time", unit="s", description="Time lost to failed attempts and retry waits"
+        )
+        self._rates: Dict[str, float] = {}
+        meter.create_observable_gauge(
+            "whylabs.client.rate",
+            callbacks=[self._observe_rates],
+            unit="{request}/s",
+            description="Current rate of the client-side rate limiters",
+        )
+
+    def _observe_rates(self, options: Any) -> Any:
+        from opentelemetry.metrics import Observation
+
+        return [Observation(rate, {"whylabs.rate_limiter": key}) for key, rate in list(self._rates.items())]
+
+    def on_rate_change(self, key: str, rate: float) -> None:
+        self._rates[key] = rate
+
+    @staticmethod
+    def _attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in attributes.items() if value is not None}
+
+    def on_api_call(self, event: ApiCallEvent) -> None:
+        metric_attributes = {
+            "http.request.method": event.method,
+            "http.route": event.endpoint,
+            "whylabs.outcome": event.outcome.value,
+        }
+        self._duration.record(event.duration * 1000, attributes=metric_attributes)
+        self._request_size.add(event.request_bytes, attributes=metric_attributes)
+        self._response_size.add(event.response_bytes, attributes=metric_attributes)
+        if event.retries:
+            self._retries.add(event.retries, attributes=metric_attributes)
+            self._retry_time.add(event.retry_time, attributes=metric_attributes)
+
+        start_ns = int(event.started_at * 1e9)
+        span = self._tracer.start_span(
+            f"{event.method} {event.endpoint}",
+            kind=self._trace.SpanKind.CLIENT,
+            start_time=start_ns,
+            attributes=self._attributes(
+                dict(
+                    metric_attributes,
+                    **{
+                        "http.response.status_code": event.status,
+                        "whylabs.org_id": event.org_id,
+                        "whylabs.dataset_id": event.dataset_id,
+                        "whylabs.request.size": event.request_bytes,
+                        "whylabs.response.size": event.response_bytes,
+                        "whylabs.retries": event.retries or None,
+                    },
+                )
+            ),
+        )
+        if event.outcome not in _SUCCESSES:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, event.error))
+        span.end(end_time=start_ns + int(event.duration * 1e9))
+
+    @contextmanager
+    def span(self, name: str, attributes: Dict[str, Any]) -> Iterator[None]:
+        with self._tracer.start_as_current_span(name, attributes=self._attributes(attributes)):
+            yield
+
+
+_instrumentation: Instrumentation = NoopInstrumentation()
+_current_operation: ContextVar[Optional[str]] = ContextVar("whylabs_toolkit_operation", default=None)
+_current_call: ContextVar[Optional[ApiCall]] = ContextVar("whylabs_toolkit_api_call", default=None)
+_observers: ContextVar[Tuple[Callable[[ApiCallEvent], None], ...]] = ContextVar("whylabs_toolkit_observers", default=())
+
+
+def set_instrumentation(instrumentation: Optional[Instrumentation]) -> None:
+    """Send the toolkit's API call events and spans to `instrumentation`, or stop with None."""
+    global _instrumentation
+    _instrumentation = instrumentation or NoopInstrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    return _instrumentation
+
+
+@contextmanager
+def operation(name: str, **attributes: Any) -> Iterator[None]:
+    """
+    Span around a high-level operation; the API calls made inside are tagged with its name.
+
+    Works as a context manager and as a decorator.
+    """
+    instrumentation = _instrumentation
+    token = _current_operation.set(name)
+    try:
+        if instrumentation.enabled:
+            with instrumentation.span(name, attributes):
+                yield
+        else:
+            yield
+    finally:
+        _current_operation.reset(token)
+
+
+def bind_context(func: Callable[..., T]) -> Callable[..., T]:
+    """Binds `func` to a copy of the current context, so a worker thread running it stays inside the current span."""
+    context = copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        return context.run(func, *args, **kwargs)
+
+    return run
+
+
+@contextmanager
+def observe_api_calls(callback: Callable[[ApiCallEvent], None]) -> Iterator[None]:
+    """
+    Calls `callback` with every API call made inside the block, whatever instrumentation is set.
+
+    Only calls made from the current context are seen, including worker threads running
+    functions bound with `bind_context`, so concurrent code elsewhere doesn't interfere.
+    """
+    token = _observers.set(_observers.get() + (callback,))
+    try:
+        yield
+    finally:
+        _observers.reset(token)
+
+
+def current_operation() -> Optional[str]:
+    return _current_operation.get()
+
+
+def current_api_call() -> Optional[ApiCall]:
+    """The call the running API request belongs to, when instrumentation is on."""
+    return _current_call.get()
+
+
+def record_request(call: Optional[ApiCall], body: Any) -> None:
+    """Notes the size of a request body, serialized as JSON unless it is bytes already, when it is measured."""
+    if call is not None and body is not None and get_instrumentation().measure_bytes:
+        call.request_bytes = len(body) if isinstance(body, bytes) else len(json.dumps(body))
+
+
+def record_response(
+    call: Optional[ApiCall], status: int, response_bytes: int, cached: bool = False, coalesced: bool = False
+) -> None:
+    """Notes how a call was answered: its status and size, and whether the cache or another call answered it."""
+    if call is None:
+        return
+    call.status, call.response_bytes = status, response_bytes
+    call.cached = call.cached or cached
+    call.coalesced = call.coalesced or coalesced
+
+
+def _outcome(call: ApiCall, error: Optional[BaseException]) -> CallOutcome:
+    status = getattr(error, "status", None) if error is not None else call.status
+    if error is not None and not isinstance(status, int):
+        return CallOutcome.error
+    if call.cached and error is None:
+        return CallOutcome.cached
+    if call.coalesced and error is None:
+        return CallOutcome.coalesced
+    if isinstance(status, int) and status >= 500:
+        return CallOutcome.server_error
+    if isinstance(status, int) and status >= 400:
+        return CallOutcome.client_error
+    return CallOutcome.ok
+
+
+@contextmanager
+def api_call(method: str, endpoint: str, path_params: Optional[Dict[str, Any]] = None) -> Iterator[Optional[ApiCall]]:
+    """Times the API call made inside and reports it to the current instrumentation and observers."""
+    instrumentation = _instrumentation
+    observers = _observers.get()
+    if not instrumentation.enabled and not observers:
+        yield None
+        return
+
+    call = ApiCall()
+    token = _current_call.set(call)
+    started_at = time.time()
+    start = time.perf_counter()
+    error: Optional[BaseException] = None
+    try:
+        yield call
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current_call.reset(token)
+        params = path_params or {}
+        event = ApiCallEvent(
+            method=method,
+            endpoint=endpoint,
+            org_id=params.get("org_id"),
+            dataset_id=params.get("dataset_id") or params.get("model_id"),
+            outcome=_outcome(call, error),
+            duration=duration,
+            started_at=started_at,
+            status=getattr(error, "status", None) if error is not None else call.status,
+            request_bytes=call.request_bytes,
+            response_bytes=call.response_bytes,
+            operation=_current_operation.get(),
+            error=f"{type(error).__name__}: {error}".splitlines()[0] if error is not None else None,
+            retries=call.retries,
+            retry_time=call.retry_time,
+        )
+        for record in (instrumentation.on_api_call,) + observers if instrumentation.enabled else observers:
+            try:
+                record(event)
+            except Exception as e:
+                logger.warning(f"Instrumentation failed to record {method} {endpoint}: {e}")
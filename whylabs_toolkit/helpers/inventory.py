@@ -0,0 +1,272 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Union
+
+from pydantic import ValidationError
+from urllib3.exceptions import HTTPError
+from whylabs_client import ApiClient
+from whylabs_client.api.models_api import ModelsApi
+from whylabs_client.api.monitor_api import MonitorApi
+from whylabs_client.exceptions import ApiException, NotFoundException
+
+from whylabs_toolkit.helpers.client import close_client, create_client
+from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.instrumentation import bind_context, operation
+from whylabs_toolkit.helpers.monitor_helpers import granularity_from_time_period
+from whylabs_toolkit.helpers.snapshot import DatasetSnapshot, SnapshotStore, SyncReport, is_unchanged
+from whylabs_toolkit.helpers.utils import get_models_api, get_monitor_api
+from whylabs_toolkit.monitor.models import Document, Granularity
+from whylabs_toolkit.monitor.models.column_schema import ColumnSchema
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DatasetInventory:
+    """
+    Everything fetched for one dataset. When any request failed, `error` is set and `document` may be None.
+
+    `model`, `monitor_config` and `entity_schema` hold the JSON bodies as WhyLabs returned them,
+    `monitor_config` and `entity_schema` are None when the dataset doesn't have one yet.
+    """
+
+    org_id: str
+    dataset_id: str
+    document: Optional[Document] = None
+    model: Optional[Dict[str, Any]] = None
+    monitor_config: Optional[Dict[str, Any]] = None
+    entity_schema: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _serialize(response: Any) -> Dict[str, Any]:
+    # Generated models use snake_case attributes; this gives back the camelCase JSON body
+    body: Dict[str, Any] = ApiClient.sanitize_for_serialization(response)
+    return body
+
+
+def _entity_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    known_fields = set(ColumnSchema.__fields__)
+    entity_schema: Dict[str, Any] = {
+        "columns": {
+            name: {key: value for key, value in column.items() if key in known_fields}
+            for name, column in (schema.get("columns") or {}).items()
+        }
+    }
+    if schema.get("metadata"):
+        entity_schema["metadata"] = schema["metadata"]
+    return entity_schema
+
+
+def list_models(
+    org_id: Optional[str] = None, models_api: Optional[ModelsApi] = None, config: Config = Config()
+) -> Dict[str, Dict[str, Any]]:
+    """The model metadata of every dataset of an organization, by dataset id, as `get_model` would return it."""
+    org_id = org_id or config.get_default_org_id()
+    models_api = models_api or get_models_api(config=config)
+    response = models_api.list_models(org_id=org_id)
+    return {model["id"]: _serialize(model) for model in response["items"]}
+
+
+def list_dataset_ids(
+    org_id: Optional[str] = None, models_api: Optional[ModelsApi] = None, config: Config = Config()
+) -> List[str]:
+    return list(list_models(org_id=org_id, models_api=models_api, config=config))
+
+
+@operation("fetch_dataset_inventory")
+def fetch_dataset_inventory(
+    org_id: str,
+    dataset_id: str,
+    include_schema: bool = True,
+    parse: bool = True,
+    models_api: Optional[ModelsApi] = None,
+    monitor_api: Optional[MonitorApi] = None,
+    config: Config = Config(),
+    model: Optional[Dict[str, Any]] = None,
+) -> DatasetInventory:
+    """
+    Fetch the model metadata, monitor config and entity schema of a dataset as one Document.
+
+    A dataset without a monitor config or schema yields an empty Document. Set `parse=False`
+    to only keep the JSON bodies. Any other failure is returned in `error` instead of being raised.
+    The model metadata isn't fetched again when it is given as `model`, e.g. from `list_models`.
+    """
+    models_api = models_api or get_models_api(config=config)
+    monitor_api = monitor_api or get_monitor_api(config=config)
+    inventory = DatasetInventory(org_id=org_id, dataset_id=dataset_id)
+    try:
+        inventory.model = (
+            model if model is not None else _serialize(models_api.get_model(org_id=org_id, model_id=dataset_id))
+        )
+        try:
+            inventory.monitor_config = dict(monitor_api.get_monitor_config_v3(org_id=org_id, dataset_id=dataset_id))
+        except NotFoundException:
+            logger.debug(f"{dataset_id} has no monitor config yet")
+        if include_schema:
+            try:
+                inventory.entity_schema = _serialize(models_api.get_entity_schema(org_id=org_id, dataset_id=dataset_id))
+            except NotFoundException:
+                logger.debug(f"{dataset_id} has no entity schema yet")
+        if parse:
+            inventory.document = to_document(inventory)
+    except (ApiException, HTTPError, ValidationError) as e:
+        logger.warning(f"Could not fetch the inventory of {dataset_id}: {e}")
+        inventory.error = e
+    return inventory
+
+
+def to_document(inventory: Union[DatasetInventory, DatasetSnapshot]) -> Document:
+    """Build the Document of a dataset from its fetched or snapshotted JSON bodies."""
+    if inventory.monitor_config is not None:
+        body = dict(inventory.monitor_config)
+    else:
+        granularity = granularity_from_time_period(str((inventory.model or {}).get("timePeriod", "")))
+        body = {
+            "orgId": inventory.org_id,
+            "datasetId": inventory.dataset_id,
+            "granularity": (granularity or Granularity.daily).value,
+            "analyzers": [],
+            "monitors": [],
+        }
+    if inventory.entity_schema is not None:
+        body["entitySchema"] = _entity_schema(inventory.entity_schema)
+    return Document.parse_obj(body)
+
+
+def iter_org_inventory(
+    org_id: Optional[str] = None,
+    dataset_ids: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    include_schema: bool = True,
+    parse: bool = True,
+    models_api: Optional[ModelsApi] = None,
+    monitor_api: Optional[MonitorApi] = None,
+    config: Config = Config(),
+    models: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Iterator[DatasetInventory]:
+    """
+    Fetch every dataset of an organization concurrently and yield each one as soon as it is ready.
+
+    At most `max_workers` datasets are fetched at a time, defaulting to the connection pool size,
+    so large organizations neither open unbounded connections nor queue up every result in memory.
+    Results come in completion order. A failing dataset is yielded with its `error` set and
+    doesn't stop the others. The model metadata of the org listing, or of `models` when given,
+    is used as it is instead of being fetched for each dataset.
+    """
+    org_id = org_id or config.get_default_org_id()
+    models_api = models_api or get_models_api(config=config)
+    monitor_api = monitor_api or get_monitor_api(config=config)
+    if dataset_ids is None:
+        models = list_models(org_id=org_id, models_api=models_api)
+        dataset_ids = list(models)
+    listed = models or {}
+    max_workers = max_workers or config.get_connection_pool_maxsize()
+
+    pending_ids = iter(dataset_ids)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="whylabs-inventory") as executor:
+        in_flight: Set["Future[DatasetInventory]"] = set()
+
+        def submit_next() -> None:
+            dataset_id = next(pending_ids, None)
+            if dataset_id is not None:
+                in_flight.add(
+                    executor.submit(
+                        bind_context(fetch_dataset_inventory),
+                        org_id=org_id,  # type: ignore
+                        dataset_id=dataset_id,
+                        include_schema=include_schema,
+                        parse=parse,
+                        models_api=models_api,
+                        monitor_api=monitor_api,
+                        model=listed.get(dataset_id),
+                    )
+                )
+
+        for _ in range(max_workers):
+            submit_next()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.remove(future)
+                submit_next()
+                yield future.result()
+
+
+@operation("sync_snapshot")
+def sync_snapshot(
+    store: SnapshotStore,
+    org_id: Optional[str] = None,
+    dataset_ids: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    config: Config = Config(),
+    stale_only: bool = False,
+) -> SyncReport:
+    """
+    Bring a local snapshot up to date with WhyLabs.
+
+    WhyLabs has no way to tell which datasets changed without reading them, so every synced
+    dataset is read again, its model metadata coming from the org listing, and only datasets
+    whose bodies changed are written to disk. With `stale_only`, only the datasets written to
+    through the toolkit since they were synced, and those missing from the snapshot, are read;
+    changes made elsewhere are then left for a full sync. When `dataset_ids` isn't given, every
+    dataset of the org is synced and datasets that no longer exist are removed from the snapshot.
+    A failing dataset keeps its old snapshot.
+    """
+    org_id = org_id or config.get_default_org_id()
+    report = SyncReport()
+    # A client of its own, so reads aren't answered by the snapshot being synced or the response cache
+    client = create_client(config=config)
+    models_api, monitor_api = ModelsApi(api_client=client), MonitorApi(api_client=client)
+    try:
+        synced_all = dataset_ids is None
+        models: Optional[Dict[str, Dict[str, Any]]] = None
+        if dataset_ids is None:
+            models = list_models(org_id=org_id, models_api=models_api)
+            dataset_ids = list(models)
+        fetched_ids = dataset_ids
+        if stale_only:
+            stale = set(store.stale_dataset_ids(org_id))
+            stored = set(store.dataset_ids(org_id))
+            fetched_ids = [dataset_id for dataset_id in dataset_ids if dataset_id in stale or dataset_id not in stored]
+            report.skipped = sorted(set(dataset_ids) - set(fetched_ids))
+
+        for inventory in iter_org_inventory(
+            org_id=org_id,
+            dataset_ids=fetched_ids,
+            max_workers=max_workers,
+            parse=False,
+            models_api=models_api,
+            monitor_api=monitor_api,
+            config=config,
+            models=models,
+        ):
+            if not inventory.ok:
+                report.failed[inventory.dataset_id] = str(inventory.error)
+                continue
+            snapshot = DatasetSnapshot(
+                org_id=org_id,
+                dataset_id=inventory.dataset_id,
+                model=inventory.model,
+                monitor_config=inventory.monitor_config,
+                entity_schema=inventory.entity_schema,
+            )
+            existing = store.get(org_id, inventory.dataset_id)
+            if existing is not None and not existing.stale and is_unchanged(existing, snapshot):
+                report.unchanged.append(inventory.dataset_id)
+            else:
+                store.put(snapshot)
+                report.updated.append(inventory.dataset_id)
+
+        if synced_all:
+            for dataset_id in set(store.dataset_ids(org_id)) - set(dataset_ids):
+                store.remove(org_id, dataset_id)
+                report.removed.append(dataset_id)
+    finally:
+        close_client(client)
+    return report
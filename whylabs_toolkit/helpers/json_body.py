@@ -0,0 +1,81 @@
+"""
+Request bodies serialized to JSON ahead of time.
+
+whylabs_client serializes every JSON body with `json.dumps` right before sending it. A body
+that is already JSON, such as `Analyzer.json_bytes()`, can be wrapped in `JsonBody` and passed
+to the generated API methods instead of a dict: the clients made by `create_client` send it as
+it is, over urllib3 and over HTTP/2.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import urllib3
+from whylabs_client.exceptions import (
+    ApiException,
+    ForbiddenException,
+    NotFoundException,
+    ServiceException,
+    UnauthorizedException,
+)
+from whylabs_client.rest import RESTClientObject, RESTResponse
+
+
+class JsonBody(bytes):
+    """UTF-8 encoded JSON, sent as the body of a request without serializing it again."""
+
+
+def _timeout(request_timeout: Optional[Any]) -> Optional[urllib3.Timeout]:
+    if isinstance(request_timeout, (int, float)) and request_timeout:
+        return urllib3.Timeout(total=request_timeout)
+    if isinstance(request_timeout, tuple) and len(request_timeout) == 2:
+        return urllib3.Timeout(connect=request_timeout[0], read=request_timeout[1])
+    return None
+
+
+class JsonBodyRESTClient(RESTClientObject):
+    """`whylabs_client.rest.RESTClientObject` that sends `JsonBody` bodies as they are."""
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        query_params: Optional[List[Tuple[str, Any]]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[Any] = None,
+        post_params: Optional[List[Tuple[str, Any]]] = None,
+        _preload_content: bool = True,
+        _request_timeout: Optional[Any] = None,
+    ) -> Any:
+        if not isinstance(body, JsonBody):
+            return super().request(
+                method, url, query_params, headers, body, post_params, _preload_content, _request_timeout
+            )
+        # What RESTClientObject.request does for JSON bodies, minus the json.dumps
+        headers = dict(headers or {})
+        headers.setdefault("Content-Type", "application/json")
+        if query_params:
+            url += "?" + urlencode(query_params)
+        try:
+            response = self.pool_manager.request(
+                method.upper(),
+                url,
+                body=bytes(body),
+                preload_content=_preload_content,
+                timeout=_timeout(_request_timeout),
+                headers=headers,
+            )
+        except urllib3.exceptions.SSLError as e:
+            raise ApiException(status=0, reason=f"{type(e).__name__}\n{e}")
+        if _preload_content:
+            response = RESTResponse(response)
+        if not 200 <= response.status <= 299:
+            if response.status == 401:
+                raise UnauthorizedException(http_resp=response)
+            if response.status == 403:
+                raise ForbiddenException(http_resp=response)
+            if response.status == 404:
+                raise NotFoundException(http_resp=response)
+            if 500 <= response.status <= 599:
+                raise ServiceException(http_resp=response)
+            raise ApiException(http_resp=response)
+        return response
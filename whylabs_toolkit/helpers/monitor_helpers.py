@@ -1,11 +1,13 @@
 import logging
-from typing import Any, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 from whylabs_client.exceptions import ApiValueError
 from whylabs_client.exceptions import NotFoundException, ForbiddenException
 
 from whylabs_toolkit.helpers.config import Config
 from whylabs_toolkit.helpers.utils import get_monitor_api, get_models_api
+from whylabs_toolkit.monitor.models import Analyzer, Monitor
+from whylabs_toolkit.monitor.models.streaming import parse_monitor_config_stream
 from whylabs_toolkit.utils.granularity import Granularity
 
 
@@ -27,6 +29,24 @@ def get_monitor_config(org_id: str, dataset_id: str, config: Config = Config())
         return None
 
 
+def stream_monitor_config(
+    org_id: str, dataset_id: str, trusted: bool = True, config: Config = Config()
+) -> Iterator[Union[Analyzer, Monitor]]:
+    """
+    Yields the analyzers and monitors of a dataset's monitor config while its response is read,
+    without holding the whole document in memory. Built without validation unless `trusted` is unset.
+    """
+    api = get_monitor_api(config=config)
+    response = api.get_monitor_config_v3(org_id=org_id, dataset_id=dataset_id, _preload_content=False)
+    try:
+        # Cached and HTTP/2 responses come read already
+        source = response if hasattr(response, "read") else [response.data]
+        yield from parse_monitor_config_stream(source, trusted=trusted)
+    finally:
+        if hasattr(response, "release_conn"):
+            response.release_conn()
+
+
 def get_monitor(
     monitor_id: str, org_id: Optional[str] = None, dataset_id: Optional[str] = None, config: Config = Config()
 ) -> Any:
@@ -44,19 +64,62 @@ def get_monitor(
         return None
 
 
+class MonitorConfigIndex:
+    """
+    Monitors and analyzers of a single monitor config document, indexed by id.
+
+    Fetching the document once and resolving everything from it replaces one
+    request per monitor and analyzer lookup.
+    """
+
+    def __init__(self, monitor_config: Optional[Any] = None) -> None:
+        self.document = monitor_config
+        self.monitors: Dict[str, Any] = {}
+        self.analyzers: Dict[str, Any] = {}
+        if monitor_config:
+            self.monitors = {item["id"]: item for item in monitor_config.get("monitors") or []}
+            self.analyzers = {item["id"]: item for item in monitor_config.get("analyzers") or []}
+
+    @classmethod
+    def fetch(cls, org_id: str, dataset_id: str, config: Config = Config()) -> "MonitorConfigIndex":
+        try:
+            return cls(get_monitor_config(org_id=org_id, dataset_id=dataset_id, config=config))
+        except ForbiddenException:
+            logger.warning(f"Could not read the monitor config for {org_id}, {dataset_id}")
+            return cls()
+
+    def get_monitor(self, monitor_id: str) -> Optional[Any]:
+        return self.monitors.get(monitor_id)
+
+    def get_analyzer(self, analyzer_id: str) -> Optional[Any]:
+        return self.analyzers.get(analyzer_id)
+
+    def get_analyzer_ids(self, monitor_id: str) -> Optional[List[str]]:
+        monitor = self.get_monitor(monitor_id)
+        return monitor["analyzerIds"] if monitor else None
+
+    def get_analyzers(self, monitor_id: str) -> Optional[List[Any]]:
+        analyzer_ids = self.get_analyzer_ids(monitor_id)
+        if not analyzer_ids:
+            return None
+        analyzers = []
+        for analyzer_id in analyzer_ids:
+            analyzer = self.get_analyzer(analyzer_id)
+            if analyzer is None:
+                logger.warning(f"Monitor {monitor_id} references analyzer {analyzer_id}, which does not exist")
+                continue
+            analyzers.append(analyzer)
+        return analyzers
+
+
 def get_analyzer_ids(
     monitor_id: str, org_id: Optional[str] = None, dataset_id: Optional[str] = None, config: Config = Config()
 ) -> Any:
     org_id = org_id or config.get_default_org_id()
     dataset_id = dataset_id or config.get_default_dataset_id()
     try:
-        monitor_config = get_monitor_config(org_id=org_id, dataset_id=dataset_id, config=config)
-
-        if monitor_config:
-            for item in monitor_config.get("monitors"):
-                if item["id"] == monitor_id:
-                    resp = item["analyzerIds"]
-                    return resp
+        index = MonitorConfigIndex(get_monitor_config(org_id=org_id, dataset_id=dataset_id, config=config))
+        return index.get_analyzer_ids(monitor_id)
     except ForbiddenException:
         logger.warning(f"Could not find analyzer IDs for {org_id}, {dataset_id}, {monitor_id}")
         return None
@@ -67,15 +130,24 @@ def get_analyzers(
 ) -> Optional[List[Any]]:
     org_id = org_id or config.get_default_org_id()
     dataset_id = dataset_id or config.get_default_dataset_id()
-    api = get_monitor_api(config=config)
-    analyzers = []
-    analyzer_ids = get_analyzer_ids(org_id=org_id, dataset_id=dataset_id, monitor_id=monitor_id, config=config)
-    if analyzer_ids:
-        for analyzer in analyzer_ids:
-            analyzers.append(api.get_analyzer(org_id=org_id, dataset_id=dataset_id, analyzer_id=analyzer))
-        return analyzers
-    else:
-        return None
+    index = MonitorConfigIndex.fetch(org_id=org_id, dataset_id=dataset_id, config=config)
+    return index.get_analyzers(monitor_id)
+
+
+TIME_PERIOD_TO_GRANULARITY = {
+    "H": Granularity.hourly,
+    "D": Granularity.daily,
+    "W": Granularity.weekly,
+    "M": Granularity.monthly,
+}
+
+
+def granularity_from_time_period(time_period: str) -> Optional[Granularity]:
+    """Maps a model time period, such as `P1D`, to the matching Granularity."""
+    for key, value in TIME_PERIOD_TO_GRANULARITY.items():
+        if key in time_period:
+            return value
+    return None
 
 
 def get_model_granularity(
@@ -87,16 +159,8 @@ def get_model_granularity(
     api = get_models_api(config=config)
     model_meta = api.get_model(org_id=org_id, model_id=dataset_id)
 
-    time_period_to_gran = {
-        "H": Granularity.hourly,
-        "D": Granularity.daily,
-        "W": Granularity.weekly,
-        "M": Granularity.monthly,
-    }
     if model_meta:
-        for key, value in time_period_to_gran.items():
-            if key in model_meta["time_period"]:
-                return value
+        return granularity_from_time_period(str(model_meta["time_period"]))
     return None
 
 
@@ -0,0 +1,282 @@
+"""
+Client-side rate limiting of the WhyLabs API calls.
+
+A RateLimiter is a token bucket whose rate adapts to the server (AIMD): every throttled
+answer (429 or 503) cuts the rate by `multiplicative_decrease`, every successful one adds
+back a little, so the rate grows by about `additive_increase` requests/s per second of
+successes until it reaches `max_rate`. Its state lives in a backend: in memory, shared by
+the threads of a process, or in a locked file, shared by the processes of a host.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Dict, Mapping, Optional, TypeVar, Union
+
+from .instrumentation import get_instrumentation
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+THROTTLE_STATUSES = (429, 503)
+
+State = Dict[str, Dict[str, float]]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header, given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _retry_after(status: Optional[int], headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    if status not in THROTTLE_STATUSES or not headers:
+        return None
+    return parse_retry_after(headers.get("Retry-After"))
+
+
+class MemoryBackend:
+    """Keeps the limiter state in memory, shared by the threads of the process."""
+
+    def __init__(self) -> None:
+        self._state: State = {}
+        self._lock = threading.Lock()
+
+    def update(self, func: Callable[[State], T]) -> T:
+        with self._lock:
+            return func(self._state)
+
+
+class FileBackend:
+    """
+    Keeps the limiter state in a small JSON file, shared by every process of the host using the same path.
+
+    Each update holds an exclusive `flock` on the file while it reads, changes and writes the state,
+    so it needs a POSIX system and a local file system.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        import fcntl  # noqa: F401, fails early on systems without flock
+
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def update(self, func: Callable[[State], T]) -> T:
+        import fcntl
+
+        with self._lock, open(self.path, "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            content = f.read()
+            try:
+                state: State = json.loads(content) if content else {}
+            except ValueError:
+                logger.warning(f"Resetting unreadable rate limiter state in {self.path}")
+                state = {}
+            before = json.dumps(state, sort_keys=True)
+            result = func(state)
+            after = json.dumps(state, sort_keys=True)
+            if after != before:
+                f.seek(0)
+                f.truncate()
+                f.write(after.encode("utf-8"))
+                f.flush()
+            return result
+
+
+Backend = Union[MemoryBackend, FileBackend]
+
+
+@dataclass
+class RateLimiterStats:
+    rate: float
+    acquired: int = 0
+    throttled: int = 0
+    # Seconds spent waiting for a token in this process
+    waited: float = 0.0
+
+
+class RateLimiter:
+    """
+    Adaptive token bucket, safe to share between threads and, with a FileBackend, processes.
+
+    Limiters sharing a backend and a `key` share one bucket. The bucket holds up to one
+    second worth of tokens at the current rate, or `burst` tokens when that is set.
+    After a throttled answer, the rate is cut at most once per `cooldown` seconds, and
+    nothing is sent before the `Retry-After` delay the server asked for.
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        min_rate: float = 0.5,
+        initial_rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        additive_increase: float = 1.0,
+        multiplicative_decrease: float = 0.5,
+        cooldown: float = 1.0,
+        backend: Optional[Backend] = None,
+        key: str = "default",
+    ) -> None:
+        if max_rate <= 0 or not 0 < min_rate <= max_rate:
+            raise ValueError("Rates must be positive, with min_rate <= max_rate")
+        if not 0 < multiplicative_decrease < 1:
+            raise ValueError("multiplicative_decrease must be between 0 and 1")
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.initial_rate = min(max(initial_rate or max_rate, min_rate), max_rate)
+        self.burst = burst
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.cooldown = cooldown
+        self.backend = backend or MemoryBackend()
+        self.key = key
+        self._stats = RateLimiterStats(rate=self.initial_rate)
+        self._stats_lock = threading.Lock()
+
+    def _bucket(self, state: State, now: float) -> Dict[str, float]:
+        bucket = state.get(self.key)
+        if bucket is None:
+            bucket = state[self.key] = {
+                "rate": self.initial_rate,
+                "tokens": self._capacity(self.initial_rate),
+                "updated": now,
+                "blocked_until": 0.0,
+                "decreased_at": 0.0,
+            }
+        # Refill for the time elapsed since the last update
+        elapsed = max(0.0, now - bucket["updated"])
+        bucket["tokens"] = min(self._capacity(bucket["rate"]), bucket["tokens"] + elapsed * bucket["rate"])
+        bucket["updated"] = now
+        return bucket
+
+    def _capacity(self, rate: float) -> float:
+        return self.burst if self.burst is not None else max(1.0, rate)
+
+    def _take(self, state: State) -> float:
+        now = time.time()
+        bucket = self._bucket(state, now)
+        if now < bucket["blocked_until"]:
+            return bucket["blocked_until"] - now
+        if bucket["tokens"] >= 1:
+            bucket["tokens"] -= 1
+            return 0.0
+        return (1 - bucket["tokens"]) / bucket["rate"]
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Waits for a token. Returns False, without taking one, when none comes within `timeout` seconds."""
+        start = time.monotonic()
+        while True:
+            wait = self.backend.update(self._take)
+            if wait <= 0:
+                with self._stats_lock:
+                    self._stats.acquired += 1
+                    self._stats.waited += time.monotonic() - start
+                return True
+            if timeout is not None and time.monotonic() - start + wait > timeout:
+                return False
+            time.sleep(wait)
+
+    async def _update_async(self, func: Callable[[State], T]) -> T:
+        if isinstance(self.backend, MemoryBackend):
+            return self.backend.update(func)
+        # Waiting for the file lock of another process would block the event loop
+        return await asyncio.get_running_loop().run_in_executor(None, self.backend.update, func)
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """Like `acquire`, for coroutines: waits for a token without blocking the event loop."""
+        start = time.monotonic()
+        while True:
+            wait = await self._update_async(self._take)
+            if wait <= 0:
+                with self._stats_lock:
+                    self._stats.acquired += 1
+                    self._stats.waited += time.monotonic() - start
+                return True
+            if timeout is not None and time.monotonic() - start + wait > timeout:
+                return False
+            await asyncio.sleep(wait)
+
+    def _report(self, rate: float) -> None:
+        with self._stats_lock:
+            changed = rate != self._stats.rate
+            self._stats.rate = rate
+        instrumentation = get_instrumentation()
+        if changed and instrumentation.enabled:
+            instrumentation.on_rate_change(self.key, rate)
+
+    def _adapt(self, status: Optional[int], retry_after: Optional[float]) -> Optional[Callable[[State], float]]:
+        if status in THROTTLE_STATUSES:
+            with self._stats_lock:
+                self._stats.throttled += 1
+            return lambda state: self._decrease(state, retry_after)
+        if status is not None and status < 500:
+            return self._increase
+        return None
+
+    def on_response(self, status: Optional[int], retry_after: Optional[float] = None) -> None:
+        """Adapts the rate to the status of an answer: down on 429 and 503, up on anything below 500."""
+        adapt = self._adapt(status, retry_after)
+        if adapt is not None:
+            self._report(self.backend.update(adapt))
+
+    def on_answer(self, status: Optional[int], headers: Optional[Mapping[str, str]] = None) -> None:
+        """`on_response` for an answer and its headers, honoring the `Retry-After` of a throttled one."""
+        self.on_response(status, _retry_after(status, headers))
+
+    async def on_answer_async(self, status: Optional[int], headers: Optional[Mapping[str, str]] = None) -> None:
+        """Like `on_answer`, for coroutines, without blocking the event loop."""
+        adapt = self._adapt(status, _retry_after(status, headers))
+        if adapt is not None:
+            self._report(await self._update_async(adapt))
+
+    def _decrease(self, state: State, retry_after: Optional[float]) -> float:
+        now = time.time()
+        bucket = self._bucket(state, now)
+        if retry_after:
+            bucket["blocked_until"] = max(bucket["blocked_until"], now + retry_after)
+        if now - bucket["decreased_at"] >= self.cooldown:
+            bucket["rate"] = max(self.min_rate, bucket["rate"] * self.multiplicative_decrease)
+            bucket["tokens"] = min(bucket["tokens"], self._capacity(bucket["rate"]))
+            bucket["decreased_at"] = now
+            logger.info(f"WhyLabs is throttling requests, slowing down to {bucket['rate']:.2f} requests/s")
+        return bucket["rate"]
+
+    def _increase(self, state: State) -> float:
+        bucket = self._bucket(state, time.time())
+        if bucket["rate"] < self.max_rate:
+            bucket["rate"] = min(self.max_rate, bucket["rate"] + self.additive_increase / bucket["rate"])
+        return bucket["rate"]
+
+    @property
+    def rate(self) -> float:
+        """The current rate in requests per second, shared with the other users of the backend."""
+        return self.backend.update(lambda state: self._bucket(state, time.time())["rate"])
+
+    def stats(self) -> RateLimiterStats:
+        rate = self.rate
+        with self._stats_lock:
+            return RateLimiterStats(
+                rate=rate, acquired=self._stats.acquired, throttled=self._stats.throttled, waited=self._stats.waited
+            )
+
+    def __repr__(self) -> str:
+        return f"RateLimiter(key={self.key!r}, max_rate={self.max_rate}, backend={type(self.backend).__name__})"
@@ -0,0 +1,145 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from whylabs_toolkit.helpers.inventory import DatasetInventory
+from whylabs_toolkit.monitor.models import Analyzer, ColumnMatrix, Document, EntitySchema
+from whylabs_toolkit.monitor.models.hashing import canonical_form, digest
+
+logger = logging.getLogger(__name__)
+
+_DATA_TYPE_GROUPS = {"bool": "group:bool", "integral": "group:int", "fractional": "group:frac", "string": "group:str"}
+
+
+@dataclass
+class DuplicateAnalyzers:
+    """Analyzers of a dataset with the same structural hash: any one of them does the work of all."""
+
+    org_id: str
+    dataset_id: str
+    structural_hash: str
+    analyzer_ids: List[str]
+
+
+@dataclass
+class OverlappingAnalyzers:
+    """Analyzers of a dataset configured alike but for their columns, that analyze `columns` more than once."""
+
+    org_id: str
+    dataset_id: str
+    analyzer_ids: List[str]
+    columns: List[str]
+
+
+@dataclass
+class RedundancyReport:
+    datasets: int = 0
+    analyzers: int = 0
+    duplicates: List[DuplicateAnalyzers] = field(default_factory=list)
+    overlaps: List[OverlappingAnalyzers] = field(default_factory=list)
+
+    @property
+    def redundant_analyzers(self) -> int:
+        """Analyzers that could be deleted without losing any analysis."""
+        return sum(len(duplicate.analyzer_ids) - 1 for duplicate in self.duplicates)
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.analyzers} analyzers in {self.datasets} datasets, {self.redundant_analyzers} duplicated, "
+            f"{len(self.overlaps)} overlapping groups"
+        ]
+        for duplicate in self.duplicates:
+            lines.append(f"= {duplicate.dataset_id}: {', '.join(duplicate.analyzer_ids)}")
+        for overlap in self.overlaps:
+            lines.append(f"~ {overlap.dataset_id}: {', '.join(overlap.analyzer_ids)} on {len(overlap.columns)} columns")
+        return "\n".join(lines)
+
+
+def _name(entry: Any) -> str:
+    return str(entry.value) if isinstance(entry, Enum) else str(entry)
+
+
+def _group_members(schema: Optional[EntitySchema]) -> Dict[str, Set[str]]:
+    """The columns `*` and every column group stand for in `schema`."""
+    members: Dict[str, Set[str]] = defaultdict(set)
+    for name, column in (schema.columns if schema is not None else {}).items():
+        members["*"].add(name)
+        members[f"group:{column.discreteness.value}"].add(name)
+        if column.classifier:
+            members[f"group:{column.classifier}"].add(name)
+        if column.dataType.value in _DATA_TYPE_GROUPS:
+            members[_DATA_TYPE_GROUPS[column.dataType.value]].add(name)
+    return members
+
+
+def _targeted_columns(matrix: ColumnMatrix, members: Dict[str, Set[str]]) -> Set[str]:
+    """The columns a matrix targets. Without a schema, `*` and groups are kept as they are written."""
+
+    def expand(entries: Iterable[Any]) -> Set[str]:
+        columns: Set[str] = set()
+        for entry in entries:
+            name = _name(entry)
+            columns |= members.get(name) or {name}
+        return columns
+
+    return expand(matrix.include_set()) - expand(matrix.exclude_set())
+
+
+def _dataset_redundancy(document: Document, report: RedundancyReport) -> None:
+    org_id, dataset_id = document.orgId, document.datasetId
+    by_hash: Dict[str, List[str]] = defaultdict(list)
+    # Analyzers that only differ in their columns, one per structural hash
+    by_work: Dict[str, Dict[str, Analyzer]] = defaultdict(dict)
+    for analyzer in document.analyzers or []:
+        form = canonical_form(analyzer)
+        structural_hash = digest(form)
+        by_hash[structural_hash].append(analyzer.id)
+        matrix = form.get("targetMatrix") or {}
+        if isinstance(analyzer.targetMatrix, ColumnMatrix) and len(by_hash[structural_hash]) == 1:
+            form["targetMatrix"] = {key: value for key, value in matrix.items() if key not in ("include", "exclude")}
+            by_work[digest(form)][structural_hash] = analyzer
+    report.datasets += 1
+    report.analyzers += len(document.analyzers or [])
+
+    for structural_hash, analyzer_ids in by_hash.items():
+        if len(analyzer_ids) > 1:
+            report.duplicates.append(DuplicateAnalyzers(org_id, dataset_id, structural_hash, analyzer_ids))
+
+    members: Optional[Dict[str, Set[str]]] = None
+    for alike in by_work.values():
+        if len(alike) < 2:
+            continue
+        members = members if members is not None else _group_members(document.entitySchema)
+        analyzers_by_column: Dict[str, List[str]] = defaultdict(list)
+        for analyzer in alike.values():
+            for column in _targeted_columns(analyzer.targetMatrix, members):  # type: ignore
+                analyzers_by_column[column].append(analyzer.id)
+        columns_by_analyzers: Dict[Tuple[str, ...], List[str]] = defaultdict(list)
+        for column, analyzer_ids in analyzers_by_column.items():
+            if len(analyzer_ids) > 1:
+                columns_by_analyzers[tuple(analyzer_ids)].append(column)
+        for ids, columns in columns_by_analyzers.items():
+            report.overlaps.append(OverlappingAnalyzers(org_id, dataset_id, list(ids), sorted(columns)))
+
+
+def find_redundant_analyzers(documents: Iterable[Union[Document, DatasetInventory]]) -> RedundancyReport:
+    """
+    Report the analyzers of an org that do the same work, dataset by dataset.
+
+    Analyzers with the same structural hash (see `whylabs_toolkit.monitor.models.hashing`) are
+    duplicates. Analyzers that would be duplicates but for their columns are reported with the
+    columns they have in common, `*` and column groups resolved with the dataset's entity schema;
+    duplicates are counted once there, by their first id. Takes a document or an inventory per
+    dataset, such as what `iter_org_inventory` yields, in time linear in the analyzers and columns.
+    """
+    report = RedundancyReport()
+    for item in documents:
+        if isinstance(item, DatasetInventory):
+            if not item.ok or item.document is None:
+                logger.warning(f"Skipping {item.dataset_id}, its inventory could not be fetched")
+                continue
+            item = item.document
+        _dataset_redundancy(item, report)
+    return report
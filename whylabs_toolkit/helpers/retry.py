@@ -0,0 +1,219 @@
+"""
+Retries of the WhyLabs API calls that failed for a transient reason.
+
+A Retrier resends a request after an exponential backoff with full jitter, or after the
+`Retry-After` delay the server asked for when that is longer. Only idempotent methods are
+retried after the server answered; any method is retried when the connection could not be
+opened, since the request never reached WhyLabs. No retry starts after the deadline of the
+policy, counted from the first attempt of each call, or after one set explicitly around a block
+with `deadline`.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, FrozenSet, Iterator, Optional, TypeVar
+
+from urllib3.exceptions import ConnectTimeoutError, HTTPError, MaxRetryError, NewConnectionError, SSLError
+from urllib3.util.retry import Retry
+from whylabs_client.exceptions import ApiException
+
+from .instrumentation import current_api_call
+from .rate_limit import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_deadline: ContextVar[Optional[float]] = ContextVar("whylabs_toolkit_deadline", default=None)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When and how long to wait before resending a failed request.
+
+    `backoff` is the base delay in seconds, doubled at every retry up to `max_backoff`
+    and jittered over [0, delay). `deadline` is in seconds from the first attempt of a call,
+    None for no deadline.
+    """
+
+    max_retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    deadline: Optional[float] = 120.0
+    methods: FrozenSet[str] = frozenset({"GET", "PUT", "DELETE"})
+    statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+    def is_retryable(self, method: str, error: BaseException) -> bool:
+        if isinstance(error, ApiException):
+            return method in self.methods and error.status in self.statuses
+        if isinstance(error, MaxRetryError) and error.reason is not None:
+            error = error.reason
+        if isinstance(error, (ConnectTimeoutError, NewConnectionError)):
+            return True
+        return method in self.methods and isinstance(error, HTTPError) and not isinstance(error, SSLError)
+
+    def delay(self, retry: int, retry_after: Optional[float] = None, rng: Optional[random.Random] = None) -> float:
+        """Seconds to wait before retry number `retry`, starting at 1."""
+        ceiling = min(self.max_backoff, self.backoff * 2 ** (retry - 1))
+        wait: float = ceiling * (rng or random).random()
+        return max(wait, retry_after) if retry_after is not None else wait
+
+
+def transport_retries() -> Retry:
+    """The urllib3 retry configuration of a client using a Retrier: redirects only, every failure is surfaced."""
+    return Retry(total=None, connect=0, read=0, other=0, status=0, respect_retry_after_header=False)
+
+
+@dataclass
+class RetryStats:
+    retries: int = 0
+    # Calls that succeeded after at least one retry, and calls that failed after retrying
+    recovered: int = 0
+    exhausted: int = 0
+    # Seconds spent in failed attempts and waiting between attempts
+    time_lost: float = 0.0
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    No retry starts later than `seconds` from now inside the block.
+    Nested deadlines keep the earliest one.
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(error, "headers", None)
+    return parse_retry_after(headers.get("Retry-After")) if headers else None
+
+
+def _describe(error: BaseException) -> str:
+    if isinstance(error, ApiException):
+        return f"{error.status} {error.reason}"
+    if isinstance(error, MaxRetryError) and error.reason is not None:
+        error = error.reason
+    return type(error).__name__
+
+
+class Retrier:
+    """Runs requests under a RetryPolicy and keeps the RetryStats, safe to share between threads."""
+
+    def __init__(self, policy: RetryPolicy = RetryPolicy(), seed: Optional[int] = None) -> None:
+        self.policy = policy
+        self._random = random.Random(seed)
+        self._stats = RetryStats()
+        self._lock = threading.Lock()
+
+    def _deadline_at(self, start: float) -> Optional[float]:
+        candidates = []
+        if self.policy.deadline is not None:
+            candidates.append(start + self.policy.deadline)
+        explicit = _deadline.get()
+        if explicit is not None:
+            candidates.append(explicit)
+        return min(candidates) if candidates else None
+
+    def call(self, method: str, path: str, send: Callable[[], T]) -> T:
+        """Calls `send` until it succeeds, fails for good or runs out of retries or time."""
+        start = time.monotonic()
+        retries = 0
+        while True:
+            attempt_start = time.monotonic()
+            try:
+                result = send()
+            except Exception as e:
+                wait = self._next_wait(method, path, e, retries, start, attempt_start)
+                retries += 1
+                time.sleep(wait)
+                continue
+            self._succeeded(method, path, retries, attempt_start - start)
+            return result
+
+    async def call_async(self, method: str, path: str, send: Callable[[], Awaitable[T]]) -> T:
+        """Like `call`, for coroutines: awaits `send` and waits between attempts without blocking the event loop."""
+        start = time.monotonic()
+        retries = 0
+        while True:
+            attempt_start = time.monotonic()
+            try:
+                result = await send()
+            except Exception as e:
+                wait = self._next_wait(method, path, e, retries, start, attempt_start)
+                retries += 1
+                await asyncio.sleep(wait)
+                continue
+            self._succeeded(method, path, retries, attempt_start - start)
+            return result
+
+    def _next_wait(
+        self, method: str, path: str, error: Exception, retries: int, start: float, attempt_start: float
+    ) -> float:
+        """Seconds to wait before retrying after `error`. Raises it again when it can't be retried."""
+        policy = self.policy
+        now = time.monotonic()
+        if not policy.is_retryable(method, error):
+            self._record(retries, attempt_start - start, recovered=False)
+            raise error
+        if retries >= policy.max_retries:
+            logger.warning(f"{method} {path} failed with {_describe(error)} after {retries} retries")
+            self._record(retries, now - start, recovered=False)
+            raise error
+        with self._lock:
+            wait = policy.delay(retries + 1, _retry_after(error), self._random)
+        deadline_at = self._deadline_at(start)
+        if deadline_at is not None and now + wait > deadline_at:
+            logger.warning(
+                f"{method} {path} failed with {_describe(error)}, not retrying: the operation deadline is "
+                f"{max(0.0, deadline_at - now):.2f} s away and the next retry is due in {wait:.2f} s"
+            )
+            self._record(retries, now - start, recovered=False)
+            raise error
+        logger.warning(
+            f"{method} {path} failed with {_describe(error)}, retrying in {wait:.2f} s "
+            f"(retry {retries + 1} of {policy.max_retries})"
+        )
+        return wait
+
+    def _succeeded(self, method: str, path: str, retries: int, time_lost: float) -> None:
+        self._record(retries, time_lost, recovered=True)
+        if retries:
+            logger.info(f"{method} {path} succeeded after {retries} retries, {time_lost:.2f} s lost")
+
+    def _record(self, retries: int, time_lost: float, recovered: bool) -> None:
+        if not retries:
+            return
+        call = current_api_call()
+        if call is not None:
+            call.retries, call.retry_time = retries, time_lost
+        with self._lock:
+            self._stats.retries += retries
+            self._stats.time_lost += time_lost
+            if recovered:
+                self._stats.recovered += 1
+            else:
+                self._stats.exhausted += 1
+
+    def stats(self) -> RetryStats:
+        with self._lock:
+            return RetryStats(
+                retries=self._stats.retries,
+                recovered=self._stats.recovered,
+                exhausted=self._stats.exhausted,
+                time_lost=self._stats.time_lost,
+            )
+
+    def __repr__(self) -> str:
+        return f"Retrier({self.policy})"
@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional
 from whylabs_client.models import EntitySchema
 
 from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.instrumentation import operation
 from whylabs_toolkit.helpers.utils import get_models_api
 from whylabs_toolkit.monitor.models.column_schema import ColumnDataType
 
@@ -25,8 +26,8 @@ class ColumnsDiscreteness:
 
 class UpdateEntity(ABC):
     def __init__(self, dataset_id: Optional[str] = None, org_id: Optional[str] = None, config: Config = Config()):
-        self.dataset_id = dataset_id or Config().get_default_dataset_id()
-        self.org_id = org_id or Config().get_default_org_id()
+        self.dataset_id = dataset_id or config.get_default_dataset_id()
+        self.org_id = org_id or config.get_default_org_id()
         self.api = get_models_api(config=config)
 
     def _get_entity_schema(self) -> Any:
@@ -54,15 +55,22 @@ class UpdateEntity(ABC):
         self._put_entity_schema(schema=entity_schema_dict)
 
     def update(self) -> None:
-        self._validate_input()
-        self._get_current_entity_schema()
-        self._update_entity_schema()
-        self._put_updated_entity_schema()
+        with operation(f"{type(self).__name__}.update", org_id=self.org_id, dataset_id=self.dataset_id):
+            self._validate_input()
+            self._get_current_entity_schema()
+            self._update_entity_schema()
+            self._put_updated_entity_schema()
 
 
 class UpdateColumnClassifiers(UpdateEntity):
-    def __init__(self, classifiers: ColumnsClassifiers, org_id: Optional[str] = None, dataset_id: Optional[str] = None):
-        super().__init__(dataset_id, org_id)
+    def __init__(
+        self,
+        classifiers: ColumnsClassifiers,
+        org_id: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        config: Config = Config(),
+    ):
+        super().__init__(dataset_id, org_id, config)
         self.classifiers = classifiers
 
     def _validate_input(self) -> None:
@@ -110,9 +118,13 @@ class UpdateEntityDataTypes(UpdateEntity):
     """
 
     def __init__(
-        self, columns_schema: Dict[str, ColumnDataType], org_id: Optional[str] = None, dataset_id: Optional[str] = None
+        self,
+        columns_schema: Dict[str, ColumnDataType],
+        org_id: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        config: Config = Config(),
     ):
-        super().__init__(dataset_id, org_id)
+        super().__init__(dataset_id, org_id, config)
         self.columns_schema = columns_schema
 
     def _validate_input(self) -> None:
@@ -134,8 +146,9 @@ class UpdateColumnsDiscreteness(UpdateEntity):
         columns: ColumnsDiscreteness,
         org_id: Optional[str] = None,
         dataset_id: Optional[str] = None,
+        config: Config = Config(),
     ):
-        super().__init__(dataset_id, org_id)
+        super().__init__(dataset_id, org_id, config)
         self.columns = columns
 
     def _validate_input(self) -> None:
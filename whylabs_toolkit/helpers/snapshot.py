@@ -0,0 +1,235 @@
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Tuple, Union
+from urllib.parse import quote, unquote
+
+from .cache import CachedResponse, CacheStats, ResponseCache
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Read-only endpoints a snapshot can answer, with the body that answers them
+_SNAPSHOT_PATHS: List[Tuple[Pattern[str], str]] = [
+    (re.compile(r"^/v0/organizations/([^/]+)/models/([^/]+)$"), "model"),
+    (re.compile(r"^/v0/organizations/([^/]+)/models/([^/]+)/schema$"), "entity_schema"),
+    (re.compile(r"^/v0/organizations/([^/]+)/models/([^/]+)/monitor-config/v3$"), "monitor_config"),
+]
+_DATASET_SCOPE = re.compile(r"^/v0/organizations/([^/]+)/models/([^/]+)")
+
+
+@dataclass
+class DatasetSnapshot:
+    """
+    The JSON bodies of a dataset as WhyLabs returned them when it was last synced.
+
+    `stale` is set when the dataset was written to through the toolkit since: its bodies
+    are kept for the next sync but no longer answer reads.
+    """
+
+    org_id: str
+    dataset_id: str
+    model: Optional[Dict[str, Any]] = None
+    monitor_config: Optional[Dict[str, Any]] = None
+    entity_schema: Optional[Dict[str, Any]] = None
+    synced_at: float = field(default_factory=time.time)
+    stale: bool = False
+
+
+@dataclass
+class SyncReport:
+    updated: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    # Datasets a `stale_only` sync didn't read
+    skipped: List[str] = field(default_factory=list)
+
+
+def _version(body: Optional[Dict[str, Any]]) -> Optional[Tuple[Any, Any]]:
+    metadata = (body or {}).get("metadata") or {}
+    if metadata.get("version") is None or metadata.get("updatedTimestamp") is None:
+        return None
+    return metadata["version"], metadata["updatedTimestamp"]
+
+
+def _same_body(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> bool:
+    before_version, after_version = _version(before), _version(after)
+    if before_version is not None and after_version is not None:
+        return before_version == after_version
+    return before == after
+
+
+def is_unchanged(before: DatasetSnapshot, after: DatasetSnapshot) -> bool:
+    """
+    Whether a fresh fetch matches what is stored.
+
+    Monitor configs and schemas that carry WhyLabs metadata are compared on
+    `version` and `updatedTimestamp`, anything else on its content.
+    """
+    return (
+        before.model == after.model
+        and _same_body(before.monitor_config, after.monitor_config)
+        and _same_body(before.entity_schema, after.entity_schema)
+    )
+
+
+class SnapshotStore:
+    """
+    On-disk snapshot of model metadata, monitor configs and entity schemas.
+
+    Every dataset is kept in its own gzip-compressed JSON file under `<path>/<org_id>/`,
+    so a sync only rewrites the datasets that changed and a reader only loads the
+    datasets it asks for. Files are replaced atomically and loaded files are kept in memory.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path).expanduser()
+        self._loaded: Dict[Tuple[str, str], Optional[DatasetSnapshot]] = {}
+        self._lock = threading.Lock()
+
+    def _file(self, org_id: str, dataset_id: str) -> Path:
+        return self.path / quote(org_id, safe="") / f"{quote(dataset_id, safe='')}.json.gz"
+
+    def _read(self, org_id: str, dataset_id: str) -> Optional[DatasetSnapshot]:
+        try:
+            with gzip.open(self._file(org_id, dataset_id), "rt", encoding="utf-8") as f:
+                content = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot of {dataset_id}: {e}")
+            return None
+        if content.pop("format_version", None) != SNAPSHOT_FORMAT_VERSION:
+            return None
+        return DatasetSnapshot(**content)
+
+    def get(self, org_id: str, dataset_id: str) -> Optional[DatasetSnapshot]:
+        key = (org_id, dataset_id)
+        with self._lock:
+            if key not in self._loaded:
+                self._loaded[key] = self._read(org_id, dataset_id)
+            return self._loaded[key]
+
+    def put(self, snapshot: DatasetSnapshot) -> None:
+        target = self._file(snapshot.org_id, snapshot.dataset_id)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        content = dict(asdict(snapshot), format_version=SNAPSHOT_FORMAT_VERSION)
+        data = gzip.compress(json.dumps(content, separators=(",", ":")).encode("utf-8"))
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, target)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        with self._lock:
+            self._loaded[(snapshot.org_id, snapshot.dataset_id)] = snapshot
+
+    def remove(self, org_id: str, dataset_id: str) -> None:
+        with self._lock:
+            self._loaded[(org_id, dataset_id)] = None
+        try:
+            self._file(org_id, dataset_id).unlink()
+        except FileNotFoundError:
+            pass
+
+    def dataset_ids(self, org_id: str) -> List[str]:
+        org_dir = self.path / quote(org_id, safe="")
+        if not org_dir.is_dir():
+            return []
+        return sorted(unquote(file.name[: -len(".json.gz")]) for file in org_dir.glob("*.json.gz"))
+
+    def org_ids(self) -> List[str]:
+        if not self.path.is_dir():
+            return []
+        return sorted(unquote(org_dir.name) for org_dir in self.path.iterdir() if org_dir.is_dir())
+
+    def mark_stale(self, org_id: str, dataset_id: str) -> None:
+        snapshot = self.get(org_id, dataset_id)
+        if snapshot is not None and not snapshot.stale:
+            self.put(replace(snapshot, stale=True))
+
+    def stale_dataset_ids(self, org_id: str) -> List[str]:
+        snapshots = (self.get(org_id, dataset_id) for dataset_id in self.dataset_ids(org_id))
+        return [snapshot.dataset_id for snapshot in snapshots if snapshot is not None and snapshot.stale]
+
+    def invalidate(self, scope: str) -> None:
+        """
+        Mark stale the dataset a write to `scope` may have changed.
+
+        Only writes under a dataset path change its model, schema or monitor config,
+        so organization-wide writes leave the snapshot alone.
+        """
+        match = _DATASET_SCOPE.match(scope)
+        if match:
+            self.mark_stale(unquote(match.group(1)), unquote(match.group(2)))
+
+
+class SnapshotCache(ResponseCache):
+    """
+    ResponseCache that answers model, schema and monitor config reads from a SnapshotStore.
+
+    Reads the snapshot can't answer go to `fallback`, and writes mark the affected
+    datasets stale so they are read from WhyLabs until the next sync.
+    """
+
+    def __init__(self, store: SnapshotStore, fallback: Optional[ResponseCache] = None) -> None:
+        self.store = store
+        self.fallback = fallback
+        self._hits = 0
+        self._lock = threading.Lock()
+
+    def _from_snapshot(self, key: str) -> Optional[CachedResponse]:
+        path, _, query = key.partition("?")
+        if query:
+            return None
+        for pattern, attribute in _SNAPSHOT_PATHS:
+            match = pattern.match(path)
+            if match:
+                snapshot = self.store.get(unquote(match.group(1)), unquote(match.group(2)))
+                body = getattr(snapshot, attribute) if snapshot and not snapshot.stale else None
+                if body is None:
+                    return None
+                return CachedResponse(
+                    status=200,
+                    reason="OK",
+                    data=json.dumps(body).encode("utf-8"),
+                    headers={"Content-Type": "application/json"},
+                )
+        return None
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        response = self._from_snapshot(key)
+        if response is not None:
+            with self._lock:
+                self._hits += 1
+            return response
+        return self.fallback.get(key) if self.fallback else None
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        if self.fallback:
+            self.fallback.set(key, response)
+
+    def invalidate(self, scope: str) -> None:
+        self.store.invalidate(scope)
+        if self.fallback:
+            self.fallback.invalidate(scope)
+
+    def clear(self) -> None:
+        if self.fallback:
+            self.fallback.clear()
+
+    def stats(self) -> CacheStats:
+        stats = self.fallback.stats() if self.fallback else CacheStats()
+        stats.hits += self._hits
+        return stats
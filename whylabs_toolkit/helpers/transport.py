@@ -0,0 +1,223 @@
+"""
+An HTTP/2 transport for whylabs_client, built on httpx.
+
+Http2RESTClient takes the place of the urllib3-based `RESTClientObject` of an ApiClient:
+it has the same `request` signature, returns responses with the same attributes and raises
+the same ApiException subclasses, so the generated API objects work unchanged. Concurrent
+requests are multiplexed as streams over a few HTTP/2 connections instead of needing one
+pooled HTTP/1.1 connection each. Needs the `http2` extra: pip install "whylabs-toolkit[http2]".
+
+httpx's blocking client doesn't guard its HTTP/2 connection state against concurrent
+threads, so the connections are owned by an asyncio client running on a thread of their
+own, and the calling threads wait for their responses.
+"""
+import asyncio
+import json
+import logging
+import re
+import ssl
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from urllib3._collections import HTTPHeaderDict
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError, ProtocolError, ReadTimeoutError
+from whylabs_client import Configuration
+from whylabs_client.exceptions import (
+    ApiException,
+    ApiValueError,
+    ForbiddenException,
+    NotFoundException,
+    ServiceException,
+    UnauthorizedException,
+)
+from whylabs_client.rest import RESTClientObject
+
+from .cache import CachedResponse
+from .compression import GZIP_LEVEL, gzip_body
+from .json_body import JsonBody
+
+logger = logging.getLogger(__name__)
+
+
+def _timeout(httpx: Any, request_timeout: Optional[Any]) -> Any:
+    if isinstance(request_timeout, (int, float)) and request_timeout:
+        return httpx.Timeout(request_timeout)
+    if isinstance(request_timeout, tuple) and len(request_timeout) == 2:
+        return httpx.Timeout(None, connect=request_timeout[0], read=request_timeout[1])
+    return httpx.Timeout(None)
+
+
+def create_httpx_client(httpx: Any, configuration: Configuration, max_connections: int, http2: bool = True) -> Any:
+    """
+    An httpx.AsyncClient for the host of `configuration`, with its TLS settings and proxy, pooling up to
+    `max_connections` connections. With `http2`, `https` hosts negotiate HTTP/2 with ALPN and fall back
+    to HTTP/1.1, and plain `http` hosts are spoken to in HTTP/2 directly (prior knowledge).
+    """
+    # httpx logs every request at INFO, which the toolkit's logging setup would print
+    httpx_logger = logging.getLogger("httpx")
+    if httpx_logger.level == logging.NOTSET:
+        httpx_logger.setLevel(logging.WARNING)
+    verify: Any = False
+    if configuration.verify_ssl:
+        verify = ssl.create_default_context(cafile=configuration.ssl_ca_cert)
+        if configuration.cert_file:
+            verify.load_cert_chain(configuration.cert_file, configuration.key_file)
+    secure = urlsplit(configuration.host or "").scheme == "https"
+    return httpx.AsyncClient(
+        http1=secure or not http2,
+        http2=http2,
+        verify=verify,
+        proxy=configuration.proxy,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=httpx.Timeout(None),
+    )
+
+
+@contextmanager
+def transport_errors(httpx: Any, url: str) -> Iterator[None]:
+    """Raises the httpx transport failures inside as the urllib3 exceptions the default client raises."""
+    try:
+        yield
+    except httpx.ConnectTimeout as e:
+        raise ConnectTimeoutError(str(e)) from e
+    except httpx.ConnectError as e:
+        raise NewConnectionError(None, str(e)) from e  # type: ignore
+    except httpx.TimeoutException as e:
+        raise ReadTimeoutError(None, url, str(e)) from e  # type: ignore
+    except httpx.TransportError as e:
+        raise ProtocolError(f"{type(e).__name__}: {e}") from e
+
+
+def cached_response(response: Any) -> CachedResponse:
+    """An httpx response, read already, as the urllib3-like response whylabs_client expects."""
+    return CachedResponse(
+        status=response.status_code,
+        reason=response.reason_phrase,
+        data=response.content,
+        headers=HTTPHeaderDict(response.headers.multi_items()),
+    )
+
+
+def raise_for_status(response: CachedResponse) -> None:
+    """Raises the ApiException subclass whylabs_client raises for a response outside of 2xx."""
+    if 200 <= response.status <= 299:
+        return
+    if response.status == 401:
+        raise UnauthorizedException(http_resp=response)
+    if response.status == 403:
+        raise ForbiddenException(http_resp=response)
+    if response.status == 404:
+        raise NotFoundException(http_resp=response)
+    if 500 <= response.status <= 599:
+        raise ServiceException(http_resp=response)
+    raise ApiException(http_resp=response)
+
+
+class Http2RESTClient(RESTClientObject):
+    """
+    Drop-in replacement of `whylabs_client.rest.RESTClientObject` sending requests over HTTP/2.
+
+    Up to `max_connections` connections are opened per host, each carrying as many concurrent
+    streams as the server allows. `https` hosts negotiate HTTP/2 with ALPN and fall back to
+    HTTP/1.1; plain `http` hosts are spoken to in HTTP/2 directly (prior knowledge).
+    Transport failures are raised as the urllib3 exceptions the default client raises.
+    """
+
+    def __init__(
+        self,
+        configuration: Configuration,
+        max_connections: int = 4,
+        gzip_min_bytes: Optional[int] = None,
+        gzip_level: int = GZIP_LEVEL,
+    ) -> None:
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                'The HTTP/2 transport needs httpx with HTTP/2 support: pip install "whylabs-toolkit[http2]"'
+            ) from e
+        self._httpx = httpx
+        self.gzip_min_bytes = gzip_min_bytes
+        self.gzip_level = gzip_level
+        self.client = create_httpx_client(httpx, configuration, max_connections=max_connections)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="whylabs-http2", daemon=True)
+        self._thread.start()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        query_params: Optional[List[Tuple[str, Any]]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[Any] = None,
+        post_params: Optional[List[Tuple[str, Any]]] = None,
+        _preload_content: bool = True,
+        _request_timeout: Optional[Any] = None,
+    ) -> CachedResponse:
+        method = method.upper()
+        if post_params and body:
+            raise ApiValueError("body parameter cannot be used with post_params parameter.")
+        headers = dict(headers or {})
+        content: Optional[Any] = None
+        data: Optional[Dict[str, Any]] = None
+        files: Optional[List[Tuple[str, Any]]] = None
+
+        if query_params:
+            # Encoded like urllib3 does, e.g. True as "True"
+            url += "?" + urlencode(query_params)
+        if method in ("POST", "PUT", "PATCH", "OPTIONS", "DELETE"):
+            if method != "DELETE" and "Content-Type" not in headers:
+                headers["Content-Type"] = "application/json"
+            content_type = headers.get("Content-Type", "")
+            if not content_type or re.search("json", content_type, re.IGNORECASE):
+                if isinstance(body, JsonBody):
+                    content = bytes(body)
+                else:
+                    content = json.dumps(body) if body is not None else None
+            elif content_type == "application/x-www-form-urlencoded":
+                content = urlencode(post_params or [])
+            elif content_type == "multipart/form-data":
+                # httpx sets the multipart boundary itself
+                del headers["Content-Type"]
+                params = post_params or []
+                files = [(name, value) for name, value in params if isinstance(value, tuple)]
+                data = {name: value for name, value in params if not isinstance(value, tuple)}
+            elif isinstance(body, (str, bytes)):
+                content = body
+            else:
+                raise ApiException(
+                    status=0,
+                    reason="Cannot prepare a request message for provided arguments. "
+                    "Please check that your arguments match declared content type.",
+                )
+            if content is not None and self.gzip_min_bytes is not None:
+                content, headers = gzip_body(content, headers, self.gzip_min_bytes, self.gzip_level)  # type: ignore
+
+        with transport_errors(self._httpx, url):
+            sent = self.client.request(
+                method,
+                url,
+                headers=headers,
+                content=content,
+                data=data,
+                files=files,
+                timeout=_timeout(self._httpx, _request_timeout),
+            )
+            response = asyncio.run_coroutine_threadsafe(sent, self._loop).result()
+
+        result = cached_response(response)
+        logger.debug(f"response body: {result.data!r}")
+        raise_for_status(result)
+        return result
+
+    def close(self) -> None:
+        """Closes the connections and stops their thread. The client can't be used afterwards."""
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -1,7 +1,23 @@
-from .manager import MonitorSetup, MonitorManager
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
+if TYPE_CHECKING:
+    from .manager import MonitorSetup, MonitorManager, BatchMonitorManager
 
-ALL = [
-    MonitorManager,
-    MonitorSetup,
-]
+__all__ = ["MonitorManager", "MonitorSetup", "BatchMonitorManager"]
+
+
+def __getattr__(name: str) -> Any:
+    # The manager pulls in whylabs_client, jsonschema and the pydantic models, so it is only imported on first use
+    if name == "ALL":
+        value: Any = [__getattr__(item) for item in __all__]
+    elif name in __all__:
+        value = getattr(importlib.import_module(".manager", __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
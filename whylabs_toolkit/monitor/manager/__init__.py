@@ -1,5 +1,54 @@
-from .manager import MonitorManager
-from .credentials import MonitorCredentials
-from .monitor_setup import MonitorSetup
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-ALL = [MonitorManager, MonitorCredentials, MonitorSetup]
+if TYPE_CHECKING:
+    from .manager import MonitorManager
+    from .batch import BatchMonitorManager, MonitorOutcome, OutcomeStatus
+    from .credentials import MonitorCredentials
+    from .diff import ChangeType, DocumentDiff, EntityChange, apply_plan, diff_documents, plan_document
+    from .monitor_setup import MonitorSetup
+    from .validation import build_documents, validate_document, validate_setups
+
+# Imported on first use, so that importing the package doesn't load whylabs_client, jsonschema and every model
+_LAZY_MODULES = {
+    ".manager": ["MonitorManager"],
+    ".batch": ["BatchMonitorManager", "MonitorOutcome", "OutcomeStatus"],
+    ".credentials": ["MonitorCredentials"],
+    ".diff": ["ChangeType", "DocumentDiff", "EntityChange", "apply_plan", "diff_documents", "plan_document"],
+    ".monitor_setup": ["MonitorSetup"],
+    ".validation": ["build_documents", "validate_document", "validate_setups"],
+}
+_LAZY_NAMES = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+__all__ = [
+    "MonitorManager",
+    "MonitorCredentials",
+    "MonitorSetup",
+    "BatchMonitorManager",
+    "MonitorOutcome",
+    "OutcomeStatus",
+    "ChangeType",
+    "DocumentDiff",
+    "EntityChange",
+    "apply_plan",
+    "diff_documents",
+    "plan_document",
+    "build_documents",
+    "validate_document",
+    "validate_setups",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "ALL":
+        value: Any = [__getattr__(item) for item in __all__]
+    elif name in _LAZY_NAMES:
+        value = getattr(importlib.import_module(_LAZY_NAMES[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,204 @@
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from whylabs_client.api.monitor_api import MonitorApi
+from whylabs_client.api.notification_settings_api import NotificationSettingsApi
+from whylabs_client.exceptions import ApiException
+from urllib3.exceptions import HTTPError
+
+from whylabs_toolkit.helpers.client import ToolkitApiClient
+from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.instrumentation import operation
+from whylabs_toolkit.helpers.monitor_helpers import get_model_granularity
+from whylabs_toolkit.helpers.json_body import JsonBody
+from whylabs_toolkit.helpers.utils import get_monitor_api, get_notification_api
+from whylabs_toolkit.monitor.manager.manager import MonitorManager
+from whylabs_toolkit.monitor.manager.diff import DocumentDiff, diff_documents, get_current_document
+from whylabs_toolkit.monitor.manager.monitor_setup import MonitorSetup
+from whylabs_toolkit.monitor.manager.validation import build_documents, validate_setups
+from whylabs_toolkit.monitor.models import *
+
+logger = logging.getLogger(__name__)
+
+
+class OutcomeStatus(str, Enum):
+    """What happened to a monitor in a batch save."""
+
+    created = "created"
+    updated = "updated"
+    unchanged = "unchanged"
+    invalid = "invalid"
+    failed = "failed"
+
+
+@dataclass
+class MonitorOutcome:
+    monitor_id: str
+    dataset_id: str
+    status: OutcomeStatus
+    error: Optional[str] = None
+
+
+class BatchMonitorManager:
+    """
+    Saves many applied MonitorSetup objects at once.
+
+    Notification actions are listed once per organization. The monitor config of every
+    dataset is read once, past the response cache, all of its setups are merged into it
+    locally and it is written back with a single request, so the other monitors of the
+    dataset are kept. Setups that fail validation are reported and left out, datasets
+    whose config would not change are not written at all, and a dataset that can't be
+    saved only fails its own setups.
+    """
+
+    def __init__(
+        self,
+        setups: List[MonitorSetup],
+        eager: Optional[bool] = None,
+        notifications_api: Optional[NotificationSettingsApi] = None,
+        monitor_api: Optional[MonitorApi] = None,
+        config: Config = Config(),
+    ) -> None:
+        self._setups = setups
+        self._eager = eager
+        self._config = config
+        self._notifications_api = notifications_api or get_notification_api(config=config)
+        self._monitor_api = monitor_api or get_monitor_api(config=config)
+
+    @staticmethod
+    def _outcome(setup: MonitorSetup, status: OutcomeStatus, error: Optional[str] = None) -> MonitorOutcome:
+        return MonitorOutcome(
+            monitor_id=setup.credentials.monitor_id,
+            dataset_id=setup.credentials.dataset_id,  # type: ignore
+            status=status,
+            error=error,
+        )
+
+    def _create_notification_actions(self, setups: List[MonitorSetup]) -> Dict[str, str]:
+        """Creates the missing notification actions once per organization. Returns failed action ids with errors."""
+        actions_by_org: Dict[str, Dict[str, Union[EmailRecipient, SlackWebhook, PagerDuty]]] = defaultdict(dict)
+        for setup in setups:
+            for action in setup.monitor.actions:  # type: ignore
+                if not isinstance(action, GlobalAction):
+                    actions_by_org[setup.credentials.org_id][action.id] = action
+
+        failed: Dict[str, str] = {}
+        for org_id, actions in actions_by_org.items():
+            try:
+                existing = {
+                    action.get("id") for action in self._notifications_api.list_notification_actions(org_id=org_id)
+                }
+            except (ApiException, HTTPError) as e:
+                failed.update(
+                    {action_id: f"Could not list the notification actions of {org_id}: {e}" for action_id in actions}
+                )
+                continue
+            for action_id, action in actions.items():
+                if action_id in existing:
+                    continue
+                logger.info(f"Didn't find a {action.type} action under the ID {action_id}, creating one now!")
+                try:
+                    self._notifications_api.put_notification_action(
+                        org_id=org_id,
+                        type=action.type.upper(),
+                        action_id=action_id,
+                        body={MonitorManager.get_notification_request_payload(action=action): action.destination},
+                    )
+                except (ApiException, HTTPError) as e:
+                    failed[action_id] = f"Could not create notification action {action_id}: {e}"
+        return failed
+
+    def _plan_dataset(
+        self, org_id: str, dataset_id: str, setups: List[MonitorSetup]
+    ) -> Tuple[Optional[Dict[str, Any]], DocumentDiff]:
+        """The document WhyLabs holds for the dataset and the diff that saves `setups` into it."""
+        current = get_current_document(org_id=org_id, dataset_id=dataset_id, monitor_api=self._monitor_api)
+        granularity = (current or {}).get("granularity") or get_model_granularity(
+            org_id=org_id, dataset_id=dataset_id, config=self._config
+        )
+        desired = build_documents(setups, granularity=granularity, eager=self._eager)[0]
+        return current, diff_documents(current, desired)
+
+    @staticmethod
+    def _merge(current: Optional[Dict[str, Any]], diff: DocumentDiff) -> Dict[str, Any]:
+        """`current` with the settings, analyzers and monitors of `diff` replaced or added by id."""
+        document = dict(current or {"orgId": diff.org_id, "datasetId": diff.dataset_id})
+        document.update(diff.settings)
+        for key, changes in (("analyzers", diff.analyzers), ("monitors", diff.monitors)):
+            entities = {entity["id"]: entity for entity in document.get(key) or []}
+            entities.update({change.id: change.body for change in changes})
+            document[key] = list(entities.values())
+        return document
+
+    def _save_dataset(self, org_id: str, dataset_id: str, setups: List[MonitorSetup]) -> List[MonitorOutcome]:
+        try:
+            current, diff = self._plan_dataset(org_id=org_id, dataset_id=dataset_id, setups=setups)
+        except (ApiException, HTTPError) as e:
+            logger.error(f"Could not read the monitor config of {dataset_id}: {e}")
+            return [self._outcome(setup, OutcomeStatus.failed, str(e)) for setup in setups]
+
+        existing = {monitor.get("id") for monitor in (current or {}).get("monitors") or []}
+        changed = {change.id for change in diff.analyzers + diff.monitors}
+        statuses: Dict[str, OutcomeStatus] = {}
+        for setup in setups:
+            monitor_id = setup.credentials.monitor_id
+            if monitor_id not in changed and setup.credentials.analyzer_id not in changed:
+                statuses[monitor_id] = OutcomeStatus.unchanged
+            else:
+                statuses[monitor_id] = OutcomeStatus.updated if monitor_id in existing else OutcomeStatus.created
+
+        if diff.is_empty:
+            logger.info(f"Monitors for {dataset_id} are up to date, nothing to save.")
+        else:
+            document = self._merge(current, diff)
+            body: Any = document
+            if isinstance(self._monitor_api.api_client, ToolkitApiClient):
+                body = JsonBody(json.dumps(document, separators=(",", ":")).encode("utf-8"))
+            try:
+                self._monitor_api.put_monitor_config_v3(org_id=org_id, dataset_id=dataset_id, body=body)
+            except (ApiException, HTTPError) as e:
+                logger.error(f"Could not save the monitors of {dataset_id}: {e}")
+                # Nothing was written. Setups that change no analyzer or monitor are unchanged, unless the
+                # write only carried the document settings they share
+                return [
+                    self._outcome(setup, OutcomeStatus.failed, str(e))
+                    if statuses[setup.credentials.monitor_id] != OutcomeStatus.unchanged or not changed
+                    else self._outcome(setup, OutcomeStatus.unchanged)
+                    for setup in setups
+                ]
+        return [self._outcome(setup, statuses[setup.credentials.monitor_id]) for setup in setups]
+
+    @operation("BatchMonitorManager.save")
+    def save(self) -> List[MonitorOutcome]:
+        from jsonschema import ValidationError  # imported here to keep the package import light
+
+        outcomes: List[MonitorOutcome] = []
+        valid: List[MonitorSetup] = []
+        for setup in self._setups:
+            try:
+                validate_setups([setup])
+                valid.append(setup)
+            except (ValueError, ValidationError) as e:
+                outcomes.append(self._outcome(setup, OutcomeStatus.invalid, str(e)))
+
+        failed_actions = self._create_notification_actions(valid)
+
+        by_dataset: Dict[Tuple[str, str], List[MonitorSetup]] = defaultdict(list)
+        for setup in valid:
+            errors = [
+                failed_actions[action.id]
+                for action in setup.monitor.actions  # type: ignore
+                if not isinstance(action, GlobalAction) and action.id in failed_actions
+            ]
+            if errors:
+                outcomes.append(self._outcome(setup, OutcomeStatus.failed, errors[0]))
+                continue
+            by_dataset[(setup.credentials.org_id, setup.credentials.dataset_id)].append(setup)  # type: ignore
+
+        for (org_id, dataset_id), dataset_setups in by_dataset.items():
+            outcomes.extend(self._save_dataset(org_id=org_id, dataset_id=dataset_id, setups=dataset_setups))
+        return outcomes
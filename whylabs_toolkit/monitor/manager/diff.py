@@ -0,0 +1,234 @@
+import json
+import logging
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from pydantic import ValidationError
+from whylabs_client.api.monitor_api import MonitorApi
+from whylabs_client.exceptions import NotFoundException
+
+from whylabs_toolkit.helpers.cache import fresh_reads
+from whylabs_toolkit.helpers.client import ToolkitApiClient
+from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.json_body import JsonBody
+from whylabs_toolkit.helpers.utils import get_monitor_api
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.monitor.models.commons import NoExtrasBaseModel
+
+logger = logging.getLogger(__name__)
+
+# Fields that are managed by WhyLabs, can't change or are diffed entity by entity
+_IGNORED_DOCUMENT_FIELDS = {"id", "metadata", "schemaVersion", "analyzers", "monitors"}
+
+
+class ChangeType(str, Enum):
+    added = "added"
+    changed = "changed"
+    removed = "removed"
+
+
+@dataclass
+class EntityChange:
+    """
+    A single analyzer or monitor to write or delete. `body` is the desired entity, None when removed,
+    and `payload` the same entity as the compact JSON that is sent, when it could be parsed.
+    """
+
+    entity: str
+    id: str
+    change: ChangeType
+    body: Optional[Dict[str, Any]] = None
+    fields: List[str] = field(default_factory=list)
+    payload: Optional[bytes] = field(default=None, repr=False)
+
+
+@dataclass
+class DocumentDiff:
+    """The changes needed to turn the current monitor config of a dataset into the desired one."""
+
+    org_id: str
+    dataset_id: str
+    analyzers: List[EntityChange] = field(default_factory=list)
+    monitors: List[EntityChange] = field(default_factory=list)
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.analyzers and not self.monitors and not self.settings
+
+    def summary(self) -> str:
+        symbols = {ChangeType.added: "+", ChangeType.changed: "~", ChangeType.removed: "-"}
+        lines = [f"~ document {key}" for key in self.settings]
+        for change in self.analyzers + self.monitors:
+            fields = f" ({', '.join(change.fields)})" if change.fields else ""
+            lines.append(f"{symbols[change.change]} {change.entity} {change.id}{fields}")
+        return "\n".join(lines) if lines else "No changes"
+
+
+def _drop_none(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _drop_none(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [_drop_none(item) for item in value]
+    return value
+
+
+def _normalize(
+    entity: Union[NoExtrasBaseModel, Dict[str, Any]], model: Type[NoExtrasBaseModel]
+) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    if isinstance(entity, dict):
+        raw = {key: value for key, value in entity.items() if key != "metadata"}
+        try:
+            entity = model.parse_obj(raw)
+        except ValidationError:
+            logger.debug(f"Could not parse {raw.get('id')} as {model.__name__}, comparing it as is")
+            return _drop_none(raw), None
+    payload = entity.json_bytes(exclude={"metadata"})
+    return json.loads(payload), payload
+
+
+def normalize(entity: Union[NoExtrasBaseModel, Dict[str, Any]], model: Type[NoExtrasBaseModel]) -> Dict[str, Any]:
+    """
+    The comparable form of an entity: its JSON body without None values and without `metadata`.
+
+    Plain dicts, as returned by WhyLabs, are parsed with `model` first so that enums, defaults and
+    aliases line up with locally built objects. Dicts the model can't parse are compared as they are.
+    """
+    return _normalize(entity, model)[0]
+
+
+def diff_entities(
+    current: Iterable[Union[NoExtrasBaseModel, Dict[str, Any]]],
+    desired: Iterable[Union[NoExtrasBaseModel, Dict[str, Any]]],
+    model: Type[NoExtrasBaseModel],
+    prune: bool = False,
+) -> List[EntityChange]:
+    """
+    Compare two lists of analyzers or monitors by id.
+
+    Entities only in `current` are reported as removed when `prune` is set, and left alone otherwise.
+    """
+    entity = model.__name__.lower()
+    current_bodies = {body["id"]: body for body in (normalize(item, model) for item in current)}
+    changes = []
+    desired_ids = set()
+    for item in desired:
+        body, payload = _normalize(item, model)
+        desired_ids.add(body["id"])
+        before = current_bodies.get(body["id"])
+        if before is None:
+            changes.append(
+                EntityChange(entity=entity, id=body["id"], change=ChangeType.added, body=body, payload=payload)
+            )
+        elif before != body:
+            fields = sorted(key for key in set(before) | set(body) if before.get(key) != body.get(key))
+            changes.append(
+                EntityChange(
+                    entity=entity, id=body["id"], change=ChangeType.changed, body=body, fields=fields, payload=payload
+                )
+            )
+    if prune:
+        changes.extend(
+            EntityChange(entity=entity, id=entity_id, change=ChangeType.removed)
+            for entity_id in current_bodies
+            if entity_id not in desired_ids
+        )
+    return changes
+
+
+def diff_documents(
+    current: Optional[Union[Document, Dict[str, Any]]], desired: Union[Document, Dict[str, Any]], prune: bool = False
+) -> DocumentDiff:
+    """
+    Structural diff between the current and the desired monitor config of a dataset.
+
+    Document fields that are unset in `desired` are left as they are. `metadata` is ignored everywhere.
+    """
+    current_body = json.loads(current.json_bytes()) if isinstance(current, Document) else current or {}
+    desired_body = json.loads(desired.json_bytes()) if isinstance(desired, Document) else desired
+
+    settings = {
+        key: value
+        for key, value in _drop_none(desired_body).items()
+        if key not in _IGNORED_DOCUMENT_FIELDS and current_body.get(key) != value
+    }
+    return DocumentDiff(
+        org_id=desired_body["orgId"],
+        dataset_id=desired_body["datasetId"],
+        analyzers=diff_entities(
+            current_body.get("analyzers") or [], desired_body.get("analyzers") or [], Analyzer, prune=prune
+        ),
+        monitors=diff_entities(
+            current_body.get("monitors") or [], desired_body.get("monitors") or [], Monitor, prune=prune
+        ),
+        settings=settings,
+    )
+
+
+def get_current_document(org_id: str, dataset_id: str, monitor_api: MonitorApi) -> Optional[Dict[str, Any]]:
+    """The document WhyLabs holds for a dataset, read past the response cache since it is diffed and written back."""
+    try:
+        with fresh_reads():
+            return dict(monitor_api.get_monitor_config_v3(org_id=org_id, dataset_id=dataset_id))
+    except NotFoundException:
+        return None
+
+
+def plan_document(
+    desired: Document, prune: bool = False, monitor_api: Optional[MonitorApi] = None, config: Config = Config()
+) -> DocumentDiff:
+    """Compare a desired Document with what WhyLabs currently holds for its dataset. Only reads from WhyLabs."""
+    monitor_api = monitor_api or get_monitor_api(config=config)
+    current = get_current_document(org_id=desired.orgId, dataset_id=desired.datasetId, monitor_api=monitor_api)
+    return diff_documents(current, desired, prune=prune)
+
+
+def apply_plan(diff: DocumentDiff, monitor_api: Optional[MonitorApi] = None, config: Config = Config()) -> int:
+    """
+    Push a DocumentDiff to WhyLabs and return the number of writes made.
+
+    Analyzers are written before the monitors that reference them and monitors are
+    deleted before their analyzers. An empty diff makes no requests at all. Through the
+    clients of `create_client`, analyzers and monitors are sent as the JSON they were
+    diffed as, without serializing them again.
+    """
+    if diff.is_empty:
+        return 0
+    monitor_api = monitor_api or get_monitor_api(config=config)
+    org_id, dataset_id = diff.org_id, diff.dataset_id
+    writes = 0
+    sends_json_body = isinstance(monitor_api.api_client, ToolkitApiClient)
+
+    def request_body(change: EntityChange) -> Any:
+        return JsonBody(change.payload) if sends_json_body and change.payload is not None else change.body
+
+    if diff.settings:
+        document = get_current_document(org_id=org_id, dataset_id=dataset_id, monitor_api=monitor_api)
+        if document is None:
+            document = {"orgId": org_id, "datasetId": dataset_id, "analyzers": [], "monitors": []}
+        document.update(diff.settings)
+        monitor_api.put_monitor_config_v3(org_id=org_id, dataset_id=dataset_id, body=document)
+        writes += 1
+
+    for change in diff.analyzers:
+        if change.change != ChangeType.removed:
+            monitor_api.put_analyzer(
+                org_id=org_id, dataset_id=dataset_id, analyzer_id=change.id, body=request_body(change)
+            )
+            writes += 1
+    for change in diff.monitors:
+        if change.change != ChangeType.removed:
+            monitor_api.put_monitor(
+                org_id=org_id, dataset_id=dataset_id, monitor_id=change.id, body=request_body(change)
+            )
+            writes += 1
+    for change in diff.monitors:
+        if change.change == ChangeType.removed:
+            monitor_api.delete_monitor(org_id=org_id, dataset_id=dataset_id, monitor_id=change.id)
+            writes += 1
+    for change in diff.analyzers:
+        if change.change == ChangeType.removed:
+            monitor_api.delete_analyzer(org_id=org_id, dataset_id=dataset_id, analyzer_id=change.id)
+            writes += 1
+    return writes
@@ -1,16 +1,17 @@
 import logging
 import json
-from pathlib import Path
 from typing import Optional, Union, Any, List
 
-from jsonschema import validate, ValidationError
 from whylabs_client.api.notification_settings_api import NotificationSettingsApi
 from whylabs_client.api.models_api import ModelsApi
 
 from whylabs_toolkit.monitor.manager.monitor_setup import MonitorSetup
+from whylabs_toolkit.monitor.manager.diff import DocumentDiff, apply_plan, diff_documents, get_current_document
+from whylabs_toolkit.monitor.manager.validation import build_documents, get_document_validator, validate_setups
 from whylabs_toolkit.monitor.models import *
 from whylabs_toolkit.helpers.monitor_helpers import get_model_granularity
 from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.instrumentation import operation
 from whylabs_toolkit.helpers.utils import get_monitor_api, get_notification_api
 
 
@@ -31,6 +32,7 @@ class MonitorManager:
         self.__notifications_api = notifications_api or get_notification_api(config=config)
         self.__monitor_api = monitor_api or get_monitor_api(config=config)
         self.__eager = eager
+        self.__config = config
 
     def _get_existing_notification_actions(self) -> List[str]:
         actions_dict_list = self.__notifications_api.list_notification_actions(org_id=self._setup.credentials.org_id)
@@ -87,55 +89,74 @@ class MonitorManager:
         )
         return monitor_config
 
-    def dump(self) -> Any:
+    def _document(self) -> Document:
         self._update_notification_actions()
 
-        doc = Document(
+        return Document(
             orgId=self._setup.credentials.org_id,
             datasetId=self._setup.credentials.dataset_id,
             granularity=get_model_granularity(
-                org_id=self._setup.credentials.org_id, dataset_id=self._setup.credentials.dataset_id  # type: ignore
+                org_id=self._setup.credentials.org_id,
+                dataset_id=self._setup.credentials.dataset_id,  # type: ignore
+                config=self.__config,
             ),
             analyzers=[self._setup.analyzer],
             monitors=[self._setup.monitor],
             allowPartialTargetBatches=self.__eager,
         )
-        return doc.json(indent=2, exclude_none=True)
 
-    def validate(self) -> bool:
-        try:
-            Monitor.validate(self._setup.monitor)
-            Analyzer.validate(self._setup.analyzer)
+    def dump(self) -> Any:
+        return self._document().json(indent=2, exclude_none=True)
+
+    def dump_bytes(self) -> bytes:
+        """The document of dump() as compact JSON bytes, which can be sent to WhyLabs as they are."""
+        return self._document().json_bytes()
+
+    @operation("MonitorManager.validate")
+    def validate(self, offline: bool = False, granularity: Optional[Granularity] = None) -> bool:
+        """
+        Validates the setup against the monitor config JSON Schema.
+
+        With `offline=True` the document is assembled locally and WhyLabs is never called:
+        notification actions are not created and the dataset granularity is not fetched,
+        `granularity` is used instead (defaulting to the analyzer cadence).
+        """
+        if offline:
+            return validate_setups([self._setup], granularity=granularity)
+
+        Monitor.validate(self._setup.monitor)
+        Analyzer.validate(self._setup.analyzer)
 
-            with open(f"{Path(__file__).parent.parent.resolve()}/schema/schema.json", "r") as f:
-                schema = json.load(f)
-            document = self.dump()
-            validate(instance=json.loads(document), schema=schema)
-            return True
-        except ValidationError as e:
-            raise e
+        document = self.dump_bytes()
+        get_document_validator().validate(instance=json.loads(document))
+        return True
 
+    @operation("MonitorManager.plan")
+    def plan(self) -> DocumentDiff:
+        """
+        Compares the setup with what WhyLabs currently holds, without writing anything.
+
+        Unchanged analyzers and monitors are left out, so an empty plan means save() has nothing to push.
+        """
+        if not self._setup.monitor or not self._setup.analyzer:
+            raise ValueError("You must call apply() on your MonitorSetup object!")
+        current = get_current_document(
+            org_id=self._setup.credentials.org_id,
+            dataset_id=self._setup.credentials.dataset_id,  # type: ignore
+            monitor_api=self.__monitor_api,  # type: ignore
+        )
+        granularity = (current or {}).get("granularity") or get_model_granularity(
+            org_id=self._setup.credentials.org_id,
+            dataset_id=self._setup.credentials.dataset_id,  # type: ignore
+            config=self.__config,
+        )
+        desired = build_documents([self._setup], granularity=granularity, eager=self.__eager)[0]
+        return diff_documents(current, desired)
+
+    @operation("MonitorManager.save")
     def save(self) -> None:
         if self.validate() is True:
-            self.__monitor_api.put_analyzer(
-                org_id=self._setup.credentials.org_id,
-                dataset_id=self._setup.credentials.dataset_id,
-                analyzer_id=self._setup.credentials.analyzer_id,
-                body=self._setup.analyzer.dict(exclude_none=True),  # type: ignore
-            )
-            self.__monitor_api.put_monitor(
-                org_id=self._setup.credentials.org_id,
-                dataset_id=self._setup.credentials.dataset_id,
-                monitor_id=self._setup.credentials.monitor_id,
-                body=self._setup.monitor.dict(exclude_none=True),  # type: ignore
-            )
-        if self.__eager is not None:
-            current_config = self._get_current_monitor_config()
-
-            if self.__eager != current_config.get("allowPartialTargetBatches"):  # type: ignore
-                current_config["allowPartialTargetBatches"] = self.__eager  # type: ignore
-                self.__monitor_api.put_monitor_config_v3(
-                    org_id=self._setup.credentials.org_id,
-                    dataset_id=self._setup.credentials.dataset_id,
-                    body=current_config,
-                )
+            diff = self.plan()
+            if diff.is_empty:
+                logger.info(f"{self._setup.credentials.monitor_id} is up to date, nothing to save.")
+            apply_plan(diff, monitor_api=self.__monitor_api)  # type: ignore
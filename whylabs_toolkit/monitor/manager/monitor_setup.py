@@ -1,7 +1,7 @@
 import re
 import logging
 from datetime import datetime, timezone
-from typing import Optional, List, Union, Any
+from typing import Optional, Dict, List, Union, Any
 
 from whylabs_client.exceptions import NotFoundException
 
@@ -9,8 +9,9 @@ from whylabs_toolkit.helpers.utils import get_models_api
 from whylabs_toolkit.monitor.models import *
 from whylabs_toolkit.monitor.models.analyzer.targets import ColumnGroups
 from whylabs_toolkit.monitor.manager.credentials import MonitorCredentials
-from whylabs_toolkit.helpers.monitor_helpers import get_analyzers, get_monitor, get_model_granularity
+from whylabs_toolkit.helpers.monitor_helpers import MonitorConfigIndex, get_model_granularity
 from whylabs_toolkit.helpers.config import Config
+from whylabs_toolkit.helpers.instrumentation import operation
 
 
 logging.basicConfig(level=logging.INFO)
@@ -20,12 +21,18 @@ TAG_ANALYZER_CONSTRAINT = "whylabs.constraint"
 
 
 class MonitorSetup:
+    @operation("MonitorSetup.init")
     def __init__(self, monitor_id: str, dataset_id: Optional[str] = None, config: Config = Config()) -> None:
 
         self.credentials = MonitorCredentials(monitor_id=monitor_id, dataset_id=dataset_id, config=config)
         self._config = config
-        self.monitor: Optional[Monitor] = self._check_if_monitor_exists()
-        self.analyzer: Optional[Analyzer] = self._check_if_analyzer_exists()
+        monitor_config = MonitorConfigIndex.fetch(
+            org_id=self.credentials.org_id,
+            dataset_id=self.credentials.dataset_id,  # type: ignore
+            config=self._config,
+        )
+        self.monitor: Optional[Monitor] = self._check_if_monitor_exists(monitor_config)
+        self.analyzer: Optional[Analyzer] = self._check_if_analyzer_exists(monitor_config)
 
         self._models_api = get_models_api(config=self._config)
 
@@ -53,33 +60,25 @@ class MonitorSetup:
         self._analyzer_tags: Optional[List[str]] = []
         self._analyzer_disable_target_rollup: Optional[bool] = None
         self._data_readiness_duration: Optional[str] = None
+        self._schema_columns: Optional[Dict[str, Any]] = None
 
         self._prefill_properties()
 
-    def _check_if_monitor_exists(self) -> Any:
-        existing_monitor = get_monitor(
-            org_id=self.credentials.org_id,
-            dataset_id=self.credentials.dataset_id,
-            monitor_id=self.credentials.monitor_id,
-            config=self._config,
-        )
+    def _check_if_monitor_exists(self, monitor_config: MonitorConfigIndex) -> Any:
+        existing_monitor = monitor_config.get_monitor(self.credentials.monitor_id)
         if existing_monitor:
-            existing_monitor = Monitor.parse_obj(existing_monitor)
+            # WhyLabs validated it when it was saved
+            existing_monitor = Monitor.parse_trusted(existing_monitor)
             logger.info(f"Got existing {self.credentials.monitor_id} from WhyLabs!")
         else:
             logger.info(f"Did not find a monitor with {self.credentials.monitor_id}, creating a new one.")
             existing_monitor = None
         return existing_monitor
 
-    def _check_if_analyzer_exists(self) -> Any:
-        existing_analyzers = get_analyzers(
-            org_id=self.credentials.org_id,
-            dataset_id=self.credentials.dataset_id,
-            monitor_id=self.credentials.monitor_id,
-            config=self._config,
-        )
+    def _check_if_analyzer_exists(self, monitor_config: MonitorConfigIndex) -> Any:
+        existing_analyzers = monitor_config.get_analyzers(self.credentials.monitor_id)
         if existing_analyzers:
-            existing_analyzer = Analyzer.parse_obj(existing_analyzers[0])  # enforcing 1:1 relationship
+            existing_analyzer = Analyzer.parse_trusted(existing_analyzers[0])  # enforcing 1:1 relationship
 
         else:
             existing_analyzer = None
@@ -204,6 +203,15 @@ class MonitorSetup:
         pattern = r"^P(\d+Y)?(\d+M)?(\d+D)?(T(\d+H)?(\d+M)?(\d+(\.\d+)?S)?)?$"
         return bool(re.match(pattern, delay))
 
+    def _get_schema_columns(self) -> Dict[str, Any]:
+        # Read once per setup, for the target and the excluded columns alike
+        if self._schema_columns is None:
+            schema = self._models_api.get_entity_schema(
+                org_id=self.credentials.org_id, dataset_id=self.credentials.dataset_id
+            )
+            self._schema_columns = schema["columns"]
+        return self._schema_columns
+
     def _validate_columns_input(self, columns: List[str]) -> bool:
         if type(columns) != list or not all(isinstance(column, str) for column in columns):
             raise ValueError("columns argument must be a List of strings")
@@ -217,10 +225,7 @@ class MonitorSetup:
         if "group:" in columns and not allowed_groups:
             raise ValueError(f"group:[group_type] should be one of {group_columns}")
 
-        schema = self._models_api.get_entity_schema(
-            org_id=self.credentials.org_id, dataset_id=self.credentials.dataset_id
-        )
-        columns_dict = schema["columns"]
+        columns_dict = self._get_schema_columns()
 
         for col in columns:
             if col not in columns_dict.keys():
@@ -352,12 +357,15 @@ class MonitorSetup:
             self._target_matrix = DatasetMatrix(segments=self._target_matrix.segments)
             return None
 
+    @operation("MonitorSetup.apply")
     def apply(self) -> None:
         monitor_mode = self._monitor_mode or DigestMode()
         actions = self._monitor_actions or []
         self._analyzer_schedule = self._analyzer_schedule or FixedCadenceSchedule(
             cadence=get_model_granularity(
-                org_id=self.credentials.org_id, dataset_id=self.credentials.dataset_id  # type: ignore
+                org_id=self.credentials.org_id,
+                dataset_id=self.credentials.dataset_id,  # type: ignore
+                config=self._config,
             )
         )
 
@@ -0,0 +1,137 @@
+"""
+The JSON Schema of monitor config documents, as the models generate it and as shipped in schema.json.
+
+schema.json is the schema WhyLabs validates documents against and is what `validate()` checks
+documents with; it is maintained next to the models rather than generated from them. To catch
+the two drifting apart, `schema_drift()` compares their structure (definitions, properties,
+required fields and enum values) and the differences that are already known are listed in
+`KNOWN_DRIFT`. Run `python -m whylabs_toolkit.monitor.manager.schema` to check for new ones, and
+pass `--write` to write the schema generated from the models.
+"""
+import argparse
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+SCHEMA_PATH = Path(__file__).parent.parent.resolve() / "schema" / "schema.json"
+
+# Differences between the models and schema.json at the time the check was added
+KNOWN_DRIFT = frozenset(
+    {
+        "AlgorithmType: only in schema.json",
+        "ColumnListChangeConfig: only in schema.json",
+        "ColumnMatrix.properties: excludeSegments only in schema.json",
+        "ComparisonOperator.enum: ge, gt, le, lt only in schema.json",
+        "DatasetMatrix.properties: excludeSegments only in schema.json",
+        "DatasetMetric.enum: classification.auc, missingDatapoint only in the models",
+        "DatasetMetric.enum: classification.auroc, classification.fpr only in schema.json",
+        "EmailRecipient: only in the models",
+        "ExperimentalConfig: only in schema.json",
+        "PagerDuty: only in the models",
+        "RawWebhook: only in schema.json",
+        "SendEmail: only in schema.json",
+        "SlackWebhook.properties: destination, id only in the models",
+        "SlackWebhook.properties: target only in schema.json",
+        "SlackWebhook.required: destination, id only in the models",
+        "SlackWebhook.required: target only in schema.json",
+    }
+)
+
+_cache: Dict[str, Dict[str, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+def document_schema() -> Dict[str, Any]:
+    """The JSON Schema the models generate for a Document, built once per process. Not to be modified."""
+    with _cache_lock:
+        if "models" not in _cache:
+            from whylabs_toolkit.monitor.models import Document
+
+            # The oneOf rewrites of the unions run in the Config.schema_extra of the models, once here
+            _cache["models"] = Document.schema()
+        return _cache["models"]
+
+
+def shipped_schema() -> Dict[str, Any]:
+    """The JSON Schema in schema.json, loaded once per process. Not to be modified."""
+    with _cache_lock:
+        if "shipped" not in _cache:
+            with open(SCHEMA_PATH, "r") as f:
+                _cache["shipped"] = json.load(f)
+        return _cache["shipped"]
+
+
+def _names(values: Set[str]) -> str:
+    return ", ".join(sorted(values))
+
+
+def _compare(name: str, part: str, models: Set[str], shipped: Set[str], drift: List[str]) -> None:
+    if models - shipped:
+        drift.append(f"{name}.{part}: {_names(models - shipped)} only in the models")
+    if shipped - models:
+        drift.append(f"{name}.{part}: {_names(shipped - models)} only in schema.json")
+
+
+def _compare_definition(name: str, models: Dict[str, Any], shipped: Dict[str, Any], drift: List[str]) -> None:
+    properties = models.get("properties", {})
+    _compare(name, "properties", set(properties), set(shipped.get("properties", {})), drift)
+    # The models give the `type` of their variants a default where schema.json requires it
+    defaulted = {field for field, schema in properties.items() if "default" in schema}
+    _compare(
+        name,
+        "required",
+        set(models.get("required", [])) - defaulted,
+        set(shipped.get("required", [])) - defaulted,
+        drift,
+    )
+    if "enum" in models or "enum" in shipped:
+        _compare(name, "enum", set(map(str, models.get("enum", []))), set(map(str, shipped.get("enum", []))), drift)
+
+
+def schema_drift(models: Optional[Dict[str, Any]] = None, shipped: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    The structural differences between the schema of the models and schema.json, sorted.
+
+    Descriptions, titles, patterns and the order of enum values are left out.
+    """
+    models = models if models is not None else document_schema()
+    shipped = shipped if shipped is not None else shipped_schema()
+    drift: List[str] = []
+    _compare_definition("Document", models, shipped, drift)
+    model_definitions, shipped_definitions = models.get("definitions", {}), shipped.get("definitions", {})
+    for name in sorted(set(model_definitions) | set(shipped_definitions)):
+        if name not in shipped_definitions:
+            drift.append(f"{name}: only in the models")
+        elif name not in model_definitions:
+            drift.append(f"{name}: only in schema.json")
+        else:
+            _compare_definition(name, model_definitions[name], shipped_definitions[name], drift)
+    return sorted(drift)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--write", type=Path, default=None, help="where to write the schema generated from the models")
+    args = parser.parse_args()
+
+    if args.write is not None:
+        with open(args.write, "w") as f:
+            json.dump(document_schema(), f, indent=2)
+            f.write("\n")
+        print(f"schema written to {args.write}")
+
+    drift = schema_drift()
+    fixed = sorted(KNOWN_DRIFT - set(drift))
+    new = [difference for difference in drift if difference not in KNOWN_DRIFT]
+    for difference in fixed:
+        print(f"no longer drifting, remove from KNOWN_DRIFT: {difference}")
+    for difference in new:
+        print(f"drift: {difference}")
+    if new:
+        sys.exit(f"the models and {SCHEMA_PATH.name} drifted apart in {len(new)} places")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import json
+import threading
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from whylabs_toolkit.monitor.manager.monitor_setup import MonitorSetup
+from whylabs_toolkit.monitor.manager.schema import shipped_schema
+from whylabs_toolkit.monitor.models import *
+
+if TYPE_CHECKING:
+    from jsonschema.protocols import Validator
+
+_validator: Optional["Validator"] = None
+_validator_lock = threading.Lock()
+
+
+def get_document_validator() -> "Validator":
+    """The JSON Schema validator for monitor config documents, checked and compiled once per process."""
+    global _validator
+    with _validator_lock:
+        if _validator is None:
+            # jsonschema takes a while to import and is only needed once something gets validated
+            from jsonschema.validators import validator_for
+
+            schema = shipped_schema()
+            validator_class = validator_for(schema)
+            validator_class.check_schema(schema)
+            _validator = validator_class(schema)
+        return _validator
+
+
+def validate_document(document: Document) -> bool:
+    """Validate a whole Document against the monitor config JSON Schema, without calling WhyLabs."""
+    get_document_validator().validate(instance=json.loads(document.json_bytes()))
+    return True
+
+
+def _offline_monitor(setup: MonitorSetup) -> Monitor:
+    if not setup.monitor or not setup.analyzer:
+        raise ValueError("You must call apply() on your MonitorSetup object!")
+    Monitor.validate(setup.monitor)
+    Analyzer.validate(setup.analyzer)
+    # Mirrors MonitorManager, which registers notification actions and references them as global actions
+    actions = [
+        action if isinstance(action, GlobalAction) else GlobalAction(target=action.id)
+        for action in setup.monitor.actions
+    ]
+    return setup.monitor.copy(update={"actions": actions})
+
+
+def _setup_granularity(setups: List[MonitorSetup]) -> Granularity:
+    for setup in setups:
+        if setup.analyzer and isinstance(setup.analyzer.schedule, FixedCadenceSchedule):
+            return Granularity(setup.analyzer.schedule.cadence.value)
+    return Granularity.daily
+
+
+def build_documents(
+    setups: Iterable[MonitorSetup], granularity: Optional[Granularity] = None, eager: Optional[bool] = None
+) -> List[Document]:
+    """
+    Assemble applied setups into one Document per dataset, locally.
+
+    The granularity is only used to fill in the document and is not checked against
+    WhyLabs; when it is not given, the cadence of the first scheduled analyzer is used.
+    """
+    grouped: Dict[Tuple[str, str], List[MonitorSetup]] = defaultdict(list)
+    for setup in setups:
+        grouped[(setup.credentials.org_id, setup.credentials.dataset_id)].append(setup)  # type: ignore
+
+    documents = []
+    for (org_id, dataset_id), dataset_setups in grouped.items():
+        monitors = [_offline_monitor(setup) for setup in dataset_setups]
+        documents.append(
+            Document(
+                orgId=org_id,
+                datasetId=dataset_id,
+                granularity=granularity or _setup_granularity(dataset_setups),
+                analyzers=[setup.analyzer for setup in dataset_setups],
+                monitors=monitors,
+                allowPartialTargetBatches=eager,
+            )
+        )
+    return documents
+
+
+def validate_setups(setups: Iterable[MonitorSetup], granularity: Optional[Granularity] = None) -> bool:
+    """Validate many applied setups in one pass without calling WhyLabs. Raises jsonschema's ValidationError."""
+    for document in build_documents(setups, granularity=granularity):
+        validate_document(document)
+    return True
@@ -1,12 +1,16 @@
 # flake8: noqa
 """Console script for monitor_schema."""
-from .analyzer import *
-from .column_schema import *
-from .commons import *
-from .document import *
-from .monitor import *
-from .segments import *
-from ...utils.granularity import Granularity
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .analyzer import *
+    from .column_schema import *
+    from .commons import *
+    from .document import *
+    from .monitor import *
+    from .segments import *
+    from ...utils.granularity import Granularity
 
 # TODO add all algorithms
 
@@ -82,3 +86,84 @@ __all__ = [
     "ComplexMetrics",
     "ExpectedValue",
 ]
+
+# The pydantic models take a while to build, so every name is only imported from its module on first use
+_LAZY_MODULES = {
+    ".analyzer": [
+        "Analyzer",
+        "BaselineType",
+        "ReferenceProfileId",
+        "TimeRangeBaseline",
+        "TrailingWindowBaseline",
+        "SingleBatchBaseline",
+        "DiffConfig",
+        "DriftConfig",
+        "ComparisonConfig",
+        "ComparisonOperator",
+        "FrequentStringComparisonConfig",
+        "FrequentStringComparisonOperator",
+        "ListComparisonOperator",
+        "ListComparisonConfig",
+        "ExperimentalConfig",
+        "FixedThresholdsConfig",
+        "ColumnListChangeConfig",
+        "SeasonalConfig",
+        "StddevConfig",
+        "ConjunctionConfig",
+        "DisjunctionConfig",
+        "DatasetMatrix",
+        "ColumnMatrix",
+        "TargetLevel",
+        "DiffMode",
+        "ThresholdType",
+        "AlgorithmType",
+        "DatasetMetric",
+        "SimpleColumnMetric",
+        "ComplexMetrics",
+        "ExpectedValue",
+    ],
+    ".column_schema": [
+        "EntitySchema",
+        "ColumnSchema",
+        "ColumnDataType",
+        "ColumnDiscreteness",
+        "WeightConfig",
+        "SegmentWeightConfig",
+    ],
+    ".commons": ["Metadata", "TimeRange", "ImmediateSchedule", "CronSchedule", "FixedCadenceSchedule", "Cadence"],
+    ".document": ["Document"],
+    ".monitor": [
+        "Monitor",
+        "EveryAnomalyMode",
+        "DigestMode",
+        "AnomalyFilter",
+        "SlackWebhook",
+        "EmailRecipient",
+        "PagerDuty",
+        "GlobalAction",
+    ],
+    ".segments": ["Segment", "SegmentTag"],
+    "...utils.granularity": ["Granularity"],
+}
+_LAZY_NAMES = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is not None:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    else:
+        # Names outside __all__ that the star imports used to expose, the last module winning as before
+        for module_name in reversed(list(_LAZY_MODULES)[:-1]):
+            module = importlib.import_module(module_name, __name__)
+            if not name.startswith("_") and hasattr(module, name):
+                value = getattr(module, name)
+                break
+        else:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,12 +1,12 @@
 """Define what targets for the analyses."""
 from enum import Enum
-from typing import List, Literal, Optional, Union
+from typing import Any, Dict, FrozenSet, List, Literal, Optional, Union
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from whylabs_toolkit.monitor.models.commons import NoExtrasBaseModel
 from whylabs_toolkit.monitor.models.segments import Segment
-from whylabs_toolkit.monitor.models.utils import COLUMN_NAME_TYPE
+from whylabs_toolkit.monitor.models.utils import COLUMN_NAME_TYPE, cached_column_set
 
 
 class TargetLevel(str, Enum):
@@ -73,3 +73,12 @@ class ColumnMatrix(_BaseMatrix):
         description="The unique profile ID for the reference profile",
         max_length=100,
     )
+    _column_sets: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    def include_set(self) -> FrozenSet[Any]:
+        """The columns and groups of `include` as a set, to check many columns against it."""
+        return cached_column_set(self._column_sets, "include", self.include)
+
+    def exclude_set(self) -> FrozenSet[Any]:
+        """The columns and groups of `exclude` as a set, to check many columns against it."""
+        return cached_column_set(self._column_sets, "exclude", self.exclude)
@@ -1,11 +1,15 @@
 """Common schema definitions."""
 from datetime import datetime
 from enum import Enum
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Set, Type, TypeVar
 
 from pydantic import BaseModel, Extra
 from pydantic.fields import Field
 
+from .hashing import structural_hash
+from .serialization import dump_json
+from .trusted import construct_trusted
+
 CRON_REGEX = "(@(annually|yearly|monthly|weekly|daily|hourly))|" "((((\\d+,)+\\d+|(\\d+(\\/|-)\\d+)|\\d+|\\*) ?){5,7})"
 DATASET_ID_REGEX = "[a-zA-Z0-9\\-_\\.]+"
 
@@ -25,6 +29,25 @@ class NoExtrasBaseModel(BaseModel, extra=Extra.forbid):  # type: ignore
     Inherit to prevent accidental extra fields.
     """
 
+    @classmethod
+    def parse_trusted(cls: Type["ModelT"], obj: Dict[str, Any]) -> "ModelT":
+        """Build the model from a payload WhyLabs returned, without validating it again.
+
+        See `construct_trusted`: only use it on data that came from WhyLabs, and `parse_obj` otherwise.
+        """
+        return construct_trusted(cls, obj)
+
+    def json_bytes(self, exclude: Optional[Set[str]] = None) -> bytes:
+        """The JSON of `.json(exclude_none=True)` as compact UTF-8 bytes, encoded in a single pass. See `dump_json`."""
+        return dump_json(self, exclude=exclude)
+
+    def structural_hash(self) -> str:
+        """A stable hash of what the model configures, without ids, names, tags, metadata or order. See `hashing`."""
+        return structural_hash(self)
+
+
+ModelT = TypeVar("ModelT", bound=NoExtrasBaseModel)
+
 
 class ImmediateSchedule(NoExtrasBaseModel):
     """Schedule the monitor to run immediately."""
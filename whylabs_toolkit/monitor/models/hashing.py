@@ -0,0 +1,49 @@
+"""
+Structural hashes of models: models that configure the same work hash alike.
+
+`structural_hash(analyzer)` is the SHA-256 of a canonical form of the model's JSON, where
+`metadata` is left out at every level and `id`, `displayName` and `tags` at the top, keys are
+sorted, and every list is taken as a set: sorted, without repeats. It doesn't depend on the
+order columns, segments or tags were listed in, and unlike `hash()` it is the same in every
+process, so hashes can be stored and compared later.
+"""
+import hashlib
+import json
+from typing import Any, Dict, FrozenSet
+
+from pydantic import BaseModel
+
+from .serialization import dump_json
+
+# What names or describes a model rather than configuring it
+IGNORED_FIELDS = frozenset({"id", "displayName", "tags"})
+
+_encode = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items() if key != "metadata"}
+    if isinstance(value, list):
+        items = [_canonical(item) for item in value]
+        if all(type(item) is str for item in items):
+            return sorted(set(items))
+        by_key = {_encode(item): item for item in items}
+        return [by_key[key] for key in sorted(by_key)]
+    return value
+
+
+def canonical_form(model: BaseModel, ignore: FrozenSet[str] = IGNORED_FIELDS) -> Dict[str, Any]:
+    """The JSON of `model` in the canonical form that is hashed, without its top-level `ignore` fields."""
+    form: Dict[str, Any] = _canonical(json.loads(dump_json(model, exclude=set(ignore) | {"metadata"})))
+    return form
+
+
+def digest(form: Any) -> str:
+    """The SHA-256 of a canonical form, in hex."""
+    return hashlib.sha256(_encode(form).encode("utf-8")).hexdigest()
+
+
+def structural_hash(model: BaseModel, ignore: FrozenSet[str] = IGNORED_FIELDS) -> str:
+    """The hash of what `model` configures, the same for models that only differ in ids, metadata and order."""
+    return digest(canonical_form(model, ignore))
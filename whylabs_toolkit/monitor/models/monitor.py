@@ -1,8 +1,8 @@
 """Schema for configuring a monitor."""
 from enum import Enum
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, Dict, FrozenSet, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field, constr, HttpUrl, parse_obj_as, validator
+from pydantic import BaseModel, Field, PrivateAttr, constr, HttpUrl, parse_obj_as, validator
 
 
 from whylabs_toolkit.monitor.models.commons import (
@@ -12,7 +12,7 @@ from whylabs_toolkit.monitor.models.commons import (
     Metadata,
     NoExtrasBaseModel,
 )
-from whylabs_toolkit.monitor.models.utils import COLUMN_NAME_TYPE, METRIC_NAME_STR, anyOf_to_oneOf
+from whylabs_toolkit.monitor.models.utils import COLUMN_NAME_TYPE, METRIC_NAME_STR, anyOf_to_oneOf, cached_column_set
 
 
 class MonitorConfigMetadata(NoExtrasBaseModel):
@@ -138,6 +138,15 @@ class AnomalyFilter(NoExtrasBaseModel):
         description="Metrics to filter by. NOT SUPPORTED YET",
         max_items=100,
     )
+    _column_sets: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    def include_set(self) -> FrozenSet[str]:
+        """The columns of `includeColumns` as a set, to check many columns against it."""
+        return cached_column_set(self._column_sets, "includeColumns", self.includeColumns)
+
+    def exclude_set(self) -> FrozenSet[str]:
+        """The columns of `excludeColumns` as a set, to check many columns against it."""
+        return cached_column_set(self._column_sets, "excludeColumns", self.excludeColumns)
 
 
 excludeMetrics: Optional[List[METRIC_NAME_STR]] = Field(  # type: ignore
@@ -0,0 +1,45 @@
+"""
+Serialization of models to compact JSON bytes.
+
+`dump_json(model)` gives the JSON `model.json(exclude_none=True)` gives, without its spaces and
+as UTF-8 bytes ready to be sent. pydantic first copies the model into dicts with `.dict()`, then
+encodes them; here the C encoder of the `json` module walks the models themselves in one pass,
+and only calls back into Python to get the fields of a model and to encode the values JSON
+doesn't know, such as datetimes, UUIDs and enums that aren't strings.
+"""
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Optional, Set
+
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    # Called for what json can't encode by itself, like pydantic_encoder with exclude_none
+    if isinstance(value, BaseModel):
+        return {name: field for name, field in value.__dict__.items() if field is not None}
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_COMPACT = json.JSONEncoder(default=_default, separators=(",", ":"), ensure_ascii=False)
+
+
+def dump_json(model: BaseModel, exclude: Optional[Set[str]] = None) -> bytes:
+    """The compact JSON of `model` without its None fields, as UTF-8 bytes, leaving out the top-level `exclude` ones."""
+    body: Dict[str, Any] = _default(model)
+    if exclude:
+        body = {name: field for name, field in body.items() if name not in exclude}
+    return _COMPACT.encode(body).encode("utf-8")
@@ -0,0 +1,133 @@
+"""
+Streaming reader of monitor config documents.
+
+`parse_monitor_config_stream` reads the JSON of a monitor config from a byte stream a chunk at a
+time and yields its analyzers and monitors one by one, so only one of them, and the chunk being
+read, is held in memory instead of the whole document. The other top-level fields are skipped.
+"""
+import codecs
+import json
+import re
+from typing import IO, Any, Iterable, Iterator, Optional, Union
+
+from .analyzer import Analyzer
+from .monitor import Monitor
+from .trusted import construct_trusted
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_MODELS = {"analyzers": Analyzer, "monitors": Monitor}
+
+
+def _chunks(source: Union[IO[bytes], Iterable[bytes]], chunk_size: int) -> Iterator[bytes]:
+    if not hasattr(source, "read"):
+        yield from source  # type: ignore
+        return
+    while True:
+        chunk = source.read(chunk_size)  # type: ignore
+        if not chunk:
+            return
+        yield chunk
+
+
+class _Reader:
+    """A growing window over the decoded text of a byte stream."""
+
+    def __init__(self, source: Union[IO[bytes], Iterable[bytes]], chunk_size: int) -> None:
+        self._chunks = _chunks(source, chunk_size)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def _more(self) -> bool:
+        # Reads at least as much as is pending: a value spanning many chunks is only decoded a few times
+        if self.eof:
+            return False
+        if self.pos > self.chunk_size:
+            self.text, self.pos = self.text[self.pos :], 0
+        wanted = max(self.chunk_size, len(self.text) - self.pos)
+        parts = []
+        size = 0
+        while size < wanted:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                parts.append(self._decoder.decode(b"", final=True))
+                self.eof = True
+                break
+            parts.append(self._decoder.decode(chunk))
+            size += len(chunk)
+        self.text += "".join(parts)
+        return True
+
+    def peek(self) -> str:
+        """The next character that isn't whitespace, or "" at the end of the stream."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()  # type: ignore
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self._more():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        character = self.peek()
+        if not character or character not in characters:
+            found = repr(character) if character else "the end of the stream"
+            raise ValueError(f"Expected one of {characters!r} at offset {self.pos}, found {found}")
+        self.pos += 1
+        return character
+
+    def value(self) -> Any:
+        """Decodes the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self._more():
+                    raise
+                continue
+            # A number at the very end of what was read so far may go on in the next chunk
+            if end == len(self.text) and self._more():
+                continue
+            self.pos = end
+            return value
+
+
+def parse_monitor_config_stream(
+    source: Union[IO[bytes], Iterable[bytes]], trusted: bool = False, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Union[Analyzer, Monitor]]:
+    """
+    Yields the analyzers and monitors of the monitor config document read from `source`, in order.
+
+    `source` is a binary file, an HTTP response or any iterable of byte chunks. Every object is
+    validated like `Analyzer.parse_obj` does, unless `trusted` is set: payloads WhyLabs returned
+    are valid already, and are then built without validating them again.
+    """
+    reader = _Reader(source, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError(f"Expected a field name at offset {reader.pos}")
+        reader.expect(":")
+        model: Optional[Any] = _MODELS.get(key)
+        if model is not None and reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() != "]":
+                while True:
+                    data = reader.value()
+                    yield construct_trusted(model, data) if trusted else model.parse_obj(data)
+                    if reader.expect(",]") == "]":
+                        break
+            else:
+                reader.expect("]")
+        else:
+            reader.value()
+        if reader.expect(",}") == "}":
+            return
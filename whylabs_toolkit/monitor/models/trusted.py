@@ -0,0 +1,182 @@
+"""
+Construction of models from payloads WhyLabs already validated.
+
+`construct_trusted(Analyzer, data)` builds the same objects `Analyzer.parse_obj(data)` does for
+a valid payload, without running the validators again: unions are resolved by their `type`
+discriminator instead of trying every member, and constrained strings aren't checked, though
+column names are still interned. Keys the models don't know raise a ValidationError, like they
+do with `parse_obj`, unless the model allows extra fields. Only use it on data that came from WhyLabs.
+"""
+import sys
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Type, TypeVar, Union
+
+from pydantic import BaseModel, Extra, ValidationError
+from pydantic.datetime_parse import parse_datetime
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import ExtraError
+from pydantic.fields import SHAPE_DICT, SHAPE_LIST, SHAPE_MAPPING, SHAPE_SINGLETON, ModelField
+
+from .utils import ColumnName
+
+M = TypeVar("M", bound=BaseModel)
+Converter = Callable[[Any], Any]
+
+_PLANS: Dict[Type[BaseModel], List[Tuple[str, Converter, ModelField]]] = {}
+
+
+def construct_trusted(model: Type[M], data: Dict[str, Any]) -> M:
+    """Builds a `model` from a payload WhyLabs validated, without validating it again."""
+    constructed: M = _construct(model, data)
+    return constructed
+
+
+def _construct(model: Type[BaseModel], data: Dict[str, Any]) -> Any:
+    # What BaseModel.construct does, converting the values on the way
+    plan = _PLANS.get(model)
+    if plan is None:
+        plan = _PLANS[model] = [(name, _field_converter(field), field) for name, field in model.__fields__.items()]
+    values = {}
+    fields_set = set()
+    for name, convert, field in plan:
+        if name in data:
+            value = data[name]
+            values[name] = None if value is None else convert(value)
+            fields_set.add(name)
+        elif not field.required:
+            values[name] = field.get_default()
+    if len(fields_set) < len(data) and model.__config__.extra == Extra.forbid:
+        extra = [key for key in data if key not in fields_set]
+        raise ValidationError([ErrorWrapper(ExtraError(), loc=key) for key in extra], model)
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", fields_set)
+    instance._init_private_attributes()
+    return instance
+
+
+def _validator(field: ModelField) -> Converter:
+    # For the shapes this module doesn't know, validating is still correct, only slower
+    def validate(value: Any) -> Any:
+        validated, errors = field.validate(value, {}, loc=field.name)
+        if errors:
+            raise ValidationError([errors], BaseModel)  # type: ignore
+        return validated
+
+    return validate
+
+
+def _field_converter(field: ModelField) -> Converter:
+    if field.shape == SHAPE_SINGLETON:
+        return _type_converter(field)
+    if field.shape == SHAPE_LIST and field.sub_fields:
+        table = _value_table(field.sub_fields[0])
+        if table is not None:
+            # Long lists of column names: one dict lookup per element, and interning what isn't a group
+            lookup = table.get
+            if _is_column_name(field.sub_fields[0]):
+                return lambda value: [lookup(element) or sys.intern(element) for element in value]
+            return lambda value: [lookup(element, element) for element in value]
+        item = _type_converter(field.sub_fields[0])
+        return lambda value: [None if element is None else item(element) for element in value]
+    if field.shape in (SHAPE_DICT, SHAPE_MAPPING) and field.sub_fields:
+        item = _type_converter(field.sub_fields[0])
+        if field.key_field is not None and _is_column_name(field.key_field):
+            return lambda value: {
+                sys.intern(key): None if element is None else item(element) for key, element in value.items()
+            }
+        return lambda value: {key: None if element is None else item(element) for key, element in value.items()}
+    return _validator(field)
+
+
+def _model_types(field: ModelField) -> List[Type[BaseModel]]:
+    return [
+        sub.type_ for sub in field.sub_fields or [] if isinstance(sub.type_, type) and issubclass(sub.type_, BaseModel)
+    ]
+
+
+def _enum_types(field: ModelField) -> List[Type[Enum]]:
+    return [sub.type_ for sub in field.sub_fields or [] if isinstance(sub.type_, type) and issubclass(sub.type_, Enum)]
+
+
+def _is_column_name(field: ModelField) -> bool:
+    types = [sub.type_ for sub in field.sub_fields or []] or [field.type_]
+    return any(isinstance(type_, type) and issubclass(type_, ColumnName) for type_ in types)
+
+
+def _value_table(field: ModelField) -> Optional[Dict[Any, Any]]:
+    """Maps the values of literals, enums and unions of enums and strings to what validation gives for them."""
+    type_ = field.type_
+    if getattr(type_, "__origin__", None) is Literal:
+        return {choice: choice for choice in type_.__args__}
+    if isinstance(type_, type) and issubclass(type_, Enum):
+        return dict(type_._value2member_map_)
+    if getattr(type_, "__origin__", None) is Union and not _model_types(field):
+        table: Dict[Any, Any] = {}
+        for enum in _enum_types(field):
+            for value, member in enum._value2member_map_.items():
+                table.setdefault(value, member)
+        return table
+    return None
+
+
+def _type_converter(field: ModelField) -> Converter:
+    type_ = field.type_
+    if field.discriminator_key is not None and field.sub_fields_mapping:
+        return _by_discriminator(field, {key: sub.type_ for key, sub in field.sub_fields_mapping.items()})
+    table = _value_table(field)
+    if table is not None:
+        lookup = table.get
+        return lambda value: lookup(value, value)
+    if getattr(type_, "__origin__", None) is Union:
+        return _union_converter(field)
+    if isinstance(type_, type):
+        if issubclass(type_, BaseModel):
+            return lambda value: _construct(type_, value)
+        if issubclass(type_, datetime):
+            return parse_datetime
+        if issubclass(type_, ColumnName):
+            return sys.intern
+        if issubclass(type_, uuid.UUID):
+            return lambda value: value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+        if issubclass(type_, float):
+            return lambda value: float(value) if type(value) is int else value
+    return lambda value: value
+
+
+def _by_discriminator(field: ModelField, models: Dict[Any, Type[BaseModel]]) -> Converter:
+    fallback = _validator(field)
+    key = field.discriminator_alias or field.discriminator_key or "type"
+
+    def convert(value: Any) -> Any:
+        model = models.get(value.get(key)) if isinstance(value, dict) else None
+        return _construct(model, value) if model is not None else fallback(value)
+
+    return convert
+
+
+def _union_converter(field: ModelField) -> Converter:
+    """Unions of models sharing a `type` field are resolved like discriminated ones."""
+    models: Dict[Any, Type[BaseModel]] = {}
+    for model in _model_types(field):
+        type_field: Optional[ModelField] = model.__fields__.get("type")
+        literal = type_field.type_ if type_field is not None else None
+        if getattr(literal, "__origin__", None) is not Literal:
+            return _validator(field)
+        for choice in literal.__args__:  # type: ignore
+            models.setdefault(choice, model)
+    by_discriminator = _by_discriminator(field, models)
+    table: Dict[Any, Any] = {}
+    for enum in _enum_types(field):
+        for value, member in enum._value2member_map_.items():
+            table.setdefault(value, member)
+    lookup = table.get
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, dict):
+            return by_discriminator(value)
+        return lookup(value, value)
+
+    return convert
@@ -1,7 +1,8 @@
 """Common utilities."""
-from typing import Any, Dict
+import sys
+from typing import Any, Callable, Dict, FrozenSet, Generator, Iterable, Optional, Tuple, Type
 
-from pydantic import Field, constr
+from pydantic import ConstrainedStr, Field, constr
 
 
 def anyOf_to_oneOf(schema: Dict[str, Any], field_name: str) -> None:
@@ -21,7 +22,45 @@ def anyOf_to_oneOf(schema: Dict[str, Any], field_name: str) -> None:
     del cfg["anyOf"]
 
 
-COLUMN_NAME_TYPE = constr(max_length=1000)
+def intern_column(name: Any) -> Any:
+    """The one string object of a column name, shared by every model that names the column."""
+    return sys.intern(name) if type(name) is str else name
+
+
+class ColumnName(ConstrainedStr):
+    """A column name, interned once validated.
+
+    The same names come back in the targets, filters and entity schemas of every dataset of an org;
+    interned, each of them is held once however many lists it appears in.
+    """
+
+    max_length = 1000
+
+    @classmethod
+    def __get_validators__(cls) -> Generator[Callable[..., Any], None, None]:
+        yield from super().__get_validators__()
+        yield intern_column
+
+
+def column_set(columns: Optional[Iterable[Any]]) -> FrozenSet[Any]:
+    """A hash set of column names and groups, for O(1) membership checks. Empty when `columns` is None."""
+    return frozenset(map(intern_column, columns or ()))
+
+
+def cached_column_set(
+    cache: Dict[str, Tuple[Any, FrozenSet[Any]]], field: str, columns: Optional[Iterable[Any]]
+) -> FrozenSet[Any]:
+    """The `column_set` of a model's `field`, built again only once another list is assigned to the field.
+
+    The set is kept with the list it was built from, so changing the list in place isn't seen: assign a new list.
+    """
+    cached = cache.get(field)
+    if cached is None or cached[0] is not columns:
+        cached = cache[field] = (columns, column_set(columns))
+    return cached[1]
+
+
+COLUMN_NAME_TYPE: Type[str] = ColumnName
 METRIC_NAME_STR = constr(max_length=50)
 
 
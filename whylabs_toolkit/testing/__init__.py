@@ -0,0 +1,12 @@
+from .budget import CallBudget, CallBudgetExceeded, call_budget
+from .stand_in import FailureRule, ServedRequest, StandInServer, StandInState
+
+ALL = [
+    CallBudget,
+    CallBudgetExceeded,
+    call_budget,
+    FailureRule,
+    ServedRequest,
+    StandInServer,
+    StandInState,
+]
@@ -0,0 +1,77 @@
+"""Assertions on the number of WhyLabs API calls an operation makes, to catch N+1 patterns in tests."""
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from whylabs_toolkit.helpers.instrumentation import ApiCallEvent, CallOutcome, observe_api_calls
+
+
+class CallBudgetExceeded(AssertionError):
+    pass
+
+
+@dataclass
+class CallBudget:
+    """
+    The API calls made inside a `call_budget` block.
+
+    Answers served by the response cache or a snapshot, or shared with an identical
+    concurrent read, are also kept in `cached`. They count against the budget like any
+    other call, so that a cache can't hide an N+1 pattern, unless `include_cached` is unset.
+    """
+
+    name: str
+    max_calls: int
+    include_cached: bool = True
+    max_writes: Optional[int] = None
+    calls: List[ApiCallEvent] = field(default_factory=list)
+    cached: List[ApiCallEvent] = field(default_factory=list)
+
+    def record(self, event: ApiCallEvent) -> None:
+        if event.outcome in (CallOutcome.cached, CallOutcome.coalesced):
+            self.cached.append(event)
+            if not self.include_cached:
+                return
+        self.calls.append(event)
+
+    @property
+    def count(self) -> int:
+        return len(self.calls)
+
+    @property
+    def writes(self) -> int:
+        return sum(1 for event in self.calls if event.method != "GET")
+
+    def by_endpoint(self) -> Dict[str, int]:
+        return dict(Counter(f"{event.method} {event.endpoint}" for event in self.calls))
+
+    def check(self) -> None:
+        over_calls = self.count > self.max_calls
+        over_writes = self.max_writes is not None and self.writes > self.max_writes
+        if over_calls or over_writes:
+            limits = f"{self.count} calls (budget {self.max_calls})"
+            if self.max_writes is not None:
+                limits += f", {self.writes} writes (budget {self.max_writes})"
+            calls = "\n".join(f"  {count} x {endpoint}" for endpoint, count in self.by_endpoint().items())
+            raise CallBudgetExceeded(f"{self.name} made {limits}:\n{calls}")
+
+
+@contextmanager
+def call_budget(
+    max_calls: int, name: str = "operation", max_writes: Optional[int] = None, include_cached: bool = True
+) -> Iterator[CallBudget]:
+    """
+    Fails with CallBudgetExceeded when the block makes more than `max_calls` WhyLabs API calls,
+    or more than `max_writes` non-GET calls.
+
+    Calls are counted at the toolkit's client layer, only for the current thread and the workers
+    it hands work to, and checked when the block exits without an error.
+
+    >>> with call_budget(2, name="MonitorSetup for an existing monitor"):
+    ...     MonitorSetup(monitor_id="existing-monitor")
+    """
+    budget = CallBudget(name=name, max_calls=max_calls, max_writes=max_writes, include_cached=include_cached)
+    with observe_api_calls(budget.record):
+        yield budget
+    budget.check()
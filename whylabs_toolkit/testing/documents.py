@@ -0,0 +1,230 @@
+"""
+Monitor config payloads shaped like what WhyLabs returns, for tests and benchmarks.
+
+Generated payloads are built from a few parameters, deterministically, so that benchmark
+results measured on different commits are measured on the same data.
+"""
+from copy import deepcopy
+from itertools import cycle
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from whylabs_toolkit.monitor.models import *
+from whylabs_toolkit.monitor.models.analyzer.algorithms import ColumnListChangeConfig, ExperimentalConfig
+from whylabs_toolkit.monitor.models.commons import NoExtrasBaseModel
+
+# ColumnMatrix.include, ColumnMatrix.exclude and AnomalyFilter.includeColumns hold at most 1000 items
+MAX_COLUMNS = 1000
+
+_TRAILING_WINDOW = {"type": "TrailingWindow", "size": 14}
+_TIME_RANGE = {"type": "TimeRange", "range": {"start": "2023-01-01T00:00:00Z", "end": "2023-02-01T00:00:00Z"}}
+
+# One payload of every AlgorithmConfig variant, by `type`
+ALGORITHM_CONFIGS: Dict[str, Dict[str, Any]] = {
+    "diff": {"type": "diff", "metric": "median", "mode": "pct", "threshold": 12.5, "baseline": _TRAILING_WINDOW},
+    "fixed": {"type": "fixed", "metric": "count_null_ratio", "upper": 0.1, "lower": 0.0},
+    "list_comparison": {
+        "type": "list_comparison",
+        "metric": "inferred_data_type",
+        "operator": "in",
+        "expected": [{"str": "fractional"}, {"str": "integral"}],
+        "baseline": _TRAILING_WINDOW,
+    },
+    "frequent_string_comparison": {
+        "type": "frequent_string_comparison",
+        "operator": "target_includes_all_baseline",
+        "baseline": {"type": "Reference", "profileId": "ref-profile-0"},
+    },
+    "stddev": {
+        "type": "stddev",
+        "metric": "mean",
+        "factor": 3.0,
+        "thresholdType": "upper",
+        "minBatchSize": 7,
+        "baseline": _TIME_RANGE,
+    },
+    "drift": {
+        "type": "drift",
+        "metric": "histogram",
+        "algorithm": "hellinger",
+        "threshold": 0.7,
+        "baseline": _TIME_RANGE,
+    },
+    "comparison": {
+        "type": "comparison",
+        "metric": "inferred_data_type",
+        "operator": "eq",
+        "expected": {"str": "fractional"},
+        "baseline": {"type": "CurrentBatch", "datasetId": "model-1", "offset": 1},
+    },
+    "seasonal": {
+        "type": "seasonal",
+        "metric": "count",
+        "baseline": {"type": "TrailingWindow", "size": 60},
+        "stddevTimeRanges": [_TIME_RANGE["range"]],
+    },
+    "conjunction": {"type": "conjunction", "analyzerIds": ["bench-analyzer-0", "bench-analyzer-1"]},
+    "disjunction": {"type": "disjunction", "analyzerIds": ["bench-analyzer-0", "bench-analyzer-1"]},
+    "experimental": {
+        "type": "experimental",
+        "metric": "median",
+        "implementation": "median_absolute_deviation",
+        "baseline": _TRAILING_WINDOW,
+    },
+    "column_list": {"type": "column_list", "metric": "column_list", "exclude": ["id"], "baseline": _TRAILING_WINDOW},
+}
+
+CONFIG_MODELS: Dict[str, Type[NoExtrasBaseModel]] = {
+    "diff": DiffConfig,
+    "fixed": FixedThresholdsConfig,
+    "list_comparison": ListComparisonConfig,
+    "frequent_string_comparison": FrequentStringComparisonConfig,
+    "stddev": StddevConfig,
+    "drift": DriftConfig,
+    "comparison": ComparisonConfig,
+    "seasonal": SeasonalConfig,
+    "conjunction": ConjunctionConfig,
+    "disjunction": DisjunctionConfig,
+    "experimental": ExperimentalConfig,
+    "column_list": ColumnListChangeConfig,
+}
+
+# Analyzer.config doesn't take these two yet
+ANALYZER_CONFIGS = [name for name in ALGORITHM_CONFIGS if name not in ("experimental", "column_list")]
+
+_METADATA = {"schemaVersion": 1, "author": "benchmark", "version": 1, "updatedTimestamp": 1}
+
+# A monitor and its analyzer as a dataset already holds them
+MONITOR_BODY: Dict[str, Any] = {
+    "id": "existing-monitor",
+    "analyzerIds": ["existing-monitor-analyzer"],
+    "schedule": {"type": "immediate"},
+    "mode": {"type": "DIGEST"},
+    "disabled": False,
+    "actions": [],
+}
+ANALYZER_BODY: Dict[str, Any] = {
+    "id": "existing-monitor-analyzer",
+    "config": {"metric": "median", "type": "stddev", "factor": 2.0, "baseline": {"type": "TrailingWindow", "size": 14}},
+    "schedule": {"type": "fixed", "cadence": "daily"},
+    "targetMatrix": {"include": ["*"], "segments": [], "type": "column"},
+}
+
+
+def column_names(count: int, offset: int = 0) -> List[str]:
+    return [f"feature_{(offset + i) % max(count * 4, 1)}_embedding_component" for i in range(count)]
+
+
+def generate_analyzer(i: int, columns: int, config: Optional[str] = None) -> Dict[str, Any]:
+    """Analyzer `i` of a document, targeting `columns` columns, with the `config` variant of ALGORITHM_CONFIGS."""
+    return {
+        "id": f"bench-analyzer-{i}",
+        "displayName": f"Benchmark analyzer {i}",
+        "tags": ["benchmark"],
+        "schedule": {"type": "fixed", "cadence": "daily"},
+        "targetMatrix": {
+            "type": "column",
+            "include": column_names(min(columns, MAX_COLUMNS), offset=i),
+            "exclude": ["group:output"],
+            "segments": [{"tags": [{"key": "region", "value": f"region-{i % 4}"}]}],
+        },
+        "config": deepcopy(ALGORITHM_CONFIGS[config or "stddev"]),
+        "metadata": dict(_METADATA),
+    }
+
+
+def generate_monitor(i: int, columns: int) -> Dict[str, Any]:
+    """The monitor of analyzer `i`, filtering the anomalies of `columns` columns."""
+    return {
+        "id": f"bench-monitor-{i}",
+        "displayName": f"Benchmark monitor {i}",
+        "analyzerIds": [f"bench-analyzer-{i}"],
+        "schedule": {"type": "immediate"},
+        "mode": {"type": "EVERY_ANOMALY", "filter": {"includeColumns": column_names(min(columns, MAX_COLUMNS), i)}},
+        "actions": [{"type": "global", "target": "email"}, {"type": "global", "target": "slack"}],
+        "metadata": dict(_METADATA),
+    }
+
+
+def generate_entity_schema(columns: int) -> Dict[str, Any]:
+    """An entity schema of `columns` columns, one in ten of them a discrete output."""
+    schema: Dict[str, Any] = {"columns": {}, "metadata": dict(_METADATA)}
+    for i, name in enumerate(column_names(columns)):
+        output = i % 10 == 0
+        schema["columns"][name] = {
+            "classifier": "output" if output else "input",
+            "dataType": "string" if output else "fractional",
+            "discreteness": "discrete" if output else "continuous",
+        }
+    return schema
+
+
+def generate_document(analyzers: int, columns: int = 20, schema_columns: Optional[int] = None) -> Dict[str, Any]:
+    """
+    A monitor config of `analyzers` analyzers and as many monitors, each targeting `columns` columns.
+
+    The analyzers go through every variant of ANALYZER_CONFIGS in turn.
+    """
+    configs: Iterator[str] = cycle(ANALYZER_CONFIGS)
+    return {
+        "id": "9c1fbbe6-2b43-4e6c-9d63-0ff0eac3e0b4",
+        "schemaVersion": 1,
+        "orgId": "org-0",
+        "datasetId": "model-0",
+        "granularity": "daily",
+        "entitySchema": generate_entity_schema(schema_columns if schema_columns is not None else columns * 4),
+        "analyzers": [generate_analyzer(i, columns, next(configs)) for i in range(analyzers)],
+        "monitors": [generate_monitor(i, columns) for i in range(analyzers)],
+        "metadata": dict(_METADATA),
+    }
+
+
+def generate_stddev_document(analyzers: int, columns: int) -> Dict[str, Any]:
+    """A monitor config of `analyzers` stddev analyzers of `columns` columns each, and as many digest monitors."""
+    document: Dict[str, Any] = {"orgId": "org-0", "datasetId": "model-0", "analyzers": [], "monitors": []}
+    for i in range(analyzers):
+        analyzer_id = f"bench-analyzer-{i}"
+        document["analyzers"].append(
+            {
+                "id": analyzer_id,
+                "schedule": {"type": "fixed", "cadence": "daily"},
+                "targetMatrix": {
+                    "type": "column",
+                    "include": [f"feature_{(i + j) % (columns * 4)}_embedding_component" for j in range(columns)],
+                    "exclude": ["group:output"],
+                    "segments": [],
+                },
+                "config": {
+                    "metric": "median",
+                    "type": "stddev",
+                    "factor": 2.5,
+                    "minBatchSize": 1,
+                    "baseline": {"type": "TrailingWindow", "size": 14},
+                },
+                "metadata": dict(_METADATA),
+            }
+        )
+        document["monitors"].append(
+            {
+                "id": f"bench-monitor-{i}",
+                "analyzerIds": [analyzer_id],
+                "schedule": {"type": "immediate"},
+                "mode": {"type": "DIGEST"},
+                "actions": [{"type": "global", "target": "email"}],
+                "metadata": dict(_METADATA),
+            }
+        )
+    return document
+
+
+def column_occurrences(documents: List[Document]) -> Iterator[Any]:
+    """Every column name the documents hold, once per list or schema it appears in."""
+    for document in documents:
+        if document.entitySchema is not None:
+            yield from document.entitySchema.columns
+        for analyzer in document.analyzers or []:
+            if isinstance(analyzer.targetMatrix, ColumnMatrix):
+                yield from analyzer.targetMatrix.include or []
+                yield from analyzer.targetMatrix.exclude or []
+        for monitor in document.monitors or []:
+            if monitor.mode.filter is not None:
+                yield from monitor.mode.filter.includeColumns or []
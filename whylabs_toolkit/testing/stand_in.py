@@ -0,0 +1,684 @@
+"""
+An in-memory stand-in for the WhyLabs monitor, models, notification settings and dataset profile endpoints.
+
+It answers the requests `whylabs_client` sends with the same paths, methods and body
+shapes, so the toolkit can be exercised and load tested without a WhyLabs account.
+"""
+import gzip
+import json
+import random
+import re
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Mapping, Optional, Pattern, Tuple, Union
+from urllib.parse import parse_qs, unquote
+
+from whylabs_toolkit.helpers.config import UserConfig
+
+SCHEMA_METADATA = {"author": "system", "version": 1, "updatedTimestamp": 1}
+
+_ORG = "/v0/organizations/([^/]+)"
+_DATASET = _ORG + "/models/([^/]+)"
+_PROFILES = _ORG + "/dataset-profiles"
+_ACTIONS = "/v0/notification-settings/([^/]+)/actions"
+
+Reply = Tuple[int, Any]
+
+
+def _now() -> int:
+    return int(time.time() * 1000)
+
+
+def _not_found(what: str) -> Reply:
+    return 404, {"message": f"{what} not found"}
+
+
+@dataclass
+class FailureRule:
+    """Answers matching requests with `status` instead of routing them, `times` times or forever."""
+
+    pattern: Pattern[str]
+    status: int = 500
+    method: Optional[str] = None
+    times: Optional[int] = None
+    retry_after: Optional[float] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.times is not None and self.times <= 0:
+            return False
+        return (self.method is None or self.method == method) and self.pattern.search(path) is not None
+
+
+@dataclass
+class ServedRequest:
+    method: str
+    path: str
+    status: int
+    # Seconds spent on the request, injected latency included
+    duration: float
+    # Body bytes received and sent on the wire, after compression
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+
+@dataclass
+class StandInState:
+    """
+    Everything the stand-in server knows, keyed by organization and dataset ids.
+
+    `latency` and `jitter` (seconds) delay every answer by `latency + uniform(0, jitter)`,
+    `error_rate` fails that share of the requests with `error_status`, and
+    `inject_failure` fails the requests matching a path pattern. `bandwidth` (bytes/s)
+    adds the time the request and response bodies take on a link that slow.
+    Answers of at least `gzip_min_bytes` are gzip-compressed for clients accepting it.
+    `handshake` (seconds) holds back the first answer of every connection, the way the TCP
+    and TLS handshakes with a remote host do. `connections` counts the connections accepted.
+    """
+
+    documents: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    models: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    schemas: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    actions: Dict[str, Dict[str, Dict[str, Any]]] = field(default_factory=dict)
+    reference_profiles: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = field(default_factory=dict)
+    segments: Dict[Tuple[str, str], List[Dict[str, Any]]] = field(default_factory=dict)
+    delete_requests: Dict[Tuple[str, str], List[Dict[str, Any]]] = field(default_factory=dict)
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    failures: List[FailureRule] = field(default_factory=list)
+    requests: List[Tuple[str, str]] = field(default_factory=list)
+    served: List[ServedRequest] = field(default_factory=list)
+    seed: Optional[int] = None
+    bandwidth: Optional[float] = None
+    gzip_min_bytes: int = 1024
+    handshake: float = 0.0
+    connections: int = 0
+
+    def __post_init__(self) -> None:
+        self.lock = threading.Lock()
+        self.random = random.Random(self.seed)
+        routes: List[Tuple[str, str, Callable[..., Reply]]] = [
+            ("GET", _DATASET + "/monitor-config/v3", self._get_document),
+            ("PUT", _DATASET + "/monitor-config/v3", self._put_document),
+            ("PATCH", _DATASET + "/monitor-config/v3", self._patch_document),
+            ("PUT", _DATASET + "/monitor-config/v3/validate", self._validate_document),
+            ("GET", _DATASET + "/monitor-config/(monitor|analyzer)/([^/]+)", self._get_entity),
+            ("PUT", _DATASET + "/monitor-config/(monitor|analyzer)/([^/]+)", self._put_entity),
+            ("DELETE", _DATASET + "/monitor-config/(monitor|analyzer)/([^/]+)", self._delete_entity),
+            ("GET", _DATASET + "/constraints", self._list_constraints),
+            ("GET", _ORG + "/models", self._list_models),
+            ("POST", _ORG + "/models", self._create_model),
+            ("GET", _DATASET, self._get_model),
+            ("PUT", _DATASET, self._update_model),
+            ("DELETE", _DATASET, self._deactivate_model),
+            ("GET", _DATASET + "/schema", self._get_schema),
+            ("PUT", _DATASET + "/schema", self._put_schema),
+            ("DELETE", _DATASET + "/schema", self._delete_schema),
+            ("GET", _DATASET + "/schema/column/([^/]+)", self._get_column),
+            ("PUT", _DATASET + "/schema/column/([^/]+)", self._put_column),
+            ("DELETE", _DATASET + "/schema/column/([^/]+)", self._delete_column),
+            ("PUT", _DATASET + "/schema/metric", self._put_metric),
+            ("DELETE", _DATASET + "/schema/metric/([^/]+)", self._delete_metric),
+            ("GET", _ACTIONS, self._list_actions),
+            ("GET", _ACTIONS + "/([^/]+)", self._get_action),
+            ("DELETE", _ACTIONS + "/([^/]+)", self._delete_action),
+            ("PUT", _ACTIONS + "/([^/]+)/(enable|disable)", self._enable_action),
+            ("POST", _ACTIONS + "/([^/]+)/test", self._test_action),
+            ("PUT", _ACTIONS + "/([^/]+)/([^/]+)", self._put_action),
+            ("POST", _ACTIONS + "/([^/]+)/([^/]+)", self._add_action),
+            ("PATCH", _ACTIONS + "/([^/]+)/([^/]+)", self._update_action),
+            ("DELETE", _PROFILES + "/models/([^/]+)", self._delete_profiles),
+            ("DELETE", _PROFILES + "/models/([^/]+)/analyzer-results", self._delete_analyzer_results),
+            ("POST", _PROFILES + "/models/([^/]+)/reference-profile", self._create_reference_profile),
+            ("GET", _PROFILES + "/models/([^/]+)/reference-profiles", self._list_reference_profiles),
+            ("GET", _PROFILES + "/models/([^/]+)/reference-profiles/([^/]+)", self._get_reference_profile),
+            ("DELETE", _PROFILES + "/models/([^/]+)/reference-profiles/([^/]+)", self._delete_reference_profile),
+            ("GET", _PROFILES + "/models/([^/]+)/segments", self._list_segments),
+            ("GET", _PROFILES + "/models/([^/]+)/trace(?:/[^/]+)?", self._list_traces),
+            ("GET", _PROFILES + "/delete-requests/(dataset-profiles|analyzer-results)", self._list_delete_requests),
+        ]
+        self._routes = [(method, re.compile(f"^{path}$"), handler) for method, path, handler in routes]
+
+    def add_dataset(self, org_id: str, dataset_id: str, time_period: str = "P1D") -> None:
+        self.models[(org_id, dataset_id)] = {
+            "id": dataset_id,
+            "orgId": org_id,
+            "name": dataset_id,
+            "creationTime": 1,
+            "timePeriod": time_period,
+            "modelCategory": "MODEL",
+            "modelType": "CLASSIFICATION",
+            "active": True,
+        }
+        self.documents[(org_id, dataset_id)] = {
+            "orgId": org_id,
+            "datasetId": dataset_id,
+            "granularity": "daily",
+            "analyzers": [],
+            "monitors": [],
+        }
+        self.schemas[(org_id, dataset_id)] = {"columns": {}, "metadata": dict(SCHEMA_METADATA)}
+
+    def inject_failure(
+        self,
+        pattern: Union[str, Pattern[str]],
+        status: int = 500,
+        method: Optional[str] = None,
+        times: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> FailureRule:
+        """
+        Fail requests whose path matches `pattern` (searched, not anchored) with `status`.
+
+        Only `method` requests fail when it is set, and only the first `times` of them
+        when that is set. `retry_after` is sent back in a `Retry-After` header.
+        """
+        rule = FailureRule(
+            pattern=re.compile(pattern) if isinstance(pattern, str) else pattern,
+            status=status,
+            method=method,
+            times=times,
+            retry_after=retry_after,
+        )
+        with self.lock:
+            self.failures.append(rule)
+        return rule
+
+    def delay(self) -> float:
+        """Seconds the next answer is held back for."""
+        if self.latency <= 0 and self.jitter <= 0:
+            return 0.0
+        with self.lock:
+            return self.latency + self.random.uniform(0, self.jitter)
+
+    def accept(self) -> None:
+        """Counts a new connection, and waits for its handshake."""
+        with self.lock:
+            self.connections += 1
+        if self.handshake > 0:
+            time.sleep(self.handshake)
+
+    def serve(
+        self, method: str, target: str, headers: Mapping[str, str], raw: bytes
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answers an HTTP request for `target` (path and query string) with its status, headers and body,
+        as sent on the wire: latency, bandwidth and compression included.
+        """
+        start = time.perf_counter()
+        headers = {name.lower(): value for name, value in headers.items()}
+        path, _, query_string = target.partition("?")
+        query = {key: values[-1] for key, values in parse_qs(query_string).items()}
+        data = gzip.decompress(raw) if raw and headers.get("content-encoding") == "gzip" else raw
+        delay = self.delay()
+        if delay:
+            time.sleep(delay)
+        status, payload, extra_headers = self.dispatch(method, path, query, json.loads(data) if data else None)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        reply_headers = {"Content-Type": "application/json"}
+        if len(body) >= self.gzip_min_bytes and "gzip" in headers.get("accept-encoding", ""):
+            body = gzip.compress(body)
+            reply_headers["Content-Encoding"] = "gzip"
+        reply_headers["Content-Length"] = str(len(body))
+        reply_headers.update(extra_headers)
+        if self.bandwidth:
+            time.sleep((len(raw) + len(body)) / self.bandwidth)
+        with self.lock:
+            self.served.append(ServedRequest(method, path, status, time.perf_counter() - start, len(raw), len(body)))
+        return status, reply_headers, body
+
+    def dispatch(self, method: str, path: str, query: Dict[str, str], body: Any) -> Tuple[int, Any, Dict[str, str]]:
+        """Answers a request with its status, JSON payload and extra headers."""
+        with self.lock:
+            self.requests.append((method, path))
+            for rule in self.failures:
+                if rule.matches(method, path):
+                    if rule.times is not None:
+                        rule.times -= 1
+                    headers = {} if rule.retry_after is None else {"Retry-After": f"{rule.retry_after:g}"}
+                    return rule.status, {"message": "injected failure"}, headers
+            if self.error_rate and self.random.random() < self.error_rate:
+                return self.error_status, {"message": "injected failure"}, {}
+            for route_method, pattern, handler in self._routes:
+                match = pattern.match(path)
+                if match and route_method == method:
+                    status, payload = handler(*(unquote(group) for group in match.groups() if group), query, body)
+                    return status, payload, {}
+        return 404, {"message": f"no route for {method} {path}"}, {}
+
+    # Monitor configs
+
+    def _get_document(self, org_id: str, dataset_id: str, query: Dict[str, str], body: Any) -> Reply:
+        document = self.documents.get((org_id, dataset_id))
+        return (200, document) if document is not None else _not_found("monitor config")
+
+    def _put_document(self, org_id: str, dataset_id: str, query: Dict[str, str], body: Any) -> Reply:
+        document = self.documents.get((org_id, dataset_id))
+        if document is None:
+            return _not_found("monitor config")
+        document.clear()
+        document.update(body)
+        return 200, {}
+
+    def _patch_document(self, org_id: str, dataset_id: str, query: Dict[str, str], body: Any) -> Reply:
+        document = self.documents.get((org_id, dataset_id))
+        if document is None:
+            return _not_found("monitor config")
+        for key in ("analyzers", "monitors"):
+            patched = {item["id"]: item for item in body.get(key) or []}
+            document[key] = [patched.pop(item["id"], item) for item in document[key]] + list(patched.values())
+        document.update({key: value for key, value in body.items() if key not in ("analyzers", "monitors")})
+        return 200, {}
+
+    def _validate_document(self, org_id: str, dataset_id: str, query: Dict[str, str], body: Any) -> Reply:
+        if not isinstance(body, dict) or not isinstance(body.get("analyzers", []), list):
+            return 400, {"message": "invalid monitor config"}
+        return 200, {}
+
+    def _get_entity(self, org_id: str, dataset_id: str, kind: str, entity_id: str, *args: Any) -> Reply:
+        document = self.documents.get((org_id, dataset_id))
+        found = [item for item in (document or {}).get(f"{kind}s", []) if item["id"] == entity_id]
+        return (200, found[0]) if found else _not_found(kind)
+
+    def _put_entity(self, org_id: str, dataset_id: str, kind: str, entity_id: str, query: Any, body: Any) -> Reply:
+        document = self.documents.get((org_id, dataset_id))
+        if document is None:
+            return _not_found("monitor config")
+        items = document[f"{kind}s"]
+        items[:] = [item for item in items if item["id"] != entity_id] + [dict(body, id=entity_id)]
+        return 200, {}
+
+    def _delete_entity(self, org_id: str, dataset_id: str, kind: str, entity_id: str, *args: Any) -> Reply:
+        document = self.documents.get((org_id, dataset_id))
+        items = (document or {}).get(f"{kind}s", [])
+        if not any(item["id"] == entity_id for item in items):
+            return _not_found(kind)
+        items[:] = [item for item in items if item["id"] != entity_id]
+        return 200, {}
+
+    def _list_constraints(self, org_id: str, dataset_id: str, *args: Any) -> Reply:
+        return 200, []
+
+    # Models and entity schemas
+
+    def _list_models(self, org_id: str, *args: Any) -> Reply:
+        return 200, {
+            "items": [model for key, model in self.models.items() if key[0] == org_id and model.get("active", True)]
+        }
+
+    def _create_model(self, org_id: str, query: Dict[str, str], body: Any) -> Reply:
+        dataset_id = query.get("model_id") or f"model-{len(self.models) + 1}"
+        if (org_id, dataset_id) in self.models:
+            return 409, {"message": f"{dataset_id} already exists"}
+        self.add_dataset(org_id=org_id, dataset_id=dataset_id, time_period=query.get("time_period", "P1D"))
+        model = self.models[(org_id, dataset_id)]
+        model.update(name=query.get("model_name", dataset_id), creationTime=_now())
+        if query.get("model_type"):
+            model["modelType"] = query["model_type"]
+        return 200, model
+
+    def _get_model(self, org_id: str, dataset_id: str, *args: Any) -> Reply:
+        model = self.models.get((org_id, dataset_id))
+        return (200, model) if model else _not_found("dataset")
+
+    def _update_model(self, org_id: str, dataset_id: str, query: Dict[str, str], body: Any) -> Reply:
+        model = self.models.get((org_id, dataset_id))
+        if not model:
+            return _not_found("dataset")
+        model.update(
+            name=query.get("model_name", model["name"]), timePeriod=query.get("time_period", model["timePeriod"])
+        )
+        if query.get("model_type"):
+            model["modelType"] = query["model_type"]
+        return 200, model
+
+    def _deactivate_model(self, org_id: str, dataset_id: str, *args: Any) -> Reply:
+        model = self.models.get((org_id, dataset_id))
+        if not model:
+            return _not_found("dataset")
+        model["active"] = False
+        return 200, model
+
+    def _schema(self, org_id: str, dataset_id: str) -> Dict[str, Any]:
+        schema = self.schemas.setdefault((org_id, dataset_id), {"columns": {}, "metadata": dict(SCHEMA_METADATA)})
+        metadata = schema.setdefault("metadata", dict(SCHEMA_METADATA))
+        metadata.update(version=metadata.get("version", 0) + 1, updatedTimestamp=_now())
+        return schema
+
+    def _get_schema(self, org_id: str, dataset_id: str, *args: Any) -> Reply:
+        schema = self.schemas.get((org_id, dataset_id))
+        return (200, schema) if schema is not None else _not_found("schema")
+
+    def _put_schema(self, org_id: str, dataset_id: str, query: Dict[str, str], body: Any) -> Reply:
+        self.schemas[(org_id, dataset_id)] = body
+        return 200, {}
+
+    def _delete_schema(self, org_id: str, dataset_id: str, *args: Any) -> Reply:
+        return (200, {}) if self.schemas.pop((org_id, dataset_id), None) is not None else _not_found("schema")
+
+    def _get_column(self, org_id: str, dataset_id: str, column_id: str, *args: Any) -> Reply:
+        column = (self.schemas.get((org_id, dataset_id)) or {}).get("columns", {}).get(column_id)
+        return (200, column) if column is not None else _not_found("column")
+
+    def _put_column(self, org_id: str, dataset_id: str, column_id: str, query: Dict[str, str], body: Any) -> Reply:
+        self._schema(org_id, dataset_id).setdefault("columns", {})[column_id] = body
+        return 200, {}
+
+    def _delete_column(self, org_id: str, dataset_id: str, column_id: str, *args: Any) -> Reply:
+        columns = (self.schemas.get((org_id, dataset_id)) or {}).get("columns", {})
+        if column_id not in columns:
+            return _not_found("column")
+        del self._schema(org_id, dataset_id)["columns"][column_id]
+        return 200, {}
+
+    def _put_metric(self, org_id: str, dataset_id: str, query: Dict[str, str], body: Any) -> Reply:
+        schema = self._schema(org_id, dataset_id)
+        schema["metrics"] = [metric for metric in schema.get("metrics") or [] if metric["label"] != body["label"]] + [
+            body
+        ]
+        return 200, {}
+
+    def _delete_metric(self, org_id: str, dataset_id: str, label: str, *args: Any) -> Reply:
+        metrics = (self.schemas.get((org_id, dataset_id)) or {}).get("metrics") or []
+        if not any(metric["label"] == label for metric in metrics):
+            return _not_found("metric")
+        schema = self._schema(org_id, dataset_id)
+        schema["metrics"] = [metric for metric in metrics if metric["label"] != label]
+        return 200, {}
+
+    # Notification actions
+
+    def _list_actions(self, org_id: str, *args: Any) -> Reply:
+        return 200, list(self.actions.get(org_id, {}).values())
+
+    def _get_action(self, org_id: str, action_id: str, *args: Any) -> Reply:
+        action = self.actions.get(org_id, {}).get(action_id)
+        return (200, action) if action else _not_found("notification action")
+
+    def _delete_action(self, org_id: str, action_id: str, *args: Any) -> Reply:
+        return (200, None) if self.actions.get(org_id, {}).pop(action_id, None) else _not_found("notification action")
+
+    def _enable_action(self, org_id: str, action_id: str, toggle: str, *args: Any) -> Reply:
+        action = self.actions.get(org_id, {}).get(action_id)
+        if not action:
+            return _not_found("notification action")
+        action.update(enabled=toggle == "enable", lastUpdate=_now())
+        return 200, None
+
+    def _test_action(self, org_id: str, action_id: str, *args: Any) -> Reply:
+        return (200, None) if action_id in self.actions.get(org_id, {}) else _not_found("notification action")
+
+    def _store_action(self, org_id: str, action_type: str, action_id: str, payload: Any) -> None:
+        existing = self.actions.get(org_id, {}).get(action_id)
+        self.actions.setdefault(org_id, {})[action_id] = {
+            "id": action_id,
+            "type": action_type,
+            "payload": payload,
+            "lastUpdate": _now(),
+            "creationTime": existing["creationTime"] if existing else _now(),
+            "enabled": existing["enabled"] if existing else True,
+        }
+
+    def _put_action(self, org_id: str, action_type: str, action_id: str, query: Any, body: Any) -> Reply:
+        self._store_action(org_id, action_type, action_id, body)
+        return 200, None
+
+    def _add_action(self, org_id: str, action_type: str, action_id: str, query: Any, body: Any) -> Reply:
+        if action_id in self.actions.get(org_id, {}):
+            return 409, {"message": f"{action_id} already exists"}
+        self._store_action(org_id, action_type, action_id, body)
+        return 200, None
+
+    def _update_action(self, org_id: str, action_type: str, action_id: str, query: Any, body: Any) -> Reply:
+        if action_id not in self.actions.get(org_id, {}):
+            return _not_found("notification action")
+        self._store_action(org_id, action_type, action_id, body)
+        return 200, None
+
+    # Dataset profiles
+
+    def _delete_request(self, org_id: str, dataset_id: str, kind: str, **fields: Any) -> str:
+        request_id = uuid.uuid4().hex
+        self.delete_requests.setdefault((org_id, kind), []).append(
+            {
+                "id": request_id,
+                "orgId": org_id,
+                "datasetId": dataset_id,
+                "status": "PENDING",
+                "creationTimestamp": _now(),
+                "updatedTimestamp": _now(),
+                **{key: int(value) for key, value in fields.items() if value is not None},
+            }
+        )
+        return request_id
+
+    def _delete_profiles(self, org_id: str, dataset_id: str, query: Dict[str, str], body: Any) -> Reply:
+        request_id = self._delete_request(
+            org_id,
+            dataset_id,
+            "dataset-profiles",
+            deleteGte=query.get("profile_start_timestamp"),
+            deleteLt=query.get("profile_end_timestamp"),
+            beforeUploadTs=query.get("before_upload_timestamp"),
+        )
+        return 200, {"id": request_id}
+
+    def _delete_analyzer_results(self, org_id: str, dataset_id: str, query: Dict[str, str], body: Any) -> Reply:
+        request_id = self._delete_request(
+            org_id,
+            dataset_id,
+            "analyzer-results",
+            deleteGte=query.get("start_timestamp"),
+            deleteLt=query.get("end_timestamp"),
+        )
+        if query.get("analyzer_id"):
+            self.delete_requests[(org_id, "analyzer-results")][-1]["analyzerId"] = query["analyzer_id"]
+        return 200, {"id": request_id}
+
+    def _list_delete_requests(self, org_id: str, kind: str, *args: Any) -> Reply:
+        return 200, self.delete_requests.get((org_id, kind), [])
+
+    def _create_reference_profile(self, org_id: str, dataset_id: str, query: Dict[str, str], body: Any) -> Reply:
+        body = body or {}
+        profile_id = f"ref-{uuid.uuid4().hex[:16]}"
+        self.reference_profiles.setdefault((org_id, dataset_id), {})[profile_id] = {
+            "id": profile_id,
+            "orgId": org_id,
+            "modelId": dataset_id,
+            "alias": body.get("alias") or profile_id,
+            "uploadTimestamp": _now(),
+            "datasetTimestamp": body.get("datasetTimestamp"),
+        }
+        return 200, {
+            "id": profile_id,
+            "alias": body.get("alias") or profile_id,
+            "datasetId": dataset_id,
+            "segments": [],
+            "uploadUrls": [f"http://stand-in/upload/{profile_id}"],
+            "uploadTimestamp": _now(),
+        }
+
+    def _list_reference_profiles(self, org_id: str, dataset_id: str, *args: Any) -> Reply:
+        return 200, list(self.reference_profiles.get((org_id, dataset_id), {}).values())
+
+    def _get_reference_profile(self, org_id: str, dataset_id: str, profile_id: str, *args: Any) -> Reply:
+        profile = self.reference_profiles.get((org_id, dataset_id), {}).get(profile_id)
+        return (200, profile) if profile else _not_found("reference profile")
+
+    def _delete_reference_profile(self, org_id: str, dataset_id: str, profile_id: str, *args: Any) -> Reply:
+        removed = self.reference_profiles.get((org_id, dataset_id), {}).pop(profile_id, None)
+        return 200, removed is not None
+
+    def _list_segments(self, org_id: str, dataset_id: str, *args: Any) -> Reply:
+        return 200, {"orgId": org_id, "modelId": dataset_id, "segments": self.segments.get((org_id, dataset_id), [])}
+
+    def _list_traces(self, org_id: str, dataset_id: str, *args: Any) -> Reply:
+        return 200, {"traces": [], "isTruncated": False}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    state: StandInState
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't hold the body back for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def setup(self) -> None:
+        super().setup()
+        self.state.accept()
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        status, headers, body = self.state.serve(method, self.path, dict(self.headers.items()), raw)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+class _H2Handler(socketserver.BaseRequestHandler):
+    """
+    Speaks HTTP/2 without TLS (h2c with prior knowledge) on one connection. Every request is
+    answered by its own thread, so the streams of a connection are served concurrently.
+    """
+
+    state: StandInState
+
+    def setup(self) -> None:
+        from h2.config import H2Configuration
+        from h2.connection import H2Connection
+
+        self.state.accept()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connection = H2Connection(H2Configuration(client_side=False, header_encoding="utf-8"))
+        # Guards the connection state and the socket, and wakes up the senders waiting for flow control windows
+        self.window = threading.Condition()
+        self.closed = False
+
+    def _flush(self) -> None:
+        self.request.sendall(self.connection.data_to_send())
+
+    def handle(self) -> None:
+        from h2 import events
+
+        requests: Dict[int, Tuple[Dict[str, str], List[bytes]]] = {}
+        with self.window:
+            self.connection.initiate_connection()
+            self._flush()
+        try:
+            while True:
+                data = self.request.recv(65536)
+                if not data:
+                    break
+                with self.window:
+                    for event in self.connection.receive_data(data):
+                        if isinstance(event, events.RequestReceived):
+                            requests[event.stream_id] = (dict(event.headers), [])
+                        elif isinstance(event, events.DataReceived):
+                            requests[event.stream_id][1].append(event.data)
+                            self.connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                        elif isinstance(event, events.StreamEnded):
+                            headers, chunks = requests.pop(event.stream_id)
+                            args = (event.stream_id, headers, b"".join(chunks))
+                            threading.Thread(target=self._respond, args=args, daemon=True).start()
+                        elif isinstance(event, events.StreamReset):
+                            requests.pop(event.stream_id, None)
+                        elif isinstance(event, events.ConnectionTerminated):
+                            return
+                    self.window.notify_all()
+                    self._flush()
+        except OSError:
+            pass
+        finally:
+            with self.window:
+                self.closed = True
+                self.window.notify_all()
+
+    def _respond(self, stream_id: int, headers: Dict[str, str], raw: bytes) -> None:
+        method, target = headers.pop(":method"), headers.pop(":path")
+        status, reply_headers, body = self.state.serve(method, target, headers, raw)
+        reply = [(":status", str(status))] + [(name.lower(), value) for name, value in reply_headers.items()]
+        try:
+            with self.window:
+                self.connection.send_headers(stream_id, reply, end_stream=not body)
+                self._flush()
+                while body and not self.closed:
+                    size = min(self.connection.local_flow_control_window(stream_id), len(body))
+                    size = min(size, self.connection.max_outbound_frame_size)
+                    if size <= 0:
+                        self.window.wait(timeout=1)
+                        continue
+                    chunk, body = body[:size], body[size:]
+                    self.connection.send_data(stream_id, chunk, end_stream=not body)
+                    self._flush()
+        except Exception:
+            # The client reset the stream or went away
+            pass
+
+
+class StandInServer:
+    """
+    Serves a StandInState on a free local port while used as a context manager.
+    With `http2`, requests are served over HTTP/2 in cleartext instead of HTTP/1.1,
+    which needs the h2 package: pip install h2.
+
+    >>> with StandInServer() as server:
+    ...     server.state.add_dataset(org_id="org-0", dataset_id="model-0")
+    ...     MonitorSetup(monitor_id="my-monitor", config=server.config())
+    """
+
+    def __init__(self, state: Optional[StandInState] = None, http2: bool = False) -> None:
+        self.state = state or StandInState()
+        self._server: Union[ThreadingHTTPServer, socketserver.ThreadingTCPServer]
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError as e:
+                raise ImportError("The HTTP/2 stand-in server needs h2: pip install h2") from e
+            handler = type("H2Handler", (_H2Handler,), {"state": self.state})
+            self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), handler)
+        else:
+            handler = type("Handler", (_Handler,), {"state": self.state})
+            self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def config(self, org_id: str = "org-0", dataset_id: str = "model-0") -> UserConfig:
+        return UserConfig(api_key="stand-in-key", org_id=org_id, dataset_id=dataset_id, whylabs_host=self.url)
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()